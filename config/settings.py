@@ -42,11 +42,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'main.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'main.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'main.middleware.RoleMiddleware',
+    'main.middleware.ProfileCaptureMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     "django_browser_reload.middleware.BrowserReloadMiddleware",
@@ -64,6 +68,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'main.context_processors.assets',
             ],
         },
     },
@@ -83,6 +88,23 @@ DATABASES = {
 }
 
 
+# File-based so every process on the host (web workers, management commands)
+# sees the same cache versions and invalidations. Past MAX_ENTRIES each write
+# deletes a random third of the files, version tokens and sessions included,
+# so leave room for a token per student, section, survey and signed-in user
+# (role) plus sessions, fragments and word clouds.
+CACHE_MAX_ENTRIES = 50000
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -118,6 +140,63 @@ USE_TZ = True  # Keep this True to use timezone-aware datetimes
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Outside DEBUG, collectstatic writes content-hashed, gzipped copies that
+# WhiteNoise serves with far-future immutable cache headers.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage'
+            if DEBUG
+            else 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+
+# Bump to invalidate cached template fragments
+ASSET_VERSION = "1"
+
+# Per-request wall/ORM/template timings as Server-Timing headers and
+# "main.timing" log lines
+REQUEST_TIMING = DEBUG
+
+# Staff can profile a request with an "X-Profile: 1" header or "?_profile=1";
+# the newest PROFILE_CAPTURE_LIMIT captures are listed at /admin/profiles/.
+# Set the limit to 0 to disable capturing.
+PROFILE_CAPTURE_DIR = BASE_DIR / 'profiles'
+PROFILE_CAPTURE_LIMIT = 50
+PROFILE_CAPTURE_TOP = 40
+
+# Threads per process for analytics queries and chart/word cloud rendering
+# (async views under ASGI), kept apart from the thread that serves sync views.
+ANALYTICS_THREADS = 4
+
+# Password hashing threads for a roster uploaded through the dashboard (the
+# import_roster command uses a process per CPU instead).
+ROSTER_IMPORT_THREADS = 2
+# Hashing takes about half a second per password, so uploads stop at a size
+# that finishes within a request (~15 s); larger rosters go through the
+# import_roster command.
+ROSTER_UPLOAD_MAX_ROWS = 60
+
+# Gzipped submissions and answers of archived surveys moved out of the live
+# tables by the archive_surveys command.
+SURVEY_ARCHIVE_DIR = BASE_DIR / 'archive'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'main.timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
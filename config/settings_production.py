@@ -0,0 +1,83 @@
+"""
+Production settings: select with DJANGO_SETTINGS_MODULE=config.settings_production.
+
+Starts from config.settings and removes what only helps while developing:
+the browser reloader, DEBUG's in-memory query log and per-request template
+compilation.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, CACHE_MAX_ENTRIES, INSTALLED_APPS, MIDDLEWARE, STORAGES, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Set DJANGO_SECRET_KEY to run with config.settings_production.')
+
+ALLOWED_HOSTS = [host.strip() for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host.strip()]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'django_browser_reload']
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware != 'django_browser_reload.middleware.BrowserReloadMiddleware'
+]
+
+# Compile each template once per process instead of on every render.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+# Reuse database connections between requests.
+CONN_MAX_AGE = int(os.environ.get('DJANGO_CONN_MAX_AGE', '60'))
+CONN_HEALTH_CHECKS = True
+
+# Shared by every worker process on the host, so cache invalidation (section
+# versions, dashboard counters, the teacher account marker) reaches them all.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', str(BASE_DIR / 'cache')),
+        'TIMEOUT': 300,
+        # See CACHE_MAX_ENTRIES in config/settings.py; raise it for larger schools.
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('DJANGO_CACHE_MAX_ENTRIES', CACHE_MAX_ENTRIES))},
+    },
+}
+
+# Session storage, chosen with DJANGO_SESSION_BACKEND:
+#   cached_db       (default) reads come from the cache above; the database
+#                   is only written when a session changes, mostly at sign-in
+#   signed_cookies  nothing stored server-side, but a session cannot be
+#                   revoked before it expires
+#   db              Django's default, one session read per request
+# Run clear_expired_sessions periodically for the database-backed ones.
+SESSION_BACKEND = os.environ.get('DJANGO_SESSION_BACKEND', 'cached_db')
+if SESSION_BACKEND not in ('cached_db', 'signed_cookies', 'db'):
+    raise ImproperlyConfigured(f'Unknown DJANGO_SESSION_BACKEND {SESSION_BACKEND!r}.')
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_BACKEND}'
+
+STORAGES = {
+    **STORAGES,
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+REQUEST_TIMING = False
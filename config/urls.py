@@ -17,7 +17,15 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from main import views as main_views
+
 urlpatterns = [
+    path('admin/profiles/', main_views.admin_profile_captures, name='admin_profile_captures'),
+    path(
+        'admin/profiles/<slug:name>.<str:kind>',
+        main_views.admin_profile_capture_file,
+        name='admin_profile_capture_file',
+    ),
     path('admin/', admin.site.urls),
     path('', include('main.urls')),
 ]
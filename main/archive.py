@@ -0,0 +1,256 @@
+"""Cold storage for archived surveys.
+
+archive_survey() writes a survey's submissions and answers to a gzipped
+JSON-lines file under SURVEY_ARCHIVE_DIR, records a frozen analytics
+snapshot in SurveyArchive and each submitted response in ArchivedResponse,
+then deletes the rows from the live tables one chunk per transaction. restore_survey() loads them back the same way. Both
+pick up where they left off if interrupted.
+"""
+
+import datetime
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import caching
+from .models import Answer, ArchivedResponse, Survey, SurveyArchive, SurveySubmission
+
+CHUNK_SIZE = 500
+
+
+def archive_dir():
+    return Path(settings.SURVEY_ARCHIVE_DIR)
+
+
+class _ArchiveEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder without its rounding of datetimes to milliseconds."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _dump(queryset, handle):
+    for row in serializers.serialize("python", queryset):
+        handle.write(json.dumps(row, cls=_ArchiveEncoder) + "\n")
+
+
+def _load(handle):
+    return serializers.deserialize("python", (json.loads(line) for line in handle))
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_snapshot(survey):
+    """Respondents and per-question summaries, as the analytics page shows them."""
+    answers = Answer.objects.filter(submission__survey=survey)
+    choice_counts = dict(
+        answers.filter(selected_choice__isnull=False)
+        .values("selected_choice_id")
+        .annotate(count=Count("id"))
+        .values_list("selected_choice_id", "count")
+    )
+    short_texts = {}
+    rows = answers.filter(question__question_type="SHORT").order_by("submission_id", "id")
+    for question_id, text in rows.values_list("question_id", "text_response"):
+        if text:
+            short_texts.setdefault(question_id, []).append(text)
+
+    questions = list(survey.questions.prefetch_related("choices"))
+    averages = Answer.likert_averages(
+        [question.id for question in questions if question.question_type == "LIKERT"]
+    )
+    summaries = {}
+    for question in questions:
+        if question.question_type in {"MCQ", "LIKERT"}:
+            counts = {choice.text: 0 for choice in question.choices.all()}
+            for choice in question.choices.all():
+                counts[choice.text] += choice_counts.get(choice.id, 0)
+            summaries[str(question.id)] = {
+                "choices": list(counts.items()),
+                "likert_average": averages.get(question.id),
+            }
+        else:
+            summaries[str(question.id)] = {"short_answers": short_texts.get(question.id, [])}
+
+    respondents = SurveySubmission.objects.filter(survey=survey).order_by("id").values_list(
+        "id", "student_id", "is_submitted", "submitted_at", "student__user__first_name", "student__user__last_name"
+    )
+    return {
+        "respondents": [
+            {
+                "id": submission_id,
+                "student": student_id,
+                "is_submitted": is_submitted,
+                "submitted_at": submitted_at.isoformat(),
+                "name": f"{first_name} {last_name}".strip(),
+            }
+            for submission_id, student_id, is_submitted, submitted_at, first_name, last_name in respondents
+        ],
+        "questions": summaries,
+    }
+
+
+def archived_submissions(student):
+    """``{survey id: submitted_at}`` for ``student``'s submitted responses in cold storage."""
+    return dict(ArchivedResponse.objects.filter(student=student).values_list("archive_id", "submitted_at"))
+
+
+def _write_archive(survey, chunk_size):
+    directory = archive_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    started = timezone.now()
+    snapshot = build_snapshot(survey)
+    name = f"survey-{survey.pk}-{started:%Y%m%dT%H%M%S}.jsonl.gz"
+    path = directory / name
+    partial = directory / f"{name}.partial"
+
+    ids = list(SurveySubmission.objects.filter(survey=survey).order_by("id").values_list("id", flat=True))
+    answer_count = 0
+    # Each chunk's submissions come before their answers, so a restore can
+    # insert the file front to back.
+    with gzip.open(partial, "wt", encoding="utf-8") as handle:
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            _dump(SurveySubmission.objects.filter(id__in=chunk).order_by("id"), handle)
+            answers = Answer.objects.filter(submission_id__in=chunk).order_by("id")
+            _dump(answers, handle)
+            answer_count += answers.count()
+    os.replace(partial, path)
+
+    with transaction.atomic():
+        record = SurveyArchive.objects.create(
+            survey=survey,
+            file_name=name,
+            sha256=_sha256(path),
+            submissions=len(ids),
+            answers=answer_count,
+            snapshot=snapshot,
+            archived_at=started,
+        )
+        ArchivedResponse.objects.bulk_create(
+            ArchivedResponse(
+                archive=record,
+                student_id=respondent["student"],
+                submission_id=respondent["id"],
+                submitted_at=parse_datetime(respondent["submitted_at"]),
+            )
+            for respondent in snapshot["respondents"]
+            if respondent["is_submitted"]
+        )
+    return record
+
+
+def _purge(record, chunk_size):
+    # Rows changed after the archive was started are not in the file; leave them.
+    live = SurveySubmission.objects.filter(survey_id=record.survey_id, updated_at__lte=record.archived_at)
+    while True:
+        with transaction.atomic():
+            chunk = list(live.order_by("id").values_list("id", flat=True)[:chunk_size])
+            if not chunk:
+                return
+            Answer.objects.filter(submission_id__in=chunk).delete()
+            SurveySubmission.objects.filter(id__in=chunk).delete()
+
+
+def archive_survey(survey, chunk_size=CHUNK_SIZE):
+    """Move an archived survey's submissions and answers into cold storage."""
+    if survey.status != "archived":
+        raise ValueError(f"Survey {survey.pk} is not archived.")
+    record = SurveyArchive.objects.filter(survey=survey).first()
+    if record is not None and record.is_complete:
+        return record
+    if record is None:
+        record = _write_archive(survey, chunk_size)
+    _purge(record, chunk_size)
+    record.is_complete = True
+    record.save(update_fields=["is_complete"])
+    Survey.invalidate_teacher_counters(survey.teacher_id)
+    return record
+
+
+def _insert(objects, record, restored):
+    model = type(objects[0])
+    with transaction.atomic():
+        if model is SurveySubmission:
+            live = dict(
+                SurveySubmission.objects.filter(pk__in=[obj.pk for obj in objects])
+                .values_list("pk", "updated_at")
+            )
+            new = [obj for obj in objects if obj.pk not in live]
+            # bulk_create stamps the auto_now fields with the current time; put
+            # the archived values back afterwards.
+            stamps = [(obj.submitted_at, obj.updated_at) for obj in new]
+            SurveySubmission.objects.bulk_create(new)
+            for obj, (submitted_at, updated_at) in zip(new, stamps):
+                obj.submitted_at, obj.updated_at = submitted_at, updated_at
+            SurveySubmission.objects.bulk_update(new, ["submitted_at", "updated_at"])
+            # Submissions changed after archiving kept their (newer) answers
+            # live; the rest, including ones an interrupted restore already
+            # inserted, take their answers from the file.
+            restored.update(
+                obj.pk for obj in objects
+                if obj.pk not in live or live[obj.pk] <= record.archived_at
+            )
+        else:
+            existing = set(
+                Answer.objects.filter(pk__in=[obj.pk for obj in objects]).values_list("pk", flat=True)
+            )
+            Answer.objects.bulk_create([
+                obj for obj in objects if obj.pk not in existing and obj.submission_id in restored
+            ])
+
+
+def restore_survey(survey, chunk_size=CHUNK_SIZE):
+    """Load a survey's archived submissions and answers back into the live tables.
+
+    The survey leaves the archived status and becomes closed. Returns the number of submissions restored.
+    """
+    record = SurveyArchive.objects.filter(survey=survey).first()
+    if record is None:
+        raise ValueError(f"Survey {survey.pk} has no archive.")
+    path = archive_dir() / record.file_name
+    if _sha256(path) != record.sha256:
+        raise ValueError(f"Archive file {path} does not match its checksum.")
+
+    restored, batch = set(), []
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for item in _load(handle):
+            obj = item.object
+            if batch and (type(obj) is not type(batch[0]) or len(batch) >= chunk_size):
+                _insert(batch, record, restored)
+                batch = []
+            batch.append(obj)
+    if batch:
+        _insert(batch, record, restored)
+
+    missing = record.submissions - SurveySubmission.objects.filter(survey=survey).count()
+    if missing > 0:
+        raise ValueError(f"{missing} archived submissions of survey {survey.pk} could not be restored.")
+
+    students = SurveySubmission.objects.filter(survey=survey).values_list("student_id", flat=True)
+    caching.bump((caching.SURVEY, survey.pk), *((caching.STUDENT, student_id) for student_id in students))
+    Survey.invalidate_teacher_counters(survey.teacher_id)
+    record.delete()
+    # Back among the teacher's closed surveys, so the next archive_surveys run
+    # does not send it straight back to cold storage.
+    survey.status = "closed"
+    survey.save(update_fields=["status", "updated_at"])
+    return len(restored)
@@ -0,0 +1,85 @@
+"""Versioned cache entries for data derived from surveys and submissions.
+
+Each survey, section and student has a version token in the shared cache.
+Derived data is stored under a key that includes the tokens of every scope it
+depends on, so bumping a token (see signals.py) makes the old entries
+unreachable and they simply expire. Tokens are random rather than counters:
+the file and database cache backends do not increment atomically, and two
+processes bumping at once must still both move the version.
+"""
+
+import hashlib
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+SURVEY = "survey"
+SECTION = "section"
+STUDENT = "student"
+# Keyed by user id: the role snapshot kept in the session (see middleware.py).
+ROLE = "role"
+
+DEFAULT_TIMEOUT = 60 * 60
+
+_pending = threading.local()
+
+
+def _version_key(namespace, object_id):
+    return f"main:version:{namespace}:{object_id}"
+
+
+def _new_token():
+    return uuid.uuid4().hex[:12]
+
+
+def versions(scopes):
+    """Current tokens for ``scopes`` (``(namespace, id)`` pairs), creating missing ones."""
+    keys = {scope: _version_key(*scope) for scope in scopes}
+    found = cache.get_many(keys.values())
+    tokens = {}
+    for scope, key in keys.items():
+        token = found.get(key)
+        if token is None:
+            cache.add(key, _new_token(), None)
+            token = cache.get(key)
+        tokens[scope] = token
+    return tokens
+
+
+def bump(*scopes):
+    """Move the version of each scope once the current transaction commits.
+
+    Bumps requested inside one transaction are sent in a single cache write.
+    Bumping only after the commit keeps a concurrent reader from caching
+    pre-commit data under the new version.
+    """
+    scopes = [scope for scope in scopes if scope[1] is not None]
+    if not scopes:
+        return
+    if not hasattr(_pending, "scopes"):
+        _pending.scopes = set()
+    _pending.scopes.update(scopes)
+    transaction.on_commit(_flush)
+
+
+def _flush():
+    scopes, _pending.scopes = _pending.scopes, set()
+    if scopes:
+        cache.set_many({_version_key(*scope): _new_token() for scope in scopes}, None)
+
+
+def cached(name, scopes, compute, *parts, timeout=DEFAULT_TIMEOUT):
+    """Return ``compute()``, cached until any of ``scopes`` is bumped.
+
+    ``name`` and ``parts`` identify the entry within those scopes.
+    """
+    tokens = versions(scopes)
+    raw = "|".join([name, *map(str, parts), *(f"{ns}:{oid}@{tokens[(ns, oid)]}" for ns, oid in scopes)])
+    key = f"main:cached:{name}:{hashlib.sha1(raw.encode()).hexdigest()}"
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def assets(request):
+    """Expose the asset version that keys cached template fragments."""
+    return {"asset_version": settings.ASSET_VERSION}
@@ -3,6 +3,7 @@ from django.contrib.auth.models import User
 from django.db.utils import OperationalError
 
 from .models import ClassSection
+from .sections import section_registry
 
 
 class StudentSignupForm(forms.Form):
@@ -17,8 +18,7 @@ class StudentSignupForm(forms.Form):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         try:
-            ClassSection.ensure_seeded()
-            sections = list(ClassSection.objects.order_by("section_id"))
+            sections = section_registry.all()
         except Exception:
             letters = ["A", "B", "C", "D"]
             sections = [
@@ -63,15 +63,11 @@ class StudentSignupForm(forms.Form):
         if not section_id:
             raise forms.ValidationError("Please select your section.")
         try:
-            section = ClassSection.objects.get(section_id=section_id)
-        except ClassSection.DoesNotExist:
-            ClassSection.ensure_seeded()
-            try:
-                section = ClassSection.objects.get(section_id=section_id)
-            except ClassSection.DoesNotExist:
-                raise forms.ValidationError("Unknown section selected.")
+            section = section_registry.get(section_id)
         except OperationalError:
             raise forms.ValidationError("Section data is unavailable. Please contact the administrator to run migrations.")
+        if section is None:
+            raise forms.ValidationError("Unknown section selected.")
         if year and str(section.year) != str(year):
             raise forms.ValidationError("Selected section does not belong to the chosen year.")
         return section
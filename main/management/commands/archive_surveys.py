@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main.archive import CHUNK_SIZE, archive_survey, restore_survey
+from main.models import Survey, SurveyArchive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the submissions and answers of archived surveys into compressed "
+        "cold-storage files, or restore them with --restore."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "surveys",
+            nargs="*",
+            type=int,
+            help="Survey ids (default: every archived survey not yet in cold storage).",
+        )
+        parser.add_argument("--restore", action="store_true", help="Load the given surveys back from cold storage (they become closed).")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options["restore"]:
+            if not options["surveys"]:
+                raise CommandError("Name the survey ids to restore.")
+            for survey in Survey.objects.filter(pk__in=options["surveys"]).order_by("id"):
+                try:
+                    restored = restore_survey(survey, options["chunk_size"])
+                except (OSError, ValueError) as exc:
+                    raise CommandError(str(exc))
+                self.stdout.write(self.style.SUCCESS(f"Restored {restored} submissions of survey {survey.pk}."))
+            return
+
+        surveys = Survey.objects.filter(status="archived")
+        if options["surveys"]:
+            surveys = surveys.filter(pk__in=options["surveys"])
+        else:
+            complete = SurveyArchive.objects.filter(is_complete=True).values("survey_id")
+            surveys = surveys.exclude(pk__in=complete)
+        for survey in surveys.order_by("id"):
+            try:
+                record = archive_survey(survey, options["chunk_size"])
+            except (OSError, ValueError) as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(self.style.SUCCESS(
+                f"Survey {survey.pk}: {record.submissions} submissions and {record.answers} answers "
+                f"in {record.file_name}."
+            ))
@@ -0,0 +1,118 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from main.models import SurveySubmission
+
+from .generate_sample_data import EMAIL_DOMAIN
+
+ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+
+
+def _session_queries(captured):
+    reads = writes = 0
+    for query in captured.captured_queries:
+        if "django_session" in query["sql"]:
+            if query["sql"].lstrip().upper().startswith("SELECT"):
+                reads += 1
+            else:
+                writes += 1
+    return reads, writes
+
+
+class Command(BaseCommand):
+    help = (
+        "Sign a sample student in and browse their pages under each session "
+        "backend, reporting django_session reads and writes per request. "
+        "Run generate_sample_data first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backends", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--password", default="sample-pass-123", help="Password of the sample accounts.")
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        submission = (
+            SurveySubmission.objects.filter(is_submitted=True, student__user__username__endswith="@" + EMAIL_DOMAIN)
+            .select_related("student__user").order_by("-id").first()
+        )
+        if submission is None:
+            raise CommandError("No sample data found. Run `manage.py generate_sample_data` first.")
+        email = submission.student.user.username
+        urls = [
+            reverse("student_dashboard"),
+            reverse("student_dashboard_page", args=["responses"]),
+            reverse("student_view_response", args=[submission.pk]),
+        ]
+
+        results = []
+        for backend in options["backends"]:
+            with override_settings(
+                SESSION_ENGINE=ENGINES[backend],
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                REQUEST_TIMING=False,
+            ):
+                results.append(self.measure(backend, email, options["password"], urls, options["iterations"]))
+
+        self.print_report(results)
+        if options.get("output"):
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump({"student": email, "urls": urls, "results": results}, handle, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+
+    def measure(self, backend, email, password, urls, iterations):
+        client = Client()
+        with CaptureQueriesContext(connection) as captured:
+            response = client.post(reverse("student_signin"), {"email": email, "password": password})
+        if response.status_code != 302 or response.url != reverse("student_dashboard"):
+            raise CommandError(f"Could not sign in as {email}; check --password.")
+        login_reads, login_writes = _session_queries(captured)
+
+        reads = writes = queries = 0
+        timings = []
+        for _ in range(iterations):
+            for url in urls:
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    client.get(url)
+                    timings.append((time.perf_counter() - started) * 1000)
+                page_reads, page_writes = _session_queries(captured)
+                reads += page_reads
+                writes += page_writes
+                queries += len(captured.captured_queries)
+        requests = iterations * len(urls)
+        return {
+            "backend": backend,
+            "login_session_reads": login_reads,
+            "login_session_writes": login_writes,
+            "session_reads_per_request": round(reads / requests, 2),
+            "session_writes_per_request": round(writes / requests, 2),
+            "queries_per_request": round(queries / requests, 2),
+            "p50_ms": round(statistics.median(timings), 2),
+            "cookie_bytes": len(client.cookies[settings.SESSION_COOKIE_NAME].value),
+        }
+
+    def print_report(self, results):
+        self.stdout.write(
+            f"{'backend':<15} {'login r/w':>9} {'reads/req':>9} {'writes/req':>10} "
+            f"{'queries/req':>11} {'p50 ms':>8} {'cookie B':>8}"
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['backend']:<15} {row['login_session_reads']:>4}/{row['login_session_writes']:<4} "
+                f"{row['session_reads_per_request']:>9} {row['session_writes_per_request']:>10} "
+                f"{row['queries_per_request']:>11} {row['p50_ms']:>8.2f} {row['cookie_bytes']:>8}"
+            )
@@ -0,0 +1,80 @@
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Analytics-only dependencies that must not load while a worker starts.
+HEAVY_MODULES = ("wordcloud", "matplotlib", "numpy", "PIL")
+
+STARTUP_CODE = "import django; django.setup(); import config.urls"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker start-up (django.setup() plus the URLconf, which imports "
+        "every view) with `python -X importtime`, and fail if heavy analytics "
+        "modules load or the start-up budget is exceeded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budget-ms", type=float, default=None, help="Fail above this import time.")
+        parser.add_argument("--top", type=int, default=15, help="Slowest imports to list.")
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_CODE],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+        if process.returncode:
+            raise CommandError(f"Start-up failed:\n{process.stderr[-2000:]}")
+
+        imports = []
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            imports.append({
+                "module": name[1:],  # nested imports stay indented
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+
+        total_ms = sum(item["cumulative_ms"] for item in imports if not item["module"].startswith(" "))
+        for item in imports:
+            item["module"] = item["module"].strip()
+        heavy = sorted({
+            item["module"] for item in imports
+            if item["module"].split(".")[0] in HEAVY_MODULES
+        })
+        report = {
+            "import_ms": round(total_ms, 1),
+            "wall_ms": round(wall_ms, 1),
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+            "modules": len(imports),
+            "heavy_modules": heavy,
+            "slowest": sorted(imports, key=lambda item: item["cumulative_ms"], reverse=True)[: options["top"]],
+        }
+
+        self.stdout.write(
+            f"Start-up: {report['import_ms']} ms importing {report['modules']} modules "
+            f"({report['wall_ms']} ms wall, {report['max_rss_kb'] / 1024:.1f} MiB peak RSS)"
+        )
+        for item in report["slowest"]:
+            self.stdout.write(f"  {item['cumulative_ms']:>9.1f} ms  {item['module']}")
+        if options.get("output"):
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+
+        if heavy:
+            raise CommandError(f"Heavy modules imported at start-up: {', '.join(heavy[:10])}")
+        if options["budget_ms"] is not None and total_ms > options["budget_ms"]:
+            raise CommandError(f"Start-up took {total_ms:.1f} ms, over the {options['budget_ms']} ms budget.")
@@ -0,0 +1,199 @@
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from main import urls as main_urls
+from main.accounts import teacher_username
+from main.middleware import collect_timings
+from main.models import StudentProfile, Survey, SurveyAssignment, SurveySubmission
+
+# URL names that are not benchmarked, with the reason reported in the output.
+SKIPPED = {
+    "teacher_save_survey": "POST-only, rewrites survey questions",
+    "teacher_archive_survey": "POST-only, archives a survey",
+    "teacher_import_roster": "POST-only, creates accounts",
+    "teacher_survey_live": "long-lived event stream",
+    "logout": "ends the benchmark session",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every URL in main/urls.py through the test client and report "
+        "p50/p95 latency and query counts. Run generate_sample_data first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+        parser.add_argument("--compare", help="Earlier JSON results to show p50 changes against.")
+
+    def handle(self, *args, **options):
+        fixtures = self.fixtures()
+        cases = list(self.cases(fixtures))
+        covered = {name for name, *_ in cases} | set(SKIPPED)
+        uncovered = sorted(
+            pattern.name for pattern in main_urls.urlpatterns
+            if isinstance(pattern, URLPattern) and pattern.name and pattern.name not in covered
+        )
+
+        clients = {"anonymous": Client(), "teacher": Client(), "student": Client()}
+        clients["teacher"].force_login(fixtures["teacher"])
+        clients["student"].force_login(fixtures["student"].user)
+
+        results = []
+        # The test client's host is not in ALLOWED_HOSTS, and per-request
+        # timing logs would only add noise here.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], REQUEST_TIMING=False):
+            for name, role, url in cases:
+                results.append(self.measure(name, role, url, clients[role], options))
+
+        report = {
+            "timestamp": timezone.now().isoformat(),
+            "commit": self.commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "iterations": options["iterations"],
+            "dataset": {
+                "students": StudentProfile.objects.count(),
+                "surveys": Survey.objects.count(),
+                "submissions": SurveySubmission.objects.count(),
+            },
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "results": results,
+            "skipped": SKIPPED,
+            "uncovered": uncovered,
+        }
+        self.print_report(report, options.get("compare"))
+        if options.get("output"):
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+
+    def fixtures(self):
+        teacher = User.objects.filter(username=teacher_username()).first()
+        submissions = (
+            SurveySubmission.objects.filter(survey__teacher=teacher, is_submitted=True)
+            .select_related("survey", "student__user").order_by("-id")
+        )
+        submission = assignment = None
+        # Prefer a student who still has an open survey to answer, so the
+        # survey form itself is measured rather than the "already submitted"
+        # redirect.
+        for candidate in submissions[:200]:
+            submission = submission or candidate
+            done = SurveySubmission.objects.filter(student=candidate.student, is_submitted=True).values("survey_id")
+            assignment = (
+                SurveyAssignment.objects.filter(
+                    section_id=candidate.student.section_id, status="published", survey__status="open"
+                )
+                .exclude(survey_id__in=done)
+                .first()
+            )
+            if assignment:
+                submission = candidate
+                break
+        if submission is None:
+            raise CommandError("No sample data found. Run `manage.py generate_sample_data` first.")
+        if assignment is None:
+            assignment = SurveyAssignment.objects.filter(
+                survey=submission.survey, section_id=submission.student.section_id
+            ).first()
+        return {
+            "teacher": teacher,
+            "student": submission.student,
+            "survey": submission.survey,
+            "submission": submission,
+            "assignment": assignment,
+        }
+
+    def cases(self, fixtures):
+        survey_id = fixtures["survey"].pk
+        submission_id = fixtures["submission"].pk
+        yield "student_signin", "anonymous", reverse("student_signin")
+        yield "student_signup", "anonymous", reverse("student_signup")
+        yield "teacher_signin", "teacher", reverse("teacher_signin")
+        yield "student_dashboard", "student", reverse("student_dashboard")
+        yield "student_dashboard_page", "student", reverse("student_dashboard_page", args=["responses"])
+        yield "student_take_survey", "student", reverse("student_take_survey", args=[fixtures["assignment"].pk])
+        yield "student_view_response", "student", reverse("student_view_response", args=[submission_id])
+        yield "teacher_dashboard", "teacher", reverse("teacher_dashboard")
+        for page in ("dashboard", "collection", "history", "new"):
+            yield "teacher_dashboard_page", "teacher", reverse("teacher_dashboard_page", args=[page])
+        yield "teacher_dashboard_page", "teacher", reverse("teacher_dashboard_page", args=["dashboard"]) + f"?survey_id={survey_id}"
+        yield "teacher_preview_survey", "teacher", reverse("teacher_preview_survey", args=[survey_id])
+        yield "teacher_responses_history", "teacher", reverse("teacher_responses_history")
+        yield "teacher_analytics", "teacher", reverse("teacher_analytics", args=[survey_id])
+        yield "teacher_view_student_response", "teacher", reverse("teacher_view_student_response", args=[submission_id])
+
+    def measure(self, name, role, url, client, options):
+        for _ in range(options["warmup"]):
+            client.get(url)
+        timings, queries, status = [], 0, None
+        for _ in range(options["iterations"]):
+            # Also counts queries the view runs on other threads.
+            with collect_timings() as collected:
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = max(queries, collected["queries"])
+            status = response.status_code
+        return {
+            "name": name,
+            "role": role,
+            "url": url,
+            "status": status,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(self.percentile(timings, 95), 2),
+            "queries": queries,
+        }
+
+    @staticmethod
+    def percentile(values, percent):
+        ordered = sorted(values)
+        index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    @staticmethod
+    def commit():
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def print_report(self, report, compare_path):
+        previous = {}
+        if compare_path:
+            with open(compare_path, encoding="utf-8") as handle:
+                previous = {row["url"]: row for row in json.load(handle)["results"]}
+
+        self.stdout.write(f"{'URL':<48} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>7}")
+        for row in report["results"]:
+            line = f"{row['url'][:48]:<48} {row['status']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['queries']:>7}"
+            before = previous.get(row["url"])
+            if before and before["p50_ms"]:
+                change = (row["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+                line += f"  ({change:+.0f}% p50, {row['queries'] - before['queries']:+d} queries)"
+            self.stdout.write(line)
+        self.stdout.write(f"peak memory: {report['max_rss_kb'] / 1024:.1f} MiB")
+        for name, reason in report["skipped"].items():
+            self.stdout.write(f"skipped {name}: {reason}")
+        for name in report["uncovered"]:
+            self.stdout.write(self.style.WARNING(f"not benchmarked: {name}"))
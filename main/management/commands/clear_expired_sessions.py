@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired database sessions in small batches, one transaction "
+        "each, so submissions are not blocked behind one long delete."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.05,
+            help="Seconds to wait between batches, letting other writers in.",
+        )
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE.endswith(".signed_cookies"):
+            self.stdout.write("Sessions are stored in signed cookies; nothing to clear.")
+            return
+
+        now = timezone.now()
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                keys = list(
+                    Session.objects.filter(expire_date__lt=now)
+                    .values_list("session_key", flat=True)[: options["batch_size"]]
+                )
+                if not keys:
+                    break
+                deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+            if options["pause"]:
+                time.sleep(options["pause"])
+        # cached_db entries expire from the cache on their own.
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired sessions."))
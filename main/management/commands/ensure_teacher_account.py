@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.accounts import ensure_teacher_account, teacher_username
+
+
+class Command(BaseCommand):
+    help = "Create or repair the default teacher account from the DEFAULT_TEACHER_* settings."
+
+    def handle(self, *args, **options):
+        ensure_teacher_account(force=True)
+        self.stdout.write(self.style.SUCCESS(f"Teacher account {teacher_username()} is ready."))
@@ -0,0 +1,247 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from main.accounts import ensure_teacher_account, teacher_username
+from main.models import (
+    Answer,
+    Choice,
+    Question,
+    SearchToken,
+    StudentProfile,
+    Survey,
+    SurveyAssignment,
+    SurveySubmission,
+)
+from main.sections import section_registry
+
+EMAIL_DOMAIN = "sample.adelsurvey.test"
+TITLE_PREFIX = "[Sample] "
+BATCH_SIZE = 1000
+
+FIRST_NAMES = [
+    "Andrea", "Angelo", "Bea", "Carlo", "Christine", "Daniel", "Elaine", "Francis", "Gabriel",
+    "Hannah", "Isabel", "Jasmine", "John Paul", "Joshua", "Kyla", "Mark", "Mary Grace", "Miguel",
+    "Nicole", "Paolo", "Patricia", "Rafael", "Samantha", "Trisha", "Vince", "Ysabel",
+]
+LAST_NAMES = [
+    "Aquino", "Bautista", "Castillo", "Cruz", "Dela Cruz", "Del Rosario", "Flores", "Garcia",
+    "Gonzales", "Lopez", "Mendoza", "Navarro", "Ramos", "Reyes", "Santos", "Torres", "Villanueva",
+]
+TOPICS = [
+    "Classroom Environment", "Library Services", "Canteen Food", "Online Learning", "Campus Safety",
+    "Guidance Office", "Science Laboratory", "Sports Program", "Homework Load", "School Events",
+]
+MCQ_OPTIONS = [
+    ["Daily", "Weekly", "Monthly", "Rarely"],
+    ["Morning", "Noon", "Afternoon", "Evening"],
+    ["Very easy", "Easy", "Difficult", "Very difficult"],
+    ["Yes", "No", "Not sure"],
+]
+LIKERT_LABELS = ["Strongly Disagree", "Disagree", "Neutral", "Agree", "Strongly Agree"]
+PHRASES = [
+    "the teachers explain lessons clearly", "we need more time for group activities",
+    "the room gets too hot in the afternoon", "more books about science would help",
+    "the schedule is sometimes confusing", "I like the new reading corner",
+    "the internet connection is slow during class", "activities are fun and useful",
+    "please add more fans in the classroom", "the food is affordable but lines are long",
+]
+
+
+class Command(BaseCommand):
+    help = "Generate sample students, surveys, submissions and answers for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students-per-section", type=int, default=30)
+        parser.add_argument("--surveys", type=int, default=10)
+        parser.add_argument("--mcq", type=int, default=3, help="Multiple-choice questions per survey.")
+        parser.add_argument("--likert", type=int, default=3, help="Likert questions per survey.")
+        parser.add_argument("--short", type=int, default=2, help="Short-answer questions per survey.")
+        parser.add_argument("--submitted-ratio", type=float, default=0.7)
+        parser.add_argument("--draft-ratio", type=float, default=0.1)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--password", default="sample-pass-123", help="Password for every sample student.")
+        parser.add_argument("--clear", action="store_true", help="Delete previously generated sample data first.")
+
+    def handle(self, *args, **options):
+        if options["submitted_ratio"] + options["draft_ratio"] > 1:
+            raise CommandError("--submitted-ratio and --draft-ratio must add up to at most 1.")
+        self.random = random.Random(options["seed"])
+
+        ensure_teacher_account(force=True)
+        teacher = User.objects.get(username=teacher_username())
+        sections = section_registry.all()
+
+        if options["clear"]:
+            self.clear()
+
+        with transaction.atomic():
+            students = self.create_students(sections, options["students_per_section"], options["password"])
+        self.stdout.write(f"Created {len(students)} students.")
+
+        by_section = {}
+        for profile in students:
+            by_section.setdefault(profile.section_id, []).append(profile)
+
+        counts = {"surveys": 0, "submitted": 0, "drafts": 0, "answers": 0}
+        for number in range(options["surveys"]):
+            with transaction.atomic():
+                self.create_survey(teacher, sections, by_section, number, options, counts)
+
+        Survey.invalidate_teacher_counters(teacher.pk)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {counts['surveys']} surveys, {counts['submitted']} submitted and "
+            f"{counts['drafts']} draft submissions, {counts['answers']} answers."
+        ))
+
+    def clear(self):
+        profiles = StudentProfile.objects.filter(user__username__endswith="@" + EMAIL_DOMAIN)
+        profile_ids = list(profiles.values_list("id", flat=True))
+        SearchToken.objects.filter(kind=SearchToken.STUDENT, object_id__in=profile_ids).delete()
+        Survey.objects.filter(title__startswith=TITLE_PREFIX).delete()
+        User.objects.filter(username__endswith="@" + EMAIL_DOMAIN).delete()
+        self.stdout.write(f"Removed {len(profile_ids)} sample students and their surveys.")
+
+    def create_students(self, sections, per_section, password):
+        start = User.objects.filter(username__endswith="@" + EMAIL_DOMAIN).count()
+        hashed = make_password(password)  # one hash shared by every sample account
+        users, section_of = [], {}
+        for number, section in enumerate(
+            (section for section in sections for _ in range(per_section)), start=start
+        ):
+            username = f"student{number}@{EMAIL_DOMAIN}"
+            users.append(User(
+                username=username,
+                email=username,
+                first_name=self.random.choice(FIRST_NAMES),
+                last_name=self.random.choice(LAST_NAMES),
+                password=hashed,
+            ))
+            section_of[username] = section
+        User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+        names = {user.username: (user.first_name, user.last_name) for user in users}
+        user_ids = dict(
+            User.objects.filter(username__in=names).values_list("username", "id")
+        )
+        StudentProfile.objects.bulk_create(
+            [StudentProfile(user_id=user_ids[username], section=section) for username, section in section_of.items()],
+            batch_size=BATCH_SIZE,
+        )
+        profiles = list(
+            StudentProfile.objects.filter(user_id__in=user_ids.values()).select_related("user")
+        )
+        tokens = []
+        for profile in profiles:
+            tokens.extend(SearchToken.build(SearchToken.STUDENT, profile.pk, *names[profile.user.username]))
+        SearchToken.objects.bulk_create(tokens, batch_size=BATCH_SIZE)
+        return profiles
+
+    def create_survey(self, teacher, sections, by_section, number, options, counts):
+        rng = self.random
+        now = timezone.now()
+        status = rng.choices(["open", "closed", "archived"], weights=[7, 2, 1])[0]
+        created_at = now - timedelta(days=rng.randint(5, 60))
+        survey = Survey.objects.create(
+            teacher=teacher,
+            title=f"{TITLE_PREFIX}{rng.choice(TOPICS)} Feedback #{number + 1}",
+            description="Generated sample survey.",
+            status=status,
+            created_at=created_at,
+            published_at=created_at,
+            due_date=now + timedelta(days=rng.randint(-3, 14)),
+        )
+        counts["surveys"] += 1
+
+        kinds = ["MCQ"] * options["mcq"] + ["LIKERT"] * options["likert"] + ["SHORT"] * options["short"]
+        rng.shuffle(kinds)
+        configs = {
+            "MCQ": Question.build_config("MCQ"),
+            "LIKERT": Question.build_config("LIKERT", scale_min=1, scale_max=5, scale_labels=LIKERT_LABELS),
+            "SHORT": Question.build_config("SHORT", max_length=500),
+        }
+        Question.objects.bulk_create([
+            Question(
+                survey=survey,
+                text=f"Question {order}: how do you feel about {rng.choice(PHRASES)}?",
+                question_type=kind,
+                order_number=order,
+                is_required=kind != "SHORT" or rng.random() < 0.5,
+                config=configs[kind],
+            )
+            for order, kind in enumerate(kinds, start=1)
+        ])
+        questions = list(survey.questions.order_by("order_number"))
+        choices = []
+        for question in questions:
+            if question.question_type == "MCQ":
+                options_text = rng.choice(MCQ_OPTIONS)
+                choices += [Choice(question=question, text=text, value=value) for value, text in enumerate(options_text, start=1)]
+            elif question.question_type == "LIKERT":
+                choices += [Choice(question=question, text=text, value=value) for value, text in enumerate(LIKERT_LABELS, start=1)]
+        Choice.objects.bulk_create(choices)
+        choices_of = {}
+        for choice in Choice.objects.filter(question__survey=survey).order_by("value"):
+            choices_of.setdefault(choice.question_id, []).append(choice)
+
+        assigned = rng.sample(sections, k=rng.randint(1, min(4, len(sections))))
+        SurveyAssignment.objects.bulk_create([
+            SurveyAssignment(survey=survey, section=section, status="published", assigned_date=created_at, due_date=survey.due_date)
+            for section in assigned
+        ])
+
+        plans, submissions = [], []
+        for section in assigned:
+            for profile in by_section.get(section.section_id, []):
+                roll = rng.random()
+                if roll < options["submitted_ratio"]:
+                    plans.append((profile.pk, True))
+                elif roll < options["submitted_ratio"] + options["draft_ratio"]:
+                    plans.append((profile.pk, False))
+        for student_id, submitted in plans:
+            submissions.append(SurveySubmission(survey=survey, student_id=student_id, is_submitted=submitted))
+        SurveySubmission.objects.bulk_create(submissions, batch_size=BATCH_SIZE)
+
+        rows = list(SurveySubmission.objects.filter(survey=survey))
+        for submission in rows:
+            submission.submitted_at = created_at + timedelta(minutes=rng.randint(0, 60 * 24 * 5))
+        SurveySubmission.objects.bulk_update(rows, ["submitted_at"], batch_size=BATCH_SIZE)
+
+        answers = []
+        for submission in rows:
+            for question in questions:
+                if not submission.is_submitted and rng.random() < 0.5:
+                    continue
+                if question.question_type == "SHORT":
+                    if not question.is_required and rng.random() < 0.3:
+                        continue
+                    text = "; ".join(rng.sample(PHRASES, k=rng.randint(1, 3))).capitalize() + "."
+                    answers.append(Answer(submission=submission, question=question, text_response=text))
+                else:
+                    options_for = choices_of[question.id]
+                    # Skew Likert answers towards agreement, like real class feedback.
+                    weights = range(1, len(options_for) + 1) if question.question_type == "LIKERT" else None
+                    choice = rng.choices(options_for, weights=weights)[0]
+                    answers.append(Answer(
+                        submission=submission,
+                        question=question,
+                        selected_choice=choice,
+                        text_response="",
+                        numeric_value=Answer.numeric_value_for(question, choice),
+                    ))
+        Answer.objects.bulk_create(answers, batch_size=BATCH_SIZE)
+        by_submission = {}
+        for answer in answers:
+            by_submission.setdefault(answer.submission_id, []).append(answer)
+        for submission in rows:
+            submission.packed_answers = SurveySubmission.pack_answers(by_submission.get(submission.pk, []))
+        SurveySubmission.objects.bulk_update(rows, ["packed_answers"], batch_size=BATCH_SIZE)
+
+        counts["submitted"] += sum(1 for _, submitted in plans if submitted)
+        counts["drafts"] += sum(1 for _, submitted in plans if not submitted)
+        counts["answers"] += len(answers)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main.roster import BATCH_SIZE, import_roster
+
+
+class Command(BaseCommand):
+    help = (
+        "Create student accounts from a CSV roster with email, section and password columns, plus "
+        'first_name and last_name columns or a name column written "Last, First".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Password hashing processes (default: one per CPU).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], newline="", encoding="utf-8-sig") as stream:
+                result = import_roster(stream, options["batch_size"], options["workers"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result["errors"]:
+            self.stderr.write(f"Line {error['line']} ({error['email']}): {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['created']} of {result['rows']} students in "
+            f"{result['seconds']:.2f}s ({result['rows_per_second']} students/sec)."
+        ))
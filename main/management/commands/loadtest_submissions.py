@@ -0,0 +1,249 @@
+import json
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from main.models import Survey, SurveyAssignment, SurveySubmission, StudentProfile
+
+from .generate_sample_data import EMAIL_DOMAIN, PHRASES
+
+_DB_TIMING = re.compile(r"(?:^|,\s*)db;dur=([\d.]+)")
+
+
+def _percentiles(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def pick(percent):
+        return round(ordered[max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))], 2)
+
+    return {"count": len(ordered), "p50": pick(50), "p95": pick(95), "p99": pick(99), "max": round(ordered[-1], 2)}
+
+
+class SimulatedStudent:
+    """One student's browser session: sign in, open the survey, autosave, submit."""
+
+    def __init__(self, base_url, email, password, assignment_id, answers):
+        self.base_url = base_url.rstrip("/")
+        self.email = email
+        self.password = password
+        self.survey_path = reverse("student_take_survey", args=[assignment_id])
+        self.answers = answers
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies))
+        self.steps = []
+        self.flow_ms = None
+
+    def _csrf_token(self):
+        return next((cookie.value for cookie in self.cookies if cookie.name == "csrftoken"), "")
+
+    def request(self, step, path, data=None, ajax=False):
+        headers = {}
+        body = None
+        if data is not None:
+            body = urlencode(data).encode()
+            headers["X-CSRFToken"] = self._csrf_token()
+        if ajax:
+            headers["X-Requested-With"] = "XMLHttpRequest"
+        started = time.perf_counter()
+        record = {"step": step, "ok": True, "error": None, "db_ms": None}
+        try:
+            with self.opener.open(Request(self.base_url + path, data=body, headers=headers), timeout=60) as response:
+                response.read()
+                record["status"] = response.status
+                record["final_path"] = response.url[len(self.base_url):]
+                timing = _DB_TIMING.search(response.headers.get("Server-Timing", ""))
+                if timing:
+                    record["db_ms"] = float(timing.group(1))
+        except HTTPError as exc:
+            record.update(ok=False, status=exc.code, error=f"HTTP {exc.code}")
+        except (URLError, OSError) as exc:
+            record.update(ok=False, status=None, error=type(exc).__name__)
+        record["ms"] = (time.perf_counter() - started) * 1000
+        self.steps.append(record)
+        return record
+
+    def sign_in(self):
+        self.request("login_form", reverse("student_signin"))
+        result = self.request(
+            "login", reverse("student_signin"), {"email": self.email, "password": self.password}
+        )
+        if result["ok"] and result.get("final_path") == reverse("student_signin"):
+            result.update(ok=False, error="login rejected")
+        return result["ok"]
+
+    def run(self, start_barrier, jitter):
+        try:
+            start_barrier.wait()
+        except threading.BrokenBarrierError:
+            return self
+        if jitter:
+            time.sleep(random.uniform(0, jitter))
+        started = time.perf_counter()
+        if self.request("open", self.survey_path)["ok"]:
+            partial = dict(list(self.answers.items())[: max(1, len(self.answers) // 2)])
+            self.request("autosave", self.survey_path, {**partial, "action": "save"}, ajax=True)
+            result = self.request("submit", self.survey_path, {**self.answers, "action": "submit"})
+            if result["ok"] and result.get("final_path", "").startswith(self.survey_path):
+                result.update(ok=False, error="validation failed")
+        self.flow_ms = (time.perf_counter() - started) * 1000
+        return self
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate a class submitting a survey at once against a running server "
+        "(GET, autosave, submit per student) and report throughput, error rate "
+        "and database time. Uses accounts from generate_sample_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--students", type=int, default=40)
+        parser.add_argument("--survey", type=int, help="Survey id (default: newest open survey with assignments).")
+        parser.add_argument("--password", default="sample-pass-123", help="Password of the sample accounts.")
+        parser.add_argument(
+            "--spread",
+            type=float,
+            default=0.0,
+            help="Seconds over which students start (0 = all at once).",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        survey = self.pick_survey(options.get("survey"))
+        students = self.pick_students(survey, options["students"])
+
+        # Start from a clean slate so every student goes through the full flow.
+        SurveySubmission.objects.filter(survey=survey, student__in=[profile for profile, _ in students]).delete()
+        questions = list(survey.questions.prefetch_related("choices").order_by("order_number"))
+
+        simulated = [
+            SimulatedStudent(
+                options["base_url"],
+                profile.user.username,
+                options["password"],
+                assignment.pk,
+                self.answers_for(questions),
+            )
+            for profile, assignment in students
+        ]
+        self.stdout.write(f"Signing in {len(simulated)} students to {options['base_url']} ...")
+        with ThreadPoolExecutor(max_workers=min(32, len(simulated))) as pool:
+            signed_in = list(pool.map(SimulatedStudent.sign_in, simulated))
+        ready = [student for student, ok in zip(simulated, signed_in) if ok]
+        if not ready:
+            raise CommandError("No student could sign in. Is the server running and the password right?")
+
+        self.stdout.write(f"Running the survey flow for {len(ready)} students on survey {survey.pk} ...")
+        barrier = threading.Barrier(len(ready))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(ready)) as pool:
+            list(pool.map(lambda student: student.run(barrier, options["spread"]), ready))
+        elapsed = time.perf_counter() - started
+
+        report = self.report(survey, simulated, ready, elapsed)
+        self.print_report(report)
+        if options.get("output"):
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+
+    def pick_survey(self, survey_id):
+        surveys = Survey.objects.filter(status="open", assignments__status="published").distinct()
+        survey = surveys.filter(pk=survey_id).first() if survey_id else surveys.order_by("-id").first()
+        if survey is None:
+            raise CommandError("No open, assigned survey found. Run generate_sample_data or pass --survey.")
+        return survey
+
+    def pick_students(self, survey, count):
+        assignments = {
+            assignment.section_id: assignment
+            for assignment in SurveyAssignment.objects.filter(survey=survey, status="published")
+        }
+        profiles = list(
+            StudentProfile.objects.filter(
+                section_id__in=assignments, user__username__endswith="@" + EMAIL_DOMAIN
+            ).select_related("user").order_by("id")[:count]
+        )
+        if len(profiles) < count:
+            raise CommandError(
+                f"Survey {survey.pk} only has {len(profiles)} sample students; "
+                "generate more with generate_sample_data --students-per-section."
+            )
+        return [(profile, assignments[profile.section_id]) for profile in profiles]
+
+    @staticmethod
+    def answers_for(questions):
+        answers = {}
+        for question in questions:
+            choices = list(question.choices.all())
+            if choices:
+                answers[f"q_{question.id}"] = str(random.choice(choices).id)
+            else:
+                answers[f"q_{question.id}"] = random.choice(PHRASES).capitalize() + "."
+        return answers
+
+    @staticmethod
+    def report(survey, simulated, ready, elapsed):
+        steps = [step for student in simulated for step in student.steps]
+        flow_steps = [step for step in steps if step["step"] in {"open", "autosave", "submit"}]
+        completed = [
+            student for student in ready
+            if any(step["step"] == "submit" and step["ok"] for step in student.steps)
+        ]
+        errors = {}
+        for step in steps:
+            if not step["ok"]:
+                key = f"{step['step']}: {step['error']}"
+                errors[key] = errors.get(key, 0) + 1
+        return {
+            "survey": survey.pk,
+            "students": len(simulated),
+            "signed_in": len(ready),
+            "completed": len(completed),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(len(completed) / elapsed, 2) if elapsed else None,
+            "error_rate": round(sum(not step["ok"] for step in flow_steps) / len(flow_steps), 4) if flow_steps else None,
+            "errors": errors,
+            "flow_ms": _percentiles([student.flow_ms for student in ready if student.flow_ms is not None]),
+            "latency_ms": {
+                name: _percentiles([step["ms"] for step in steps if step["step"] == name])
+                for name in ("open", "autosave", "submit")
+            },
+            # Server-side ORM time from the Server-Timing header (REQUEST_TIMING
+            # on the server). For the writes this is dominated by lock waits.
+            "db_ms": {
+                name: _percentiles([step["db_ms"] for step in steps if step["step"] == name and step["db_ms"] is not None])
+                for name in ("autosave", "submit")
+            },
+        }
+
+    def print_report(self, report):
+        self.stdout.write(
+            f"{report['completed']}/{report['signed_in']} students submitted in {report['elapsed_s']}s "
+            f"({report['throughput_per_s']} submissions/s), error rate {report['error_rate']:.1%}"
+        )
+        for label, group in (("latency", report["latency_ms"]), ("db time", report["db_ms"])):
+            for name, stats in group.items():
+                if stats:
+                    self.stdout.write(
+                        f"  {label:<8} {name:<9} p50 {stats['p50']:>8} ms  p95 {stats['p95']:>8} ms  "
+                        f"p99 {stats['p99']:>8} ms  max {stats['max']:>8} ms"
+                    )
+                elif label == "db time":
+                    self.stdout.write(f"  {label:<8} {name:<9} n/a (enable REQUEST_TIMING on the server)")
+        for error, count in sorted(report["errors"].items()):
+            self.stdout.write(self.style.WARNING(f"  {count} x {error}"))
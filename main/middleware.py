@@ -0,0 +1,459 @@
+import contextvars
+import cProfile
+import enum
+import functools
+import io
+import logging
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.utils import CursorWrapper
+from django.template.base import Template
+from django.utils import timezone
+from django.utils.text import slugify
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import caching
+from .accounts import teacher_username
+from .models import StudentProfile
+from .sections import section_registry
+
+SESSION_KEY = "main_role"
+
+timing_logger = logging.getLogger("main.timing")
+_timings = contextvars.ContextVar("main_timings", default=None)
+_capture = contextvars.ContextVar("main_profile_capture", default=None)
+_capture_lock = threading.Lock()
+
+
+class Role(str, enum.Enum):
+    ANONYMOUS = "anonymous"
+    TEACHER = "teacher"
+    STUDENT = "student"
+    OTHER = "other"
+
+
+def _role_version(user):
+    return caching.versions([(caching.ROLE, user.pk)])[(caching.ROLE, user.pk)]
+
+
+def role_snapshot(user):
+    """Session-storable role of ``user``; costs at most one profile query."""
+    snapshot = getattr(user, "_role_snapshot", None)
+    if snapshot is None:
+        # Read the version first so a profile change racing this lookup
+        # leaves the snapshot stale rather than silently current.
+        snapshot = {
+            "user": user.pk,
+            "version": _role_version(user),
+            "role": Role.OTHER.value,
+            "profile": None,
+            "section": None,
+        }
+        if user.username == teacher_username():
+            snapshot["role"] = Role.TEACHER.value
+        else:
+            row = StudentProfile.objects.filter(user=user).values_list("pk", "section_id").first()
+            if row is not None:
+                snapshot.update(role=Role.STUDENT.value, profile=row[0], section=row[1])
+        user._role_snapshot = snapshot
+    return snapshot
+
+
+def remember_role(request, user):
+    """Store the role of a freshly signed-in ``user`` and attach it to ``request``."""
+    snapshot = role_snapshot(user)
+    request.session[SESSION_KEY] = snapshot
+    _attach(request, user, snapshot)
+
+
+def _resolve_role(request):
+    user = request.user
+    if not user.is_authenticated:
+        request.role, request.profile = Role.ANONYMOUS, None
+        return
+    snapshot = request.session.get(SESSION_KEY)
+    if not snapshot or snapshot.get("user") != user.pk or snapshot.get("version") != _role_version(user):
+        snapshot = role_snapshot(user)
+        request.session[SESSION_KEY] = snapshot
+    _attach(request, user, snapshot)
+
+
+def _attach(request, user, snapshot):
+    request.role = Role(snapshot["role"])
+    request.profile = None
+    if request.role is Role.STUDENT:
+        section_id = snapshot["section"]
+        request.profile = StudentProfile(
+            pk=snapshot["profile"],
+            user=user,
+            section=section_registry.get(section_id) if section_id else None,
+        )
+
+
+class RoleMiddleware:
+    """Attach ``request.role`` and ``request.profile`` without per-request queries.
+
+    The role and student profile are resolved once at sign-in and kept in the
+    session; the section comes from the in-process section registry. Saving or
+    deleting the user's StudentProfile moves a per-user version token, and a
+    session holding an older snapshot (or none) is resolved again.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        _resolve_role(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        await sync_to_async(_resolve_role)(request)
+        return await self.get_response(request)
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's ``name`` timing.
+
+    A no-op outside a request instrumented by RequestTimingMiddleware. Nested
+    blocks with the same name are only counted once.
+    """
+    timings = _timings.get()
+    if timings is None or name in timings["active"]:
+        yield
+        return
+    timings["active"].add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings["active"].discard(name)
+        timings["spans"][name] = timings["spans"].get(name, 0.0) + time.perf_counter() - started
+
+
+def _timed_cursor_method(method):
+    @functools.wraps(method)
+    def timed_method(self, *args, **kwargs):
+        timings = _timings.get()
+        if timings is None:
+            return method(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            with timings["lock"]:
+                timings["queries"] += 1
+                timings["db"] += time.perf_counter() - started
+
+    timed_method.timed = True
+    return timed_method
+
+
+def _instrument_queries():
+    # Async views query from sync_to_async threads whose connections may
+    # predate the request, so time queries on the cursor class rather than
+    # with per-connection execute wrappers. Threads running in a copy of the
+    # request's context count towards its timings.
+    for name in ("execute", "executemany"):
+        method = getattr(CursorWrapper, name)
+        if not getattr(method, "timed", False):
+            setattr(CursorWrapper, name, _timed_cursor_method(method))
+
+
+@contextmanager
+def collect_timings():
+    """Instrument the block like a request and yield its timings dict.
+
+    ``queries`` and ``db`` include threads that run in a copy of the block's
+    context, such as sync_to_async calls.
+    """
+    _instrument_queries()
+    timings = {"active": set(), "spans": {}, "queries": 0, "db": 0.0, "lock": threading.Lock()}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def _instrument_templates():
+    render = Template.render
+    if getattr(render, "timed", False):
+        return
+
+    def timed_render(self, context):
+        with timed("template"):
+            return render(self, context)
+
+    timed_render.timed = True
+    Template.render = timed_render
+
+
+class RequestTimingMiddleware:
+    """Report wall, ORM, template and wordcloud time for each request.
+
+    Enabled by the REQUEST_TIMING setting. Timings go out as a Server-Timing
+    header (visible in the browser's network panel) and as one log line on the
+    ``main.timing`` logger.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        _instrument_templates()
+        _instrument_queries()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with collect_timings() as timings:
+            response = self.get_response(request)
+        return self._report(request, response, timings, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with collect_timings() as timings:
+            response = await self.get_response(request)
+        return self._report(request, response, timings, time.perf_counter() - started)
+
+    @staticmethod
+    def _report(request, response, timings, total):
+        metrics = [("total", total, None), ("db", timings["db"], f"{timings['queries']} queries")]
+        metrics += [(name, seconds, None) for name, seconds in sorted(timings["spans"].items())]
+        response["Server-Timing"] = ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" + (f';desc="{desc}"' if desc else "")
+            for name, seconds, desc in metrics
+        )
+
+        match = getattr(request, "resolver_match", None)
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "queries": timings["queries"],
+            **{f"{name}_ms": round(seconds * 1000, 1) for name, seconds, _ in metrics},
+        }
+        timing_logger.info(
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"timing": fields},
+        )
+        return response
+
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_PARAM = "_profile"
+PROFILE_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def profile_dir():
+    return Path(settings.PROFILE_CAPTURE_DIR)
+
+
+def list_profile_captures():
+    """Saved captures, newest first, as dicts for the admin listing."""
+    captures = []
+    for summary in sorted(profile_dir().glob("*.txt"), reverse=True):
+        with summary.open(encoding="utf-8") as handle:
+            headline = handle.readline().strip()
+        captures.append({
+            "name": summary.stem,
+            "headline": headline,
+            "created": datetime.fromtimestamp(summary.stat().st_mtime, tz=timezone.get_current_timezone()),
+            "has_stats": summary.with_suffix(".pstats").exists(),
+        })
+    return captures
+
+
+@contextmanager
+def profiled():
+    """Add the block to the current profile capture when it runs on another thread.
+
+    ProfileCaptureMiddleware profiles the request's own thread; wrap work that
+    a request hands to other threads in this. A no-op outside a capture.
+    """
+    profilers = _capture.get()
+    if profilers is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ allows one profiler per process, and the request's
+        # profiler already sees every thread.
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profilers.append(profiler)
+
+
+@contextmanager
+def _capturing():
+    """Profile the block; yields the profilers whose stats make up the capture.
+
+    Yields None and profiles nothing while another capture is running:
+    overlapping captures would mix their stats, and Python 3.12+ refuses a
+    second profiler outright.
+    """
+    if not _capture_lock.acquire(blocking=False):
+        yield None
+        return
+    profilers = [cProfile.Profile()]
+    token = _capture.set(profilers)
+    try:
+        profilers[0].enable()
+        try:
+            yield profilers
+        finally:
+            profilers[0].disable()
+    finally:
+        _capture.reset(token)
+        _capture_lock.release()
+
+
+def _save_profile_capture(request, response, profilers, seconds):
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = timezone.now().strftime("%Y%m%dT%H%M%S%f")
+    name = f"{stamp}-{slugify(request.path)[:60] or 'root'}"
+
+    summary = io.StringIO()
+    summary.write(
+        f"{request.method} {request.get_full_path()} -> {response.status_code} "
+        f"in {seconds * 1000:.1f} ms (user {request.user.username})\n\n"
+    )
+    stats = pstats.Stats(*profilers, stream=summary)
+    stats.dump_stats(directory / f"{name}.pstats")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(settings.PROFILE_CAPTURE_TOP)
+    (directory / f"{name}.txt").write_text(summary.getvalue(), encoding="utf-8")
+
+    # Keep the directory a ring buffer of the most recent captures.
+    for old in sorted(directory.glob("*.txt"), reverse=True)[settings.PROFILE_CAPTURE_LIMIT:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".pstats").unlink(missing_ok=True)
+    return name
+
+
+class ProfileCaptureMiddleware:
+    """Run a staff member's request under cProfile when they ask for it.
+
+    Send an ``X-Profile: 1`` header or add ``?_profile=1`` to the URL (``true``,
+    ``yes`` and ``on`` work too; anything else is ignored). The
+    .pstats dump and a cumulative-time summary are kept in
+    PROFILE_CAPTURE_DIR (the newest PROFILE_CAPTURE_LIMIT of them) and listed
+    at /admin/profiles/. One capture runs at a time; a request asking for
+    another meanwhile is served unprofiled. Other requests only pay for the
+    two lookups below.
+    Under ASGI the profiler sees everything the event loop thread runs while
+    the request is in flight, plus work wrapped in profiled() on other threads.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILE_CAPTURE_LIMIT", 0):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _requested(request):
+        return any(
+            (value or "").strip().lower() in PROFILE_TRUE_VALUES
+            for value in (request.headers.get(PROFILE_HEADER), request.GET.get(PROFILE_PARAM))
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._requested(request):
+            return self.get_response(request)
+        if not request.user.is_staff:
+            return self.get_response(request)
+
+        with _capturing() as profilers:
+            started = time.perf_counter()
+            response = self.get_response(request)
+            seconds = time.perf_counter() - started
+        if profilers is not None:
+            response["X-Profile-Capture"] = _save_profile_capture(request, response, profilers, seconds)
+        return response
+
+    async def __acall__(self, request):
+        if not self._requested(request):
+            return await self.get_response(request)
+        user = await request.auser()
+        if not user.is_staff:
+            return await self.get_response(request)
+
+        with _capturing() as profilers:
+            started = time.perf_counter()
+            response = await self.get_response(request)
+            seconds = time.perf_counter() - started
+        if profilers is not None:
+            response["X-Profile-Capture"] = await sync_to_async(_save_profile_capture, thread_sensitive=False)(
+                request, response, profilers, seconds
+            )
+        return response
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise with an async code path.
+
+    WhiteNoiseMiddleware is sync-only, and one sync middleware makes Django
+    run every ASGI request through its single sync thread, which would
+    serialize the async views behind it. The async path mirrors
+    WhiteNoiseMiddleware.__call__ and uses its internals (``files``,
+    ``find_file``, ``autorefresh``, ``serve``), so requirements.txt pins
+    whitenoise to the 6.12 series; check this again when upgrading.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
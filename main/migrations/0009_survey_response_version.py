@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_update_survey_status_to_open'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='survey',
+            name='response_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
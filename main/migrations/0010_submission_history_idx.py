@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_survey_response_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='surveysubmission',
+            index=models.Index(fields=['is_submitted', 'submitted_at', 'id'], name='submission_history_idx'),
+        ),
+    ]
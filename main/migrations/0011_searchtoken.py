@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:52
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Frozen copy of main.models.normalize_search_text as of this migration.
+def normalize_search_text(text):
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return [word[:64] for word in re.findall(r"\w+", stripped.casefold())]
+
+
+def build_tokens(apps, schema_editor):
+    SearchToken = apps.get_model("main", "SearchToken")
+    StudentProfile = apps.get_model("main", "StudentProfile")
+    Survey = apps.get_model("main", "Survey")
+
+    tokens = []
+    profiles = StudentProfile.objects.values_list("id", "user__first_name", "user__last_name")
+    for profile_id, first_name, last_name in profiles.iterator():
+        words = set(normalize_search_text(first_name)) | set(normalize_search_text(last_name))
+        tokens.extend(SearchToken(kind="student", object_id=profile_id, token=word) for word in words)
+    for survey_id, title in Survey.objects.values_list("id", "title").iterator():
+        words = set(normalize_search_text(title))
+        tokens.extend(SearchToken(kind="survey", object_id=survey_id, token=word) for word in words)
+    SearchToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+def clear_tokens(apps, schema_editor):
+    apps.get_model("main", "SearchToken").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_submission_history_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('student', 'Student name'), ('survey', 'Survey title')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('token', models.CharField(max_length=64)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'token'], name='searchtoken_lookup_idx'), models.Index(fields=['kind', 'object_id'], name='searchtoken_object_idx')],
+            },
+        ),
+        migrations.RunPython(build_tokens, clear_tokens),
+    ]
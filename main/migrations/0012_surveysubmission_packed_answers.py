@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:19
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def pack_existing(apps, schema_editor):
+    SurveySubmission = apps.get_model("main", "SurveySubmission")
+    Answer = apps.get_model("main", "Answer")
+
+    ids = list(SurveySubmission.objects.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(ids), BATCH_SIZE):
+        batch = ids[start:start + BATCH_SIZE]
+        packed = {submission_id: {} for submission_id in batch}
+        rows = Answer.objects.filter(submission_id__in=batch).values_list(
+            "submission_id", "question_id", "selected_choice_id", "text_response"
+        )
+        for submission_id, question_id, choice_id, text in rows:
+            packed[submission_id][str(question_id)] = choice_id or (text or "")
+        SurveySubmission.objects.bulk_update(
+            [SurveySubmission(id=submission_id, packed_answers=value) for submission_id, value in packed.items()],
+            ["packed_answers"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_searchtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='surveysubmission',
+            name='packed_answers',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(pack_existing, migrations.RunPython.noop),
+    ]
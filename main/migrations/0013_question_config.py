@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:21
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def fold_subtypes(apps, schema_editor):
+    Question = apps.get_model("main", "Question")
+    MCQQuestion = apps.get_model("main", "MCQQuestion")
+    LikertQuestion = apps.get_model("main", "LikertQuestion")
+    ShortAnswerQuestion = apps.get_model("main", "ShortAnswerQuestion")
+
+    configs = {}
+    for question_id, randomize in MCQQuestion.objects.values_list("question_id", "randomize_choices").iterator():
+        configs[question_id] = {"randomize_choices": randomize}
+    likert_rows = LikertQuestion.objects.values_list("question_id", "scale_min", "scale_max", "scale_labels")
+    for question_id, scale_min, scale_max, labels in likert_rows.iterator():
+        configs[question_id] = {"scale_min": scale_min, "scale_max": scale_max, "scale_labels": list(labels or [])}
+    for question_id, max_length in ShortAnswerQuestion.objects.values_list("question_id", "max_length").iterator():
+        configs[question_id] = {"max_length": max_length}
+
+    rows = [Question(id=question_id, config=config) for question_id, config in configs.items()]
+    Question.objects.bulk_update(rows, ["config"], batch_size=BATCH_SIZE)
+
+
+def unfold_subtypes(apps, schema_editor):
+    Question = apps.get_model("main", "Question")
+    models_by_type = {
+        "MCQ": (apps.get_model("main", "MCQQuestion"), {"randomize_choices": False}),
+        "LIKERT": (apps.get_model("main", "LikertQuestion"), {"scale_min": 1, "scale_max": 5, "scale_labels": []}),
+        "SHORT": (apps.get_model("main", "ShortAnswerQuestion"), {"max_length": 500}),
+    }
+    rows = {question_type: [] for question_type in models_by_type}
+    for question_id, question_type, config in Question.objects.values_list("id", "question_type", "config").iterator():
+        if question_type not in models_by_type:
+            continue
+        model, defaults = models_by_type[question_type]
+        values = {name: (config or {}).get(name, default) for name, default in defaults.items()}
+        rows[question_type].append(model(question_id=question_id, **values))
+    for question_type, (model, _) in models_by_type.items():
+        model.objects.bulk_create(rows[question_type], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_surveysubmission_packed_answers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='config',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(fold_subtypes, unfold_subtypes),
+        migrations.DeleteModel(
+            name='LikertQuestion',
+        ),
+        migrations.DeleteModel(
+            name='MCQQuestion',
+        ),
+        migrations.DeleteModel(
+            name='ShortAnswerQuestion',
+        ),
+    ]
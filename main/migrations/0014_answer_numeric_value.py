@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:22
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_choice_values(apps, schema_editor):
+    Answer = apps.get_model("main", "Answer")
+    Choice = apps.get_model("main", "Choice")
+    Answer.objects.filter(question__question_type="LIKERT", selected_choice__isnull=False).update(
+        numeric_value=Subquery(Choice.objects.filter(pk=OuterRef("selected_choice_id")).values("value")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_question_config'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='numeric_value',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        # Fill before the index exists so the update does not maintain it row by row.
+        migrations.RunPython(copy_choice_values, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'numeric_value'], name='answer_numeric_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0014_answer_numeric_value'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SurveyArchive',
+            fields=[
+                ('survey', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive', serialize=False, to='main.survey')),
+                ('file_name', models.CharField(max_length=255)),
+                ('sha256', models.CharField(max_length=64)),
+                ('submissions', models.PositiveIntegerField()),
+                ('answers', models.PositiveIntegerField()),
+                ('snapshot', models.JSONField()),
+                ('is_complete', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
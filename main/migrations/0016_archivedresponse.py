@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.dateparse import parse_datetime
+
+
+def copy_snapshot_respondents(apps, schema_editor):
+    ArchivedResponse = apps.get_model("main", "ArchivedResponse")
+    StudentProfile = apps.get_model("main", "StudentProfile")
+    SurveyArchive = apps.get_model("main", "SurveyArchive")
+    students = set(StudentProfile.objects.values_list("pk", flat=True))
+    rows = []
+    for archive_id, respondents in SurveyArchive.objects.values_list("pk", "snapshot__respondents"):
+        for respondent in respondents or []:
+            if respondent.get("is_submitted") and respondent.get("student") in students:
+                rows.append(ArchivedResponse(
+                    archive_id=archive_id,
+                    student_id=respondent["student"],
+                    submission_id=respondent["id"],
+                    submitted_at=parse_datetime(respondent["submitted_at"]),
+                ))
+    ArchivedResponse.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0015_surveyarchive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedResponse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submission_id', models.PositiveBigIntegerField()),
+                ('submitted_at', models.DateTimeField()),
+                ('archive', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='responses', to='main.surveyarchive')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_responses', to='main.studentprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['student', 'submitted_at'], name='archived_response_student_idx')],
+            },
+        ),
+        migrations.RunPython(copy_snapshot_respondents, migrations.RunPython.noop),
+    ]
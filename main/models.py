@@ -1,5 +1,12 @@
+import copy
+import re
+import unicodedata
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Avg, Count, Q
 from django.utils import timezone
 
 
@@ -31,6 +38,21 @@ class ClassSection(models.Model):
             for letter in letters
         ]
         cls.objects.bulk_create(sections, ignore_conflicts=True)
+        cls.bump_cache_version()
+
+    VERSION_KEY = "main:sections-version"
+
+    @classmethod
+    def cache_version(cls):
+        """Version of the section list, used to key cached section pickers."""
+        return cache.get_or_set(cls.VERSION_KEY, 1, None)
+
+    @classmethod
+    def bump_cache_version(cls):
+        try:
+            cache.incr(cls.VERSION_KEY)
+        except ValueError:
+            cache.set(cls.VERSION_KEY, 2, None)
 
 
 class StudentProfile(models.Model):
@@ -75,6 +97,8 @@ class Survey(models.Model):
     created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
+    # Bumped whenever a student's answers change; the live dashboard stream polls it.
+    response_version = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["-updated_at"]
@@ -82,6 +106,42 @@ class Survey(models.Model):
     def __str__(self):
         return self.title
 
+    EXCLUDED_STATUSES = ["delete", "deleted", "archived", "archive"]
+    COUNTERS_TIMEOUT = 300
+
+    @staticmethod
+    def _counters_key(teacher_id):
+        return f"main:teacher-counters:{teacher_id}"
+
+    @classmethod
+    def teacher_counters(cls, teacher):
+        """Return the dashboard header counts for a teacher, cached between changes."""
+        key = cls._counters_key(teacher.pk)
+        counters = cache.get(key)
+        if counters is None:
+            counters = (
+                cls.objects.filter(teacher=teacher)
+                .exclude(status__in=cls.EXCLUDED_STATUSES)
+                .aggregate(
+                    total_surveys=Count("id", distinct=True),
+                    active_surveys=Count("id", filter=Q(status__in=["open", "published"]), distinct=True),
+                    total_responses=Count("surveysubmission"),
+                )
+            )
+            cache.set(key, counters, cls.COUNTERS_TIMEOUT)
+        return counters
+
+    @classmethod
+    def invalidate_teacher_counters(cls, teacher_id):
+        """Drop a teacher's cached counts once the current transaction commits.
+
+        Deleting earlier would let a concurrent request cache the
+        pre-commit counts again.
+        """
+        if teacher_id is not None:
+            key = cls._counters_key(teacher_id)
+            transaction.on_commit(lambda: cache.delete(key))
+
     @property
     def display_status(self):
         status = (self.status or "draft").lower()
@@ -119,7 +179,7 @@ class SurveyAssignment(models.Model):
         section_label = self.section.section_id if self.section else "Unassigned"
         return f"{self.survey.title} → {section_label} ({self.status})"
 
-'''BASE QUESTION AND SUBTYPES STRUCTURE'''
+'''BASE QUESTION AND TYPE SETTINGS'''
 class Question(models.Model):
     QUESTION_TYPES = [
         ('MCQ', 'Multiple Choice'),
@@ -132,38 +192,91 @@ class Question(models.Model):
     question_type = models.CharField(max_length=10, choices=QUESTION_TYPES)
     order_number = models.IntegerField(default=0)
     is_required = models.BooleanField(default=True)
+    # Type-specific settings (see CONFIG_DEFAULTS); these used to live in the
+    # MCQQuestion, LikertQuestion and ShortAnswerQuestion tables.
+    config = models.JSONField(default=dict, blank=True)
+
+    CONFIG_DEFAULTS = {
+        "MCQ": {"randomize_choices": False},
+        "LIKERT": {"scale_min": 1, "scale_max": 5, "scale_labels": []},  # para sa labeling ng 1–5
+        "SHORT": {"max_length": 500},
+    }
 
     def __str__(self):
         return f"{self.text[:40]}..."
 
+    @classmethod
+    def build_config(cls, question_type, **settings):
+        """Validated settings for ``question_type``, with defaults filled in.
+
+        Raises ValidationError for unknown settings or unusable values.
+        """
+        defaults = cls.CONFIG_DEFAULTS.get(question_type)
+        if defaults is None:
+            raise ValidationError(f"Unknown question type {question_type!r}.")
+        unknown = sorted(set(settings) - set(defaults))
+        if unknown:
+            raise ValidationError(f"Unknown {question_type} setting(s): {', '.join(unknown)}.")
+        config = {**copy.deepcopy(defaults), **settings}
+        try:
+            if question_type == "MCQ":
+                config["randomize_choices"] = bool(config["randomize_choices"])
+            elif question_type == "LIKERT":
+                config["scale_min"] = int(config["scale_min"])
+                config["scale_max"] = int(config["scale_max"])
+                if not isinstance(config["scale_labels"], (list, tuple)):
+                    raise TypeError
+                config["scale_labels"] = [str(label) for label in config["scale_labels"]]
+                if config["scale_max"] < config["scale_min"]:
+                    raise ValidationError("The Likert scale maximum must not be below its minimum.")
+            else:
+                config["max_length"] = int(config["max_length"])
+                if config["max_length"] < 1:
+                    raise ValidationError("The maximum answer length must be positive.")
+        except (TypeError, ValueError):
+            raise ValidationError(f"Invalid {question_type} settings.")
+        return config
+
+    def clean(self):
+        try:
+            self.config = self.build_config(self.question_type, **(self.config or {}))
+        except ValidationError as exc:
+            raise ValidationError({"config": exc.messages})
 
-# SUBTYPE: MCQ
-class MCQQuestion(models.Model):
-    question = models.OneToOneField(Question, on_delete=models.CASCADE, primary_key=True)
-    randomize_choices = models.BooleanField(default=False)
+    @property
+    def type_config(self):
+        """Stored settings over the defaults for this question type."""
+        defaults = self.CONFIG_DEFAULTS.get(self.question_type, {})
+        return {**copy.deepcopy(defaults), **(self.config or {})}
 
-    def __str__(self):
-        return f"MCQ: {self.question.text[:40]}"
+    randomize_choices = property(lambda self: self.type_config.get("randomize_choices", False))
+    scale_min = property(lambda self: self.type_config.get("scale_min"))
+    scale_max = property(lambda self: self.type_config.get("scale_max"))
+    scale_labels = property(lambda self: self.type_config.get("scale_labels", []))
+    max_length = property(lambda self: self.type_config.get("max_length"))
 
+    # Compatibility with code written against the old one-to-one subtype rows,
+    # e.g. ``getattr(question, "likertquestion", None)``.
+    mcqquestion = property(lambda self: QuestionConfig.of(self, "MCQ"))
+    likertquestion = property(lambda self: QuestionConfig.of(self, "LIKERT"))
+    shortanswerquestion = property(lambda self: QuestionConfig.of(self, "SHORT"))
 
-# SUBTYPE: Likert
-class LikertQuestion(models.Model):
-    question = models.OneToOneField(Question, on_delete=models.CASCADE, primary_key=True)
-    scale_min = models.IntegerField(default=1)
-    scale_max = models.IntegerField(default=5)
-    scale_labels = models.JSONField(default=list, blank=True)  # para sa labeling ng 1–5
 
-    def __str__(self):
-        return f"Likert: {self.question.text[:40]}"
+class QuestionConfig:
+    """Read-only stand-in for a removed MCQQuestion/LikertQuestion/ShortAnswerQuestion row."""
 
+    def __init__(self, question):
+        self.question = question
 
-# SUBTYPE: Short Answer
-class ShortAnswerQuestion(models.Model):
-    question = models.OneToOneField(Question, on_delete=models.CASCADE, primary_key=True)
-    max_length = models.IntegerField(default=500)
+    @classmethod
+    def of(cls, question, question_type):
+        return cls(question) if question.question_type == question_type else None
 
-    def __str__(self):
-        return f"Short: {self.question.text[:40]}"
+    def __getattr__(self, name):
+        values = self.__dict__["question"].type_config if "question" in self.__dict__ else {}
+        if name in values:
+            return values[name]
+        raise AttributeError(name)
 
 '''CHOICE TABLE (Gamit ng MCQ and Likert)'''
 class Choice(models.Model):
@@ -182,13 +295,42 @@ class SurveySubmission(models.Model):
     submitted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_submitted = models.BooleanField(default=False)
+    # {question id: choice id or answer text}, written together with the
+    # Answer rows so one response can be shown without reading them.
+    packed_answers = models.JSONField(null=True, blank=True, editable=False)
 
     class Meta:
         unique_together = ('survey', 'student')
+        indexes = [
+            # Keyset pagination of the responses history
+            models.Index(fields=["is_submitted", "submitted_at", "id"], name="submission_history_idx"),
+        ]
 
     def get_respondent(self):
         return f"{self.student.user.get_full_name()}"
 
+    @staticmethod
+    def pack_answers(answers):
+        """Packed form of ``answers``: choice ids stay ints, text stays a string."""
+        return {
+            str(answer.question_id): answer.selected_choice_id or (answer.text_response or "")
+            for answer in answers
+        }
+
+    def answer_values(self):
+        """Map question id to choice id (int) or answer text (str).
+
+        Uses the packed column when present and the Answer rows otherwise.
+        """
+        if self.packed_answers is not None:
+            return {int(question_id): value for question_id, value in self.packed_answers.items()}
+        return {
+            question_id: choice_id or (text or "")
+            for question_id, choice_id, text in self.answers.values_list(
+                "question_id", "selected_choice_id", "text_response"
+            )
+        }
+
     def __str__(self):
         return f"{self.student.user.get_full_name()} - {self.survey.title}"
 
@@ -198,6 +340,127 @@ class Answer(models.Model):
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     selected_choice = models.ForeignKey(Choice, on_delete=models.SET_NULL, null=True, blank=True)
     text_response = models.TextField(blank=True, null=True)
+    # Scale value of a Likert answer, copied from the choice so it survives the
+    # choice and can be aggregated without a join.
+    numeric_value = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["question", "numeric_value"], name="answer_numeric_idx"),
+        ]
 
     def __str__(self):
         return f"Answer by {self.submission.student.user.get_full_name()} to {self.question.text[:30]}"
+
+    @staticmethod
+    def numeric_value_for(question, choice):
+        return choice.value if choice is not None and question.question_type == "LIKERT" else None
+
+    @classmethod
+    def likert_averages(cls, question_ids):
+        """Mean scale value per Likert question, from Answer alone."""
+        rows = (
+            cls.objects.filter(question_id__in=question_ids, numeric_value__isnull=False)
+            .values("question_id")
+            .annotate(average=Avg("numeric_value"))
+            .values_list("question_id", "average")
+        )
+        return dict(rows)
+
+
+class SurveyArchive(models.Model):
+    """Cold-storage record for an archived survey's submissions and answers.
+
+    The rows live in a gzipped JSON-lines file under SURVEY_ARCHIVE_DIR (see
+    main/archive.py); ``snapshot`` keeps the analytics page working meanwhile.
+    """
+
+    survey = models.OneToOneField(Survey, on_delete=models.CASCADE, primary_key=True, related_name="archive")
+    file_name = models.CharField(max_length=255)
+    sha256 = models.CharField(max_length=64)
+    submissions = models.PositiveIntegerField()
+    answers = models.PositiveIntegerField()
+    snapshot = models.JSONField()
+    # False until every archived row has left the live tables.
+    is_complete = models.BooleanField(default=False)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Archive of {self.survey.title} ({self.submissions} submissions)"
+
+
+class ArchivedResponse(models.Model):
+    """A student's submitted response to a survey in cold storage.
+
+    Written alongside the SurveyArchive record so the student dashboard can
+    list archived responses without reading every snapshot.
+    """
+
+    archive = models.ForeignKey(SurveyArchive, on_delete=models.CASCADE, related_name="responses")
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name="archived_responses")
+    submission_id = models.PositiveBigIntegerField()
+    submitted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["student", "submitted_at"], name="archived_response_student_idx"),
+        ]
+
+    def __str__(self):
+        return f"Archived response {self.submission_id} to survey {self.archive_id}"
+
+
+def normalize_search_text(text):
+    """Split text into lowercase, accent-free words for prefix search."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return [word[:64] for word in re.findall(r"\w+", stripped.casefold())]
+
+
+class SearchToken(models.Model):
+    """Indexed word prefixes of student names and survey titles for the history search."""
+
+    STUDENT = "student"
+    SURVEY = "survey"
+    KIND_CHOICES = [
+        (STUDENT, "Student name"),
+        (SURVEY, "Survey title"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["kind", "token"], name="searchtoken_lookup_idx"),
+            models.Index(fields=["kind", "object_id"], name="searchtoken_object_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.token}"
+
+    @classmethod
+    def build(cls, kind, object_id, *texts):
+        """Unsaved token rows for ``texts``, for callers that bulk insert them."""
+        tokens = {token for text in texts for token in normalize_search_text(text)}
+        return [cls(kind=kind, object_id=object_id, token=token) for token in sorted(tokens)]
+
+    @classmethod
+    def reindex(cls, kind, object_id, *texts):
+        cls.objects.filter(kind=kind, object_id=object_id).delete()
+        cls.objects.bulk_create(cls.build(kind, object_id, *texts))
+
+    @classmethod
+    def matching_ids(cls, kind, query):
+        """Ids whose words start with every word in ``query``, as a subquery."""
+        ids = None
+        for term in normalize_search_text(query):
+            # A plain range keeps the (kind, token) index usable on every backend.
+            term_ids = cls.objects.filter(
+                kind=kind, token__gte=term, token__lt=term + "\uffff"
+            ).values("object_id")
+            ids = term_ids if ids is None else term_ids.filter(object_id__in=ids)
+        if ids is None:
+            return cls.objects.none().values("object_id")
+        return ids
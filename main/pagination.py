@@ -0,0 +1,110 @@
+import hashlib
+
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+_CURSOR_SALT = "main.pagination.cursor"
+
+
+class KeysetPage:
+    """One page of a queryset ordered newest-first on (submitted_at, id).
+
+    Pages are addressed by opaque cursor tokens instead of page numbers, so
+    every page costs one indexed range scan no matter how deep it is.
+    """
+
+    TOTAL_TIMEOUT = 60
+
+    def __init__(self, queryset, items, has_next, has_previous):
+        self._queryset = queryset
+        self.object_list = items
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return None
+        last = self.object_list[-1]
+        return _encode_cursor("next", last)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return None
+        first = self.object_list[0]
+        return _encode_cursor("prev", first)
+
+    @property
+    def last_cursor(self):
+        return signing.dumps(("last",), salt=_CURSOR_SALT)
+
+    @cached_property
+    def total(self):
+        """Row count for the unpaginated queryset, cached briefly per filter set."""
+        sql = str(self._queryset.order_by().query)
+        key = "main:keyset-total:" + hashlib.md5(sql.encode()).hexdigest()
+        total = cache.get(key)
+        if total is None:
+            total = self._queryset.order_by().count()
+            cache.set(key, total, self.TOTAL_TIMEOUT)
+        return total
+
+
+def _encode_cursor(direction, obj):
+    return signing.dumps(
+        (direction, obj.submitted_at.isoformat(), obj.pk),
+        salt=_CURSOR_SALT,
+        compress=True,
+    )
+
+
+def _decode_cursor(token):
+    try:
+        return tuple(signing.loads(token, salt=_CURSOR_SALT))
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+
+
+def keyset_paginate(queryset, cursor, per_page):
+    """Return the KeysetPage for ``cursor`` (a token from a previous page, or None)."""
+    position = _decode_cursor(cursor) if cursor else None
+    direction = position[0] if position else None
+
+    if direction == "next":
+        _, submitted_at, pk = position
+        rows = list(
+            queryset.filter(
+                Q(submitted_at__lt=submitted_at) | Q(submitted_at=submitted_at, pk__lt=pk)
+            ).order_by("-submitted_at", "-pk")[: per_page + 1]
+        )
+        return KeysetPage(queryset, rows[:per_page], len(rows) > per_page, True)
+
+    if direction in {"prev", "last"}:
+        ascending = queryset.order_by("submitted_at", "pk")
+        if direction == "prev":
+            _, submitted_at, pk = position
+            ascending = ascending.filter(
+                Q(submitted_at__gt=submitted_at) | Q(submitted_at=submitted_at, pk__gt=pk)
+            )
+        rows = list(ascending[: per_page + 1])
+        items = rows[:per_page][::-1]
+        return KeysetPage(queryset, items, direction == "prev", len(rows) > per_page)
+
+    rows = list(queryset.order_by("-submitted_at", "-pk")[: per_page + 1])
+    return KeysetPage(queryset, rows[:per_page], len(rows) > per_page, False)
@@ -0,0 +1,204 @@
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from .models import SearchToken, StudentProfile
+from .sections import section_registry
+
+COLUMNS = ("email", "section", "password")
+NAME_COLUMNS = ("first_name", "last_name")
+BATCH_SIZE = 500
+
+
+def _split_name(name):
+    """Split a "Last, First" name into ``(first, last)``; ``None`` without a comma.
+
+    Names such as "Juan Dela Cruz" have no reliable split point, so rosters
+    either write them "Dela Cruz, Juan" or use first_name and last_name
+    columns.
+    """
+    last, comma, first = name.partition(",")
+    if not comma:
+        return None
+    return first.strip(), last.strip()
+
+
+def _password_error(password, email, first_name, last_name):
+    user = User(username=email, email=email, first_name=first_name, last_name=last_name)
+    try:
+        validate_password(password, user)
+    except ValidationError as exc:
+        return " ".join(exc.messages)
+    return None
+
+
+def parse_roster(stream):
+    """Read roster rows from a text stream.
+
+    Returns ``(students, errors)``; ``students`` are dicts ready for insertion
+    and ``errors`` describe the rows that were rejected.
+    """
+    reader = csv.reader(stream)
+    header = [column.strip().lower() for column in next(reader, [])]
+    missing = [column for column in COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"Roster is missing column(s): {', '.join(missing)}.")
+    if all(column in header for column in NAME_COLUMNS):
+        names = NAME_COLUMNS
+    elif "name" in header:
+        names = ("name",)
+    else:
+        raise ValueError('Roster needs first_name and last_name columns, or a name column written "Last, First".')
+    index = {column: header.index(column) for column in COLUMNS + names}
+
+    students, errors, seen = [], [], set()
+    for line, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        values = {
+            column: row[position].strip() if position < len(row) else ""
+            for column, position in index.items()
+        }
+        email = values["email"].lower()
+        if "name" in values:
+            split = _split_name(values["name"])
+        else:
+            split = values["first_name"], values["last_name"]
+        first_name, last_name = split or ("", "")
+        section = section_registry.get(values["section"].upper())
+        try:
+            validate_email(email)
+        except ValidationError:
+            error = "Invalid email address."
+        else:
+            if email in seen:
+                error = "Email appears more than once in the roster."
+            elif split is None:
+                error = 'Write the name as "Last, First".'
+            elif not first_name or not last_name:
+                error = "Name must include a first and last name."
+            elif section is None:
+                error = "Unknown section."
+            elif not values["password"]:
+                error = "Initial password is required."
+            else:
+                error = _password_error(values["password"], email, first_name, last_name)
+        if error:
+            errors.append({"line": line, "email": email, "error": error})
+            continue
+        seen.add(email)
+        students.append({
+            "line": line,
+            "email": email,
+            "first_name": first_name,
+            "last_name": last_name,
+            "section": section,
+            "password": values["password"],
+        })
+    return students, errors
+
+
+def _hash_passwords(passwords, workers, processes):
+    if workers == 1 or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+    # PBKDF2 releases the GIL, so threads hash in parallel too; processes
+    # only pay off outside the web server, where forking is safe.
+    executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor(max_workers=workers) as pool:
+        chunksize = max(1, len(passwords) // ((workers or os.cpu_count() or 1) * 4))
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def _insert_batch(students):
+    users = User.objects.bulk_create([
+        User(
+            username=student["email"],
+            email=student["email"],
+            first_name=student["first_name"],
+            last_name=student["last_name"],
+            password=student["password"],
+        )
+        for student in students
+    ])
+    # Not every backend returns primary keys from bulk inserts.
+    user_ids = dict(
+        User.objects.filter(username__in=[user.username for user in users])
+        .values_list("username", "id")
+    )
+    StudentProfile.objects.bulk_create([
+        StudentProfile(user_id=user_ids[student["email"]], section=student["section"])
+        for student in students
+    ])
+    profile_ids = dict(
+        StudentProfile.objects.filter(user_id__in=user_ids.values()).values_list("user_id", "id")
+    )
+    # bulk_create skips the signal that indexes new students for search.
+    tokens = []
+    for student in students:
+        profile_id = profile_ids[user_ids[student["email"]]]
+        tokens.extend(
+            SearchToken.build(
+                SearchToken.STUDENT, profile_id, student["first_name"], student["last_name"]
+            )
+        )
+    SearchToken.objects.bulk_create(tokens)
+
+
+def import_roster(stream, batch_size=BATCH_SIZE, workers=None, processes=True, max_rows=None):
+    """Create accounts for every valid, new student in a CSV roster.
+
+    Passwords are hashed across a pool of ``workers`` processes (all CPUs by
+    default), or threads with ``processes=False``, and rows are inserted with
+    bulk_create, one transaction per batch. A roster with more than
+    ``max_rows`` rows is refused before anything is hashed. Returns a summary
+    dict suitable for JSON.
+    """
+    started = time.perf_counter()
+    students, errors = parse_roster(stream)
+    total = len(students) + len(errors)
+    if max_rows is not None and total > max_rows:
+        raise ValueError(
+            f"The roster has {total} rows; uploads take at most {max_rows}. "
+            "Split it, or import it with the import_roster management command."
+        )
+
+    existing = set()
+    emails = [student["email"] for student in students]
+    for start in range(0, len(emails), batch_size):
+        existing.update(
+            User.objects.filter(username__in=emails[start:start + batch_size])
+            .values_list("username", flat=True)
+        )
+    if existing:
+        errors.extend(
+            {"line": student["line"], "email": student["email"], "error": "Account already exists."}
+            for student in students
+            if student["email"] in existing
+        )
+        students = [student for student in students if student["email"] not in existing]
+
+    hashes = _hash_passwords([student["password"] for student in students], workers, processes)
+    for student, hashed in zip(students, hashes):
+        student["password"] = hashed
+
+    for start in range(0, len(students), batch_size):
+        with transaction.atomic():
+            _insert_batch(students[start:start + batch_size])
+
+    seconds = time.perf_counter() - started
+    errors.sort(key=lambda error: error["line"])
+    return {
+        "rows": total,
+        "created": len(students),
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(len(students) / seconds, 1) if seconds else None,
+    }
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from .models import ClassSection
+
+# Seconds a process trusts its snapshot before reading the shared version again.
+CHECK_INTERVAL = 1.0
+
+
+class SectionRegistry:
+    """Process-local snapshot of the ClassSection table.
+
+    The table has 16 rows and almost never changes, so it is loaded once
+    and reloaded only when ClassSection.cache_version() moves (bumped by
+    signals whenever a section is saved, deleted or seeded). The version is
+    read at most once per CHECK_INTERVAL, so another process's change shows
+    up within that; changes made in this process call invalidate().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = (None, (), {}, {})
+        self._checked = float("-inf")
+
+    def invalidate(self):
+        """Read the version again on the next lookup."""
+        self._checked = float("-inf")
+
+    def _load(self):
+        state = self._state
+        now = time.monotonic()
+        if state[0] is not None and now - self._checked < CHECK_INTERVAL:
+            return state
+        current = ClassSection.cache_version()
+        self._checked = now
+        if current == state[0]:
+            return state
+        with self._lock:
+            if self._state[0] == current:
+                return self._state
+            ClassSection.ensure_seeded()
+            # Seeding bumps the version; record the one the rows belong to.
+            current = ClassSection.cache_version()
+            ordered = tuple(ClassSection.objects.order_by("section_id"))
+            by_id = {section.section_id: section for section in ordered}
+            by_year = {}
+            for section in ordered:
+                by_year.setdefault(section.year, []).append(section)
+            self._state = (current, ordered, by_id, by_year)
+            return self._state
+
+    def all(self):
+        return list(self._load()[1])
+
+    def get(self, section_id):
+        return self._load()[2].get(section_id)
+
+    def by_year(self, year):
+        return list(self._load()[3].get(year, ()))
+
+    def years(self):
+        return sorted(self._load()[3])
+
+
+section_registry = SectionRegistry()
@@ -0,0 +1,135 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from . import caching
+from .accounts import ensure_teacher_account
+from .archive import archive_dir
+from .middleware import remember_role
+from .models import (
+    Answer,
+    ClassSection,
+    SearchToken,
+    StudentProfile,
+    Survey,
+    SurveyArchive,
+    SurveyAssignment,
+    SurveySubmission,
+)
+from .sections import section_registry
+
+
+def _touches(update_fields, *names):
+    return update_fields is None or any(name in update_fields for name in names)
+
+
+@receiver(post_migrate)
+def provision_teacher_account(sender, app_config=None, **kwargs):
+    if app_config is not None and app_config.label == "main":
+        ensure_teacher_account(force=True)
+
+
+@receiver(user_logged_in)
+def store_role_in_session(sender, request, user, **kwargs):
+    if request is not None and hasattr(request, "session"):
+        remember_role(request, user)
+
+
+@receiver(post_save, sender=ClassSection)
+@receiver(post_delete, sender=ClassSection)
+def class_section_changed(sender, **kwargs):
+    ClassSection.bump_cache_version()
+    section_registry.invalidate()
+
+
+def _bump_survey(survey_id):
+    # Student dashboards of every assigned section list the survey too.
+    sections = SurveyAssignment.objects.filter(survey_id=survey_id).values_list("section_id", flat=True)
+    caching.bump(
+        (caching.SURVEY, survey_id),
+        *((caching.SECTION, section_id) for section_id in sections),
+    )
+
+
+@receiver(post_save, sender=Survey)
+def survey_saved(sender, instance, created, update_fields=None, **kwargs):
+    if not created:
+        _bump_survey(instance.pk)
+    if created or _touches(update_fields, "status"):
+        Survey.invalidate_teacher_counters(instance.teacher_id)
+    if created or _touches(update_fields, "title"):
+        SearchToken.reindex(SearchToken.SURVEY, instance.pk, instance.title)
+
+
+@receiver(post_delete, sender=Survey)
+def survey_deleted(sender, instance, **kwargs):
+    # Assignments are deleted (and bump their sections) before the survey.
+    caching.bump((caching.SURVEY, instance.pk))
+    Survey.invalidate_teacher_counters(instance.teacher_id)
+    SearchToken.objects.filter(kind=SearchToken.SURVEY, object_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=SurveyAssignment)
+@receiver(post_delete, sender=SurveyAssignment)
+def assignment_changed(sender, instance, **kwargs):
+    caching.bump((caching.SURVEY, instance.survey_id), (caching.SECTION, instance.section_id))
+
+
+@receiver(post_save, sender=SurveySubmission)
+def submission_saved(sender, instance, created, **kwargs):
+    caching.bump((caching.SURVEY, instance.survey_id), (caching.STUDENT, instance.student_id))
+    if created:
+        Survey.invalidate_teacher_counters(instance.survey.teacher_id)
+
+
+@receiver(post_delete, sender=SurveySubmission)
+def submission_deleted(sender, instance, **kwargs):
+    caching.bump((caching.SURVEY, instance.survey_id), (caching.STUDENT, instance.student_id))
+
+
+# Only per-object saves: answers are rewritten with queryset deletes and
+# bulk_create next to a submission save, which bumps the same scopes, and a
+# post_delete receiver would turn those fast deletes into per-row deletes.
+@receiver(post_save, sender=Answer)
+def answer_saved(sender, instance, **kwargs):
+    row = (
+        SurveySubmission.objects.filter(pk=instance.submission_id)
+        .values_list("survey_id", "student_id").first()
+    )
+    if row is not None:
+        caching.bump((caching.SURVEY, row[0]), (caching.STUDENT, row[1]))
+
+
+@receiver(post_delete, sender=SurveyArchive)
+def survey_archive_deleted(sender, instance, **kwargs):
+    path = archive_dir() / instance.file_name
+    transaction.on_commit(lambda: path.unlink(missing_ok=True))
+
+
+@receiver(post_save, sender=StudentProfile)
+def student_profile_saved(sender, instance, created, **kwargs):
+    # Sessions keep the profile and section; make them resolve it again.
+    caching.bump((caching.ROLE, instance.user_id))
+    if created:
+        user = instance.user
+        SearchToken.reindex(SearchToken.STUDENT, instance.pk, user.first_name, user.last_name)
+
+
+@receiver(post_delete, sender=StudentProfile)
+def student_profile_deleted(sender, instance, **kwargs):
+    caching.bump((caching.ROLE, instance.user_id))
+    SearchToken.objects.filter(kind=SearchToken.STUDENT, object_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Logins save last_login only; skip the profile lookup for those.
+    if created or not _touches(update_fields, "first_name", "last_name"):
+        return
+    profile_id = (
+        StudentProfile.objects.filter(user=instance).values_list("id", flat=True).first()
+    )
+    if profile_id is not None:
+        SearchToken.reindex(SearchToken.STUDENT, profile_id, instance.first_name, instance.last_name)
@@ -0,0 +1,986 @@
+(function() {
+    const builder = document.querySelector('.survey-builder');
+    if (!builder) {
+        return;
+    }
+
+    const initialSurveyElement = document.getElementById('initial-survey-data');
+    const initialSurveyData = initialSurveyElement ? JSON.parse(initialSurveyElement.textContent) : null;
+
+    const stack = builder.querySelector('#question-stack');
+    const dropMarker = builder.querySelector('#question-drop-marker');
+    const tabButtons = document.querySelectorAll('.pill-tabs button[data-view]');
+    const panels = builder.querySelectorAll('[data-panel]');
+    const descriptionInput = builder.querySelector('#survey-description');
+    const titleInput = document.getElementById('survey-title');
+    const dueDateInput = document.getElementById('survey-due-date');
+    const saveDraftBtn = document.getElementById('save-draft-btn');
+    const publishBtn = document.getElementById('publish-btn');
+    const previewBtn = document.getElementById('preview-btn');
+    const responsesBtn = document.getElementById('view-responses-btn');
+    const deleteSurveyBtn = document.getElementById('delete-survey-btn');
+    const sectionInputs = builder.querySelectorAll('input[name="assigned_sections"]');
+    const availabilityInputs = builder.querySelectorAll('input[name="survey_availability"]');
+    const toolbox = document.getElementById('question-toolbox');
+    const typeLabels = {
+        short_text: 'Short Text',
+        multiple_choice: 'Multiple Choice',
+        likert: 'Likert Scale',
+    };
+    if (!stack || !dropMarker) {
+        return;
+    }
+
+    let questionCounter = stack.querySelectorAll('.question-card').length;
+    stack.appendChild(dropMarker);
+
+    function formatStatusLabel(status) {
+        if (!status) {
+            return '';
+        }
+        const normalized = String(status).toLowerCase();
+        if (normalized === 'open') {
+            return 'Open';
+        }
+        if (normalized === 'published') {
+            return 'Open';
+        }
+        if (normalized === 'closed') {
+            return 'Closed';
+        }
+        if (normalized === 'archived') {
+            return 'Archived';
+        }
+        if (normalized === 'draft') {
+            return 'Draft';
+        }
+        return normalized.charAt(0).toUpperCase() + normalized.slice(1);
+    }
+
+    function isClosedStatus(status) {
+        const normalized = String(status || '').toLowerCase();
+        return normalized === 'closed' || normalized === 'archived';
+    }
+
+    function isOpenStatus(status) {
+        const normalized = String(status || '').toLowerCase();
+        return normalized === 'open' || normalized === 'published';
+    }
+
+    function nextQuestionId() {
+        questionCounter += 1;
+        return 'q-' + Date.now() + '-' + questionCounter;
+    }
+
+    function ensureDropMarkerResting() {
+        dropMarker.classList.remove('is-visible');
+        dropMarker.remove();
+        stack.appendChild(dropMarker);
+    }
+
+    function getTypeLabel(type) {
+        return typeLabels[type] || 'Question';
+    }
+
+    function updateTypeBadge(card, type) {
+        const badge = card.querySelector('[data-role="question-type-label"]');
+        if (badge) {
+            badge.textContent = getTypeLabel(type);
+        }
+    }
+
+    function showView(view) {
+        const target = view === 'settings' ? 'settings' : 'questions';
+        panels.forEach(function(panel) {
+            const isTarget = panel.dataset.panel === target;
+            panel.classList.toggle('is-hidden', !isTarget);
+        });
+        tabButtons.forEach(function(button) {
+            const isActive = (button.dataset.view || 'questions') === target;
+            button.classList.toggle('active', isActive);
+            button.setAttribute('aria-pressed', isActive ? 'true' : 'false');
+        });
+        if (target !== 'questions') {
+            ensureDropMarkerResting();
+        }
+    }
+
+    function createOptionItem(labelText) {
+        const li = document.createElement('li');
+        li.className = 'options-item';
+
+        const icon = document.createElement('span');
+        icon.setAttribute('aria-hidden', 'true');
+        icon.textContent = '◉';
+        li.appendChild(icon);
+
+        const input = document.createElement('input');
+        input.type = 'text';
+        input.className = 'question-field';
+        input.value = labelText || '';
+        input.setAttribute('aria-label', 'Choice label');
+        li.appendChild(input);
+
+        const remove = document.createElement('button');
+        remove.type = 'button';
+        remove.dataset.action = 'remove-option';
+        remove.setAttribute('aria-label', 'Remove option');
+        remove.textContent = '✕';
+        li.appendChild(remove);
+
+        return li;
+    }
+
+    function createLikertRow(labelText) {
+        const row = document.createElement('div');
+        row.className = 'likert-editor-row';
+
+        const input = document.createElement('input');
+        input.type = 'text';
+        input.value = labelText || '';
+        input.placeholder = 'Label (optional)';
+        input.dataset.role = 'likert-input';
+        row.appendChild(input);
+
+        const remove = document.createElement('button');
+        remove.type = 'button';
+        remove.className = 'likert-remove';
+        remove.dataset.action = 'likert-remove';
+        remove.setAttribute('aria-label', 'Remove likert option');
+        remove.textContent = '×';
+        row.appendChild(remove);
+
+        return row;
+    }
+
+    function updateLikertPreview(wrapper) {
+        if (!wrapper) {
+            return;
+        }
+        const preview = wrapper.querySelector('[data-role="likert-preview"]');
+        if (!preview) {
+            return;
+        }
+        const inputs = wrapper.querySelectorAll('[data-role="likert-input"]');
+        preview.innerHTML = '';
+        inputs.forEach(function(input, index) {
+            const label = document.createElement('div');
+            label.className = 'likert-preview-option';
+            const text = input.value.trim() || 'Label ' + (index + 1);
+            label.textContent = text;
+            preview.appendChild(label);
+        });
+    }
+
+    function buildLikertEditor() {
+        const wrapper = document.createElement('div');
+        wrapper.className = 'likert-editor';
+
+        const list = document.createElement('div');
+        list.className = 'likert-editor-list';
+        list.dataset.role = 'likert-list';
+        list.appendChild(createLikertRow(''));
+        list.appendChild(createLikertRow(''));
+        list.appendChild(createLikertRow(''));
+        wrapper.appendChild(list);
+
+        const addRow = document.createElement('div');
+        addRow.className = 'likert-editor-actions';
+        const addButton = document.createElement('button');
+        addButton.type = 'button';
+        addButton.className = 'add-inline-button';
+        addButton.dataset.action = 'likert-add';
+        addButton.innerHTML = '<span aria-hidden="true">+</span> Add';
+        addRow.appendChild(addButton);
+        wrapper.appendChild(addRow);
+
+        const preview = document.createElement('div');
+        preview.className = 'likert-preview';
+        const title = document.createElement('span');
+        title.className = 'likert-preview-title';
+        title.textContent = 'Preview';
+        const options = document.createElement('div');
+        options.className = 'likert-preview-options';
+        options.dataset.role = 'likert-preview';
+        preview.appendChild(title);
+        preview.appendChild(options);
+        wrapper.appendChild(preview);
+
+        updateLikertPreview(wrapper);
+
+        return wrapper;
+    }
+
+    function renderQuestionFields(card, type) {
+        const container = card.querySelector('[data-role="question-fields"]');
+        if (!container) {
+            return;
+        }
+        container.innerHTML = '';
+        card.dataset.questionType = type;
+        updateTypeBadge(card, type);
+
+        if (type === 'short_text') {
+            const input = document.createElement('input');
+            input.type = 'text';
+            input.className = 'question-field';
+            input.placeholder = 'Short answer text';
+            input.setAttribute('aria-label', 'Short answer text preview');
+            input.disabled = true;
+            container.appendChild(input);
+            return;
+        }
+
+        if (type === 'multiple_choice') {
+            const list = document.createElement('ul');
+            list.className = 'options-list';
+            list.dataset.role = 'options-list';
+            list.appendChild(createOptionItem('Option 1'));
+            list.appendChild(createOptionItem('Option 2'));
+            container.appendChild(list);
+
+            const addOption = document.createElement('button');
+            addOption.type = 'button';
+            addOption.className = 'add-inline-button';
+            addOption.dataset.action = 'add-option';
+            addOption.innerHTML = '<span aria-hidden="true">+</span> Add Option';
+            container.appendChild(addOption);
+            return;
+        }
+
+        if (type === 'likert') {
+            container.appendChild(buildLikertEditor());
+            return;
+        }
+    }
+
+    function createQuestionCard(type) {
+        const card = document.createElement('article');
+        card.className = 'question-card';
+        card.dataset.questionId = nextQuestionId();
+        card.dataset.questionType = type;
+
+        card.innerHTML = '' +
+            '<div class="question-card__handle" role="button" aria-label="Drag to reorder question">⋮⋮</div>' +
+            '<div class="question-card__body">' +
+                '<input type="text" class="question-title-input" value="Untitled Question" aria-label="Question title">' +
+                '<div class="question-dynamic" data-role="question-fields"></div>' +
+            '</div>' +
+            '<div class="question-card__meta">' +
+                '<span class="question-type-badge" data-role="question-type-label">' + getTypeLabel(type) + '</span>' +
+                '<div class="question-actions">' +
+                    '<button type="button" data-action="duplicate" aria-label="Duplicate question">⧉</button>' +
+                    '<button type="button" data-action="delete" aria-label="Delete question">🗑</button>' +
+                '</div>' +
+                '<label class="required-toggle">' +
+                    'Required' +
+                    '<span class="switch">' +
+                        '<input type="checkbox">' +
+                        '<span class="slider"></span>' +
+                    '</span>' +
+                '</label>' +
+            '</div>';
+
+        renderQuestionFields(card, type);
+        card.dataset.initialized = 'true';
+        card.setAttribute('draggable', 'false');
+
+        const requiredToggle = card.querySelector('.required-toggle input');
+        if (requiredToggle) {
+            requiredToggle.checked = false;
+        }
+
+        return card;
+    }
+
+    function refreshDeleteButtons() {
+        const cards = stack.querySelectorAll('.question-card');
+        const disableDelete = cards.length <= 1;
+        stack.classList.toggle('is-empty', cards.length === 0);
+        cards.forEach(function(card) {
+            const btn = card.querySelector('[data-action="delete"]');
+            if (btn) {
+                btn.disabled = disableDelete;
+                btn.setAttribute('aria-disabled', disableDelete ? 'true' : 'false');
+            }
+        });
+    }
+
+    function focusTitle(card) {
+        const input = card.querySelector('.question-title-input');
+        if (input) {
+            input.focus();
+            input.select();
+        }
+    }
+
+    function addNewQuestion(type) {
+        const card = createQuestionCard(type || 'short_text');
+        stack.insertBefore(card, dropMarker);
+        refreshDeleteButtons();
+        ensureDropMarkerResting();
+        focusTitle(card);
+    }
+
+    function hydrateSurvey(data) {
+        if (!data) {
+            refreshDeleteButtons();
+            ensureDropMarkerResting();
+            showView('questions');
+            return;
+        }
+
+        currentSurveyId = data.id || null;
+
+        if (titleInput) {
+            titleInput.value = data.title || 'Untitled Form';
+        }
+        if (descriptionInput) {
+            const limit = typeof descriptionInput.maxLength === 'number' && descriptionInput.maxLength > 0
+                ? descriptionInput.maxLength
+                : undefined;
+            const descriptionValue = (data.description || '');
+            descriptionInput.value = limit ? descriptionValue.slice(0, limit) : descriptionValue;
+        }
+        if (dueDateInput) {
+            dueDateInput.value = data.due_date || '';
+        }
+
+        const selectedSections = new Set(Array.isArray(data.sections) ? data.sections : []);
+        Array.prototype.forEach.call(sectionInputs, function(input) {
+            input.checked = selectedSections.has(input.value);
+        });
+
+        const existingCards = Array.from(stack.querySelectorAll('.question-card'));
+        existingCards.forEach(function(card) {
+            card.remove();
+        });
+
+        questionCounter = 0;
+
+        const questions = Array.isArray(data.questions) ? data.questions : [];
+        questions.forEach(function(question) {
+            const type = question.question_type || 'short_text';
+            const card = createQuestionCard(type);
+            const titleField = card.querySelector('.question-title-input');
+            if (titleField) {
+                titleField.value = question.title || '';
+            }
+            const requiredToggle = card.querySelector('.required-toggle input');
+            if (requiredToggle) {
+                requiredToggle.checked = !!question.is_required;
+            }
+
+            if (type === 'multiple_choice') {
+                const list = card.querySelector('.options-list');
+                if (list) {
+                    list.innerHTML = '';
+                    const choices = (question.choices && question.choices.length ? question.choices : ['Option 1', 'Option 2']);
+                    choices.forEach(function(choiceText, index) {
+                        list.appendChild(createOptionItem(choiceText || ('Option ' + (index + 1))));
+                    });
+                }
+            } else if (type === 'likert') {
+                const editor = card.querySelector('.likert-editor');
+                if (editor) {
+                    const list = editor.querySelector('[data-role="likert-list"]');
+                    if (list) {
+                        list.innerHTML = '';
+                        const labels = (question.scale_labels && question.scale_labels.length ? question.scale_labels : ['Label 1', 'Label 2']);
+                        labels.forEach(function(labelText) {
+                            list.appendChild(createLikertRow(labelText));
+                        });
+                    }
+                    updateLikertPreview(editor);
+                }
+            }
+
+            stack.insertBefore(card, dropMarker);
+        });
+
+        refreshDeleteButtons();
+        ensureDropMarkerResting();
+        showView('questions');
+    }
+
+    stack.querySelectorAll('.question-card').forEach(function(card) {
+        const currentType = card.dataset.questionType || 'short_text';
+        if (!card.dataset.initialized) {
+            renderQuestionFields(card, currentType);
+            card.dataset.initialized = 'true';
+        } else {
+            updateTypeBadge(card, currentType);
+        }
+        card.setAttribute('draggable', 'false');
+    });
+
+    const hasPreloadedQuestions = stack.querySelector('.question-card[data-initialized="true"]') !== null;
+
+    if (initialSurveyData) {
+        if (!hasPreloadedQuestions) {
+            hydrateSurvey(initialSurveyData);
+        } else {
+            stack.querySelectorAll('.likert-editor').forEach(function(editor) {
+                updateLikertPreview(editor);
+            });
+            refreshDeleteButtons();
+            ensureDropMarkerResting();
+            showView('questions');
+        }
+    } else {
+        refreshDeleteButtons();
+        ensureDropMarkerResting();
+        showView('questions');
+    }
+
+    if (descriptionInput) {
+        descriptionInput.addEventListener('input', function() {
+            if (this.value.length > 30) {
+                this.value = this.value.slice(0, 30);
+            }
+        });
+    }
+
+    tabButtons.forEach(function(button) {
+        button.addEventListener('click', function() {
+            const view = button.dataset.view || 'questions';
+            showView(view);
+        });
+    });
+
+    if (toolbox) {
+        toolbox.addEventListener('click', function(event) {
+            const item = event.target.closest('.toolbox-item');
+            if (!item) {
+                return;
+            }
+            const type = item.dataset.questionType || 'short_text';
+            addNewQuestion(type);
+        });
+
+        toolbox.addEventListener('dragstart', function(event) {
+            const item = event.target.closest('.toolbox-item');
+            if (!item) {
+                return;
+            }
+            draggingToolType = item.dataset.questionType || 'short_text';
+            draggingToolElement = item;
+            item.classList.add('is-dragging');
+            stack.classList.add('is-drop-active');
+            dropMarker.classList.add('is-visible');
+            if (event.dataTransfer) {
+                event.dataTransfer.effectAllowed = 'copy';
+                event.dataTransfer.setData('text/plain', draggingToolType);
+            }
+        });
+
+        toolbox.addEventListener('dragend', function(event) {
+            const item = event.target.closest('.toolbox-item');
+            if (item) {
+                item.classList.remove('is-dragging');
+            }
+            clearToolDragState();
+            ensureDropMarkerResting();
+        });
+    }
+
+    stack.addEventListener('click', function(event) {
+        const target = event.target;
+        const action = target.dataset.action;
+        if (!action) {
+            return;
+        }
+        const card = target.closest('.question-card');
+        if (!card) {
+            return;
+        }
+
+        if (action === 'duplicate') {
+            const originalType = card.dataset.questionType || 'short_text';
+            const clone = card.cloneNode(true);
+            clone.dataset.questionId = nextQuestionId();
+           
+            clone.dataset.initialized = 'true';
+            clone.classList.remove('dragging');
+            clone.setAttribute('draggable', 'false');
+            clone.dataset.questionType = originalType;
+            updateTypeBadge(clone, originalType);
+            stack.insertBefore(clone, card.nextSibling === dropMarker ? dropMarker : card.nextSibling);
+            const clonedEditor = clone.querySelector('.likert-editor');
+            if (clonedEditor) {
+                updateLikertPreview(clonedEditor);
+            }
+            refreshDeleteButtons();
+            ensureDropMarkerResting();
+            focusTitle(clone);
+            return;
+        }
+
+        if (action === 'delete') {
+            if (target.disabled) {
+                return;
+            }
+            const cards = stack.querySelectorAll('.question-card');
+            if (cards.length <= 1) {
+                return;
+            }
+            card.remove();
+            refreshDeleteButtons();
+            ensureDropMarkerResting();
+            return;
+        }
+
+        if (action === 'add-option') {
+            const list = card.querySelector('.options-list');
+            if (!list) {
+                return;
+            }
+            const nextIndex = list.querySelectorAll('.options-item').length + 1;
+            const item = createOptionItem('Option ' + nextIndex);
+            list.appendChild(item);
+            const input = item.querySelector('input');
+            if (input) {
+                input.focus();
+            }
+            return;
+        }
+
+        if (action === 'remove-option') {
+            const list = card.querySelector('.options-list');
+            if (!list) {
+                return;
+            }
+            const items = list.querySelectorAll('.options-item');
+            if (items.length <= 1) {
+                return;
+            }
+            const item = target.closest('.options-item');
+            if (item) {
+                item.remove();
+            }
+            return;
+        }
+
+        if (action === 'likert-add') {
+            const editor = target.closest('.likert-editor');
+            if (!editor) {
+                return;
+            }
+            const list = editor.querySelector('[data-role="likert-list"]');
+            if (!list) {
+                return;
+            }
+            list.appendChild(createLikertRow(''));
+            updateLikertPreview(editor);
+            const lastInput = list.querySelector('.likert-editor-row:last-child input');
+            if (lastInput) {
+                lastInput.focus();
+            }
+            return;
+        }
+
+        if (action === 'likert-remove') {
+            const editor = target.closest('.likert-editor');
+            if (!editor) {
+                return;
+            }
+            const rows = editor.querySelectorAll('.likert-editor-row');
+            if (rows.length <= 2) {
+                return;
+            }
+            const row = target.closest('.likert-editor-row');
+            if (row) {
+                row.remove();
+                updateLikertPreview(editor);
+            }
+            return;
+        }
+    });
+
+    stack.addEventListener('input', function(event) {
+        if (event.target.dataset && event.target.dataset.role === 'likert-input') {
+            const editor = event.target.closest('.likert-editor');
+            updateLikertPreview(editor);
+        }
+    });
+
+    let draggedCard = null;
+    let dragReadyCard = null;
+    let draggingToolType = null;
+    let draggingToolElement = null;
+
+    function clearToolDragState() {
+        if (draggingToolElement) {
+            draggingToolElement.classList.remove('is-dragging');
+        }
+        draggingToolElement = null;
+        draggingToolType = null;
+        stack.classList.remove('is-drop-active');
+    }
+
+    stack.addEventListener('pointerdown', function(event) {
+        const card = event.target.closest('.question-card');
+        if (!card) {
+            return;
+        }
+        if (event.target.closest('.question-card__handle')) {
+            dragReadyCard = card;
+            card.setAttribute('draggable', 'true');
+        } else {
+            card.setAttribute('draggable', 'false');
+        }
+    });
+
+    function resetDragReady() {
+        if (dragReadyCard) {
+            dragReadyCard.setAttribute('draggable', 'false');
+            dragReadyCard = null;
+        }
+    }
+
+    stack.addEventListener('pointerup', resetDragReady);
+    stack.addEventListener('pointercancel', resetDragReady);
+
+    stack.addEventListener('dragstart', function(event) {
+        const card = event.target.closest('.question-card');
+        if (!card || card !== dragReadyCard) {
+            event.preventDefault();
+            return;
+        }
+        draggedCard = card;
+        card.classList.add('dragging');
+        dropMarker.classList.add('is-visible');
+        event.dataTransfer.effectAllowed = 'move';
+        event.dataTransfer.setData('text/plain', card.dataset.questionId || '');
+    });
+
+    stack.addEventListener('dragover', function(event) {
+        if (!draggedCard && !draggingToolType) {
+            return;
+        }
+        event.preventDefault();
+        const afterElement = getDragAfterElement(stack, event.clientY);
+        if (afterElement) {
+            stack.insertBefore(dropMarker, afterElement);
+        } else {
+            stack.appendChild(dropMarker);
+        }
+        dropMarker.classList.add('is-visible');
+    });
+
+    stack.addEventListener('drop', function(event) {
+        if (!draggedCard && !draggingToolType) {
+            return;
+        }
+        event.preventDefault();
+        if (draggedCard) {
+            stack.insertBefore(draggedCard, dropMarker);
+            draggedCard.classList.remove('dragging');
+            draggedCard = null;
+            resetDragReady();
+            refreshDeleteButtons();
+        } else if (draggingToolType) {
+            const newCard = createQuestionCard(draggingToolType);
+            stack.insertBefore(newCard, dropMarker);
+            refreshDeleteButtons();
+            focusTitle(newCard);
+        }
+        ensureDropMarkerResting();
+        clearToolDragState();
+    });
+
+    stack.addEventListener('dragend', function() {
+        if (draggedCard) {
+            draggedCard.classList.remove('dragging');
+            draggedCard = null;
+        }
+        resetDragReady();
+        ensureDropMarkerResting();
+        clearToolDragState();
+    });
+
+    function getDragAfterElement(container, y) {
+        const cards = [].slice.call(container.querySelectorAll('.question-card:not(.dragging)'));
+        let closest = { offset: Number.NEGATIVE_INFINITY, element: null };
+
+        cards.forEach(function(child) {
+            const box = child.getBoundingClientRect();
+            const offset = y - box.top - box.height / 2;
+            if (offset < 0 && offset > closest.offset) {
+                closest = { offset: offset, element: child };
+            }
+        });
+
+        return closest.element;
+    }
+
+    const routes = {
+        save: builder.dataset.saveUrl,
+        previewTemplate: builder.dataset.previewUrl,
+        collection: builder.dataset.collectionUrl,
+        archiveTemplate: builder.dataset.archiveUrl,
+    };
+
+    let currentSurveyId = initialSurveyData ? initialSurveyData.id : null;
+    let isSaving = false;
+
+    function updateDeleteButtonState() {
+        if (!deleteSurveyBtn) {
+            return;
+        }
+        const disabled = !currentSurveyId;
+        deleteSurveyBtn.disabled = disabled;
+        deleteSurveyBtn.setAttribute('aria-disabled', disabled ? 'true' : 'false');
+    }
+
+    function buildArchiveUrl() {
+        if (!routes.archiveTemplate || !currentSurveyId) {
+            return null;
+        }
+        return routes.archiveTemplate.replace('/0/', `/${currentSurveyId}/`);
+    }
+
+    updateDeleteButtonState();
+
+    function getCsrfToken() {
+        const match = document.cookie.match(/csrftoken=([^;]+)/);
+        return match ? match[1] : '';
+    }
+
+    function collectSurveyData() {
+        const payload = {
+            title: (titleInput ? titleInput.value : '').trim(),
+            description: (descriptionInput ? descriptionInput.value : '').trim(),
+            due_date: dueDateInput && dueDateInput.value ? dueDateInput.value : null,
+            sections: Array.from(sectionInputs).filter(function(input) { return input.checked; }).map(function(input) { return input.value; }),
+            questions: [],
+            availability: (function() {
+                const selected = Array.from(availabilityInputs || []).find(function(input) { return input.checked; });
+                return selected ? selected.value : 'open';
+            }()),
+        };
+
+        const cards = stack.querySelectorAll('.question-card');
+        cards.forEach(function(card, index) {
+            const typeValue = card.dataset.questionType || 'short_text';
+            const questionTitle = (card.querySelector('.question-title-input') || {}).value || '';
+            const isRequired = !!(card.querySelector('.required-toggle input') || { checked: false }).checked;
+
+            const questionPayload = {
+                question_type: typeValue,
+                title: questionTitle.trim() || 'Untitled Question',
+                is_required: isRequired,
+                order: index + 1,
+            };
+
+            if (typeValue === 'multiple_choice') {
+                const choices = Array.from(card.querySelectorAll('.options-list .question-field')).map(function(input) {
+                    return input.value.trim();
+                }).filter(Boolean);
+                questionPayload.choices = choices;
+            } else if (typeValue === 'likert') {
+                const labels = Array.from(card.querySelectorAll('.likert-editor-row input[data-role="likert-input"]')).map(function(input) {
+                    return input.value.trim();
+                }).filter(Boolean);
+                questionPayload.scale_labels = labels;
+            } else if (typeValue === 'short_text') {
+                questionPayload.max_length = 50;
+            }
+
+            payload.questions.push(questionPayload);
+        });
+
+        return payload;
+    }
+
+    function validateSurveyData(payload, status) {
+        if (!payload.title) {
+            throw new Error('Please provide a survey title.');
+        }
+        if (payload.questions.length === 0) {
+            throw new Error('Add at least one question before saving.');
+        }
+        if (isOpenStatus(status) && payload.sections.length === 0) {
+
+            throw new Error('Select at least one section before publishing.');
+        }
+        if (isOpenStatus(status)) {
+            const invalidQuestion = payload.questions.find(function(question) {
+                if (question.question_type === 'multiple_choice') {
+                    return !question.choices || question.choices.length < 2;
+                }
+                if (question.question_type === 'likert') {
+                    return !question.scale_labels || question.scale_labels.length < 2;
+                }
+                return false;
+            });
+            if (invalidQuestion) {
+                throw new Error('Please provide enough answer options for each question before publishing.');
+            }
+        }
+    }
+
+    function showMessage(message) {
+        window.alert(message);
+    }
+
+    async function archiveSurvey() {
+        if (!deleteSurveyBtn) {
+            return;
+        }
+        if (!currentSurveyId) {
+            showMessage('Save this survey before deleting it.');
+            updateDeleteButtonState();
+            return;
+        }
+        if (!window.confirm('Archive this survey? It will disappear from your collection but stay saved in the database.')) {
+            updateDeleteButtonState();
+            return;
+        }
+
+        deleteSurveyBtn.disabled = true;
+
+        try {
+            const archiveUrl = buildArchiveUrl();
+            if (!archiveUrl) {
+                throw new Error('Unable to find the archive path for this survey.');
+            }
+            const response = await fetch(archiveUrl, {
+                method: 'POST',
+                headers: {
+                    'X-CSRFToken': getCsrfToken(),
+                },
+            });
+            const result = await response.json();
+            if (!response.ok) {
+                throw new Error(result.error || 'Unable to archive this survey right now.');
+            }
+            currentSurveyId = null;
+            updateDeleteButtonState();
+            showMessage('Survey archived. Redirecting to your collection.');
+            window.location.href = routes.collection;
+        } catch (error) {
+            updateDeleteButtonState();
+            showMessage(error.message);
+        }
+    }
+
+    async function submitSurvey(status, options) {
+        if (isSaving) {
+            return;
+        }
+        options = options || {};
+        const payload = collectSurveyData();
+        payload.status = status;
+        if (currentSurveyId) {
+            payload.survey_id = currentSurveyId;
+        }
+
+
+        try {
+            validateSurveyData(payload, status);
+        } catch (validationError) {
+            showMessage(validationError.message);
+            return;
+        }
+
+        isSaving = true;
+        let previewWindow = null;
+        if (options.preview) {
+            previewWindow = window.open('', '_blank');
+        }
+
+        try {
+            const response = await fetch(routes.save, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCsrfToken(),
+                },
+                body: JSON.stringify(payload),
+            });
+
+            const result = await response.json();
+            if (!response.ok) {
+                if (previewWindow && !previewWindow.closed) {
+                    previewWindow.close();
+                }
+                throw new Error(result.error || 'Something went wrong while saving the survey.');
+            }
+
+            currentSurveyId = result.id;
+            updateDeleteButtonState();
+            if (result.status) {
+                const statusBadge = document.getElementById('survey-status-badge');
+                if (statusBadge) {
+                    statusBadge.textContent = formatStatusLabel(result.status);
+                    statusBadge.classList.toggle('is-closed', isClosedStatus(result.status));
+                }
+                if (availabilityInputs && availabilityInputs.length) {
+                    availabilityInputs.forEach(function(input) {
+                        if (isClosedStatus(result.status)) {
+                            input.checked = input.value === 'closed';
+                        } else if (isOpenStatus(result.status) || result.status === 'draft') {
+                            input.checked = input.value === 'open';
+                        }
+                    });
+                }
+            }
+
+            if (options.preview) {
+                const previewUrl = routes.previewTemplate.replace('/0/', `/${currentSurveyId}/`);
+                if (previewWindow && !previewWindow.closed) {
+                    previewWindow.location.href = previewUrl;
+                } else {
+                    window.open(previewUrl, '_blank');
+                }
+
+                showMessage('Latest changes saved. Opening preview.');
+                return;
+            }
+
+            if (isOpenStatus(status)) {
+                showMessage('Survey opened successfully!');
+                window.location.href = routes.collection;
+            } else {
+                showMessage('Survey saved to drafts.');
+            }
+        } catch (error) {
+            if (previewWindow && !previewWindow.closed) {
+                previewWindow.close();
+            }
+            showMessage(error.message);
+        } finally {
+            isSaving = false;
+        }
+    }
+
+    if (saveDraftBtn) {
+        saveDraftBtn.addEventListener('click', function() {
+            submitSurvey('draft');
+        });
+    }
+
+    if (publishBtn) {
+        publishBtn.addEventListener('click', function() {
+            submitSurvey('open');
+        });
+    }
+
+    if (previewBtn) {
+        previewBtn.addEventListener('click', function() {
+            submitSurvey('draft', { preview: true });
+        });
+    }
+
+    if (deleteSurveyBtn) {
+        deleteSurveyBtn.addEventListener('click', archiveSurvey);
+    }
+
+    if (responsesBtn) {
+        responsesBtn.onclick = function() {
+            window.location.href = `/teacher/surveys/${currentSurveyId}/responses`;
+        }
+    }
+
+}());
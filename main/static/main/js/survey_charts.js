@@ -0,0 +1,78 @@
+(function() {
+    // Draws "NN%" on each pie slice; stands in for chartjs-plugin-datalabels.
+    const percentLabels = {
+        id: 'percentLabels',
+        afterDatasetsDraw(chart) {
+            const data = chart.data.datasets[0].data;
+            const total = data.reduce((sum, val) => sum + val, 0);
+            if (!total) return;
+            const ctx = chart.ctx;
+            ctx.save();
+            ctx.fillStyle = '#fff';
+            ctx.font = 'bold 16px sans-serif';
+            ctx.textAlign = 'center';
+            ctx.textBaseline = 'middle';
+            chart.getDatasetMeta(0).data.forEach((arc, index) => {
+                const value = data[index];
+                if (!value || !chart.getDataVisibility(index)) return;
+                const position = arc.tooltipPosition();
+                ctx.fillText(`${(value / total * 100).toFixed(0)}%`, position.x, position.y);
+            });
+            ctx.restore();
+        }
+    };
+
+    // Builds one chart per MCQ/LIKERT summary found in the json_script element.
+    // Returns the charts keyed by question id.
+    window.renderSurveyCharts = function(dataElementId) {
+        const charts = {};
+        const dataElement = document.getElementById(dataElementId);
+        if (!dataElement || !window.Chart) return charts;
+
+        (JSON.parse(dataElement.textContent) || []).forEach((summary) => {
+            const canvas = document.getElementById(`chart-${summary.question_id}`);
+            if (!canvas) return;
+            const data = {
+                labels: summary.labels,
+                datasets: [{
+                    label: 'Responses',
+                    data: summary.values,
+                    borderWidth: 1
+                }]
+            };
+            if (summary.type === "MCQ") {
+                charts[summary.question_id] = new Chart(canvas, {
+                    type: 'pie',
+                    data: data,
+                    options: {
+                        responsive: true,
+                        maintainAspectRatio: false,
+                        plugins: {
+                            legend: {position: 'right'}
+                        }
+                    },
+                    plugins: [percentLabels]
+                });
+            } else if (summary.type === "LIKERT") {
+                charts[summary.question_id] = new Chart(canvas, {
+                    type: 'bar',
+                    data: data,
+                    options: {
+                        responsive: true,
+                        maintainAspectRatio: false,
+                        scales: {
+                            y: {
+                                beginAtZero: true,
+                                ticks: {stepSize: 1}
+                            }
+                        },
+                        plugins: {
+                            legend: {display: false}
+                        }
+                    }
+                });
+            }
+        });
+        return charts;
+    };
+}());
@@ -0,0 +1,3 @@
+document.addEventListener("DOMContentLoaded", function () {
+    window.renderSurveyCharts("analytics-charts");
+});
@@ -0,0 +1,137 @@
+(function() {
+    const layout = document.querySelector('.layout');
+    const toggle = document.getElementById('sidebar-toggle');
+    if (!layout || !toggle) {
+        return;
+    }
+    toggle.addEventListener('click', function() {
+        layout.classList.toggle('is-collapsed');
+    });
+}());
+
+document.addEventListener("DOMContentLoaded", () => {
+    const surveyTitle = document.getElementById("surveyTitle");
+    const modal = document.getElementById("surveyModal");
+    const searchInput = document.getElementById("surveySearch");
+    const surveyList = document.getElementById("surveyList");
+    const selectBtn = document.getElementById("surveySelectBtn");
+    const hiddenInput = document.getElementById("selectedSurveyId");
+    if (!surveyTitle || !modal) return;
+
+    let selectedLi = null;
+
+    // Open modal
+    surveyTitle.addEventListener("click", () => {
+        modal.style.display = "flex";
+        searchInput.value = "";
+        filterList(""); // reset filter
+    });
+
+    // Close modal on click outside
+    modal.addEventListener("click", (e) => {
+        if(e.target === modal) modal.style.display = "none";
+    });
+
+    // Filter survey list in real-time
+    searchInput.addEventListener("input", () => {
+        filterList(searchInput.value);
+    });
+
+    function filterList(query) {
+        query = query.toLowerCase();
+        Array.from(surveyList.children).forEach(li => {
+            if(li.textContent.toLowerCase().includes(query)) {
+                li.style.display = "block";
+            } else {
+                li.style.display = "none";
+            }
+        });
+    }
+
+    // Click to select/highlight survey
+    Array.from(surveyList.children).forEach(li => {
+        li.addEventListener("click", () => {
+            // Remove previous highlight
+            if(selectedLi) selectedLi.style.background = "";
+            selectedLi = li;
+            li.style.background = "#d0f0ea"; // highlight color
+        });
+    });
+
+    // Confirm selection
+    selectBtn.addEventListener("click", () => {
+        if(selectedLi) {
+            const id = selectedLi.getAttribute("data-id");
+            const title = selectedLi.textContent;
+            hiddenInput.value = id;
+            // submit the form to reload page
+            document.getElementById("surveySelectForm").submit();
+        }
+    });
+});
+
+document.addEventListener("DOMContentLoaded", function () {
+    const liveCharts = window.renderSurveyCharts ? window.renderSurveyCharts("dashboard-charts") : {};
+
+    const live = document.getElementById("dashboard-live");
+    if (live) {
+        const totalEl = document.getElementById("total-responses-count");
+        let surveySubmissions = parseInt(live.dataset.submissions, 10) || 0;
+        let since = live.dataset.since;
+        const applyTally = (delta) => {
+            if (totalEl) {
+                totalEl.textContent = parseInt(totalEl.textContent, 10) + (delta.submissions - surveySubmissions);
+            }
+            surveySubmissions = delta.submissions;
+            document.querySelectorAll('[data-live="survey-submissions"]').forEach((el) => {
+                el.textContent = delta.submissions;
+            });
+            Object.entries(delta.questions).forEach(([questionId, counts]) => {
+                const chart = liveCharts[questionId];
+                if (!chart) return;
+                chart.data.labels = counts.map((pair) => pair[0]);
+                chart.data.datasets[0].data = counts.map((pair) => pair[1]);
+                chart.update();
+            });
+        };
+
+        if (live.dataset.mode === "stream" && window.EventSource) {
+            const stream = new EventSource(`${live.dataset.url}?since=${since}`);
+            stream.addEventListener("tally", (event) => applyTally(JSON.parse(event.data)));
+        } else if (window.fetch) {
+            // No stream under WSGI: it would hold a server worker for as long
+            // as the tab stays open. Ask now and then instead.
+            const seconds = parseInt(live.dataset.fetchSeconds, 10) || 15;
+            setInterval(() => {
+                if (document.hidden) return;
+                fetch(`${live.dataset.url}?format=json&since=${since}`, { credentials: "same-origin" })
+                    .then((response) => (response.ok ? response.json() : null))
+                    .then((data) => {
+                        if (!data) return;
+                        since = data.version;
+                        if (data.questions) applyTally(data);
+                    })
+                    .catch(() => {});
+            }, seconds * 1000);
+        }
+    }
+});
+
+document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll(".toggle-short-btn").forEach(btn => {
+        btn.addEventListener("click", function () {
+            const targetId = this.getAttribute("data-target");
+            const textarea = document.getElementById(targetId);
+
+            if (!textarea) return;
+
+            if (textarea.style.display === "none") {
+                textarea.style.display = "block";
+                this.textContent = "Hide";  // icon changes when open
+            } else {
+                textarea.style.display = "none";
+                this.textContent = "Show";  // icon returns when hidden
+            }
+        });
+    });
+});
@@ -1,3 +1,826 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import io
+import json
+import os
+import pstats
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import caching
+from .accounts import teacher_username
+from .archive import archive_dir, archive_survey, restore_survey
+from .middleware import _capturing, profile_dir
+from .models import (
+    Answer,
+    ArchivedResponse,
+    Choice,
+    ClassSection,
+    Question,
+    SearchToken,
+    StudentProfile,
+    Survey,
+    SurveyArchive,
+    SurveyAssignment,
+    SurveySubmission,
+)
+from .pagination import keyset_paginate
+from .roster import _split_name, import_roster
+from .sections import CHECK_INTERVAL, section_registry
+from .views import _in_analytics_pool, _survey_live_events
+
+ARCHIVE_DIR = tempfile.mkdtemp(prefix="survey-archive-tests-")
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    SURVEY_ARCHIVE_DIR=ARCHIVE_DIR,
+    ALLOWED_HOSTS=["testserver"],
+    REQUEST_TIMING=False,
+    PROFILE_CAPTURE_LIMIT=0,
+)
+class SurveyTestCase(TestCase):
+    """Fixtures shared by the app's tests: the teacher, students and surveys."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(ARCHIVE_DIR, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        section_registry.invalidate()
+        self.teacher = User.objects.get(username=teacher_username())
+
+    def make_student(self, email, first_name="Ana", last_name="Cruz", section_id="1A"):
+        user = User.objects.create_user(username=email, email=email, first_name=first_name, last_name=last_name)
+        return StudentProfile.objects.create(user=user, section_id=section_id)
+
+    def make_survey(self, title="Homework load", status="open", section_id="1A"):
+        survey = Survey.objects.create(teacher=self.teacher, title=title, status=status)
+        mcq = Question.objects.create(
+            survey=survey, text="How often?", question_type="MCQ", order_number=1,
+            config=Question.build_config("MCQ"),
+        )
+        for value, text in enumerate(["Daily", "Weekly"], start=1):
+            Choice.objects.create(question=mcq, text=text, value=value)
+        Question.objects.create(
+            survey=survey, text="Anything else?", question_type="SHORT", order_number=2,
+            config=Question.build_config("SHORT"),
+        )
+        assignment = SurveyAssignment.objects.create(
+            survey=survey, section_id=section_id, status="published", assigned_date=timezone.now(),
+        )
+        return survey, assignment
+
+    def submit(self, survey, student, choice_text="Daily", text="More time please"):
+        submission = SurveySubmission.objects.create(survey=survey, student=student, is_submitted=True)
+        answers = []
+        for question in survey.questions.order_by("order_number"):
+            if question.question_type == "MCQ":
+                choice = question.choices.get(text=choice_text)
+                answers.append(Answer(submission=submission, question=question, selected_choice=choice))
+            else:
+                answers.append(Answer(submission=submission, question=question, text_response=text))
+        Answer.objects.bulk_create(answers)
+        submission.packed_answers = SurveySubmission.pack_answers(answers)
+        submission.save(update_fields=["packed_answers"])
+        return submission
+
+
+class KeysetPaginationTests(SurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        surveys = [self.make_survey(f"Survey {number}")[0] for number in range(3)]
+        students = [self.make_student(f"student{number}@example.com") for number in range(9)]
+        start = timezone.now() - timedelta(days=1)
+        for number, student in enumerate(students):
+            for survey in surveys:
+                submission = SurveySubmission.objects.create(survey=survey, student=student, is_submitted=True)
+                # A student's submissions share a timestamp, so ties are broken by id.
+                SurveySubmission.objects.filter(pk=submission.pk).update(
+                    submitted_at=start + timedelta(minutes=number)
+                )
+        self.queryset = SurveySubmission.objects.filter(is_submitted=True)
+        self.expected = list(self.queryset.order_by("-submitted_at", "-pk").values_list("pk", flat=True))
+
+    def ids(self, page):
+        return [submission.pk for submission in page]
+
+    def test_next_cursors_walk_every_row_once(self):
+        seen, cursor = [], None
+        while True:
+            page = keyset_paginate(self.queryset, cursor, 5)
+            seen.extend(self.ids(page))
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_cursors_walk_back_from_the_last_page(self):
+        page = keyset_paginate(self.queryset, keyset_paginate(self.queryset, None, 5).last_cursor, 5)
+        self.assertFalse(page.has_next)
+        self.assertEqual(self.ids(page), self.expected[-5:])
+        seen = self.ids(page)
+        while page.has_previous:
+            page = keyset_paginate(self.queryset, page.previous_cursor, 5)
+            seen = self.ids(page) + seen
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_page_matches_the_page_before(self):
+        first = keyset_paginate(self.queryset, None, 5)
+        second = keyset_paginate(self.queryset, first.next_cursor, 5)
+        back = keyset_paginate(self.queryset, second.previous_cursor, 5)
+        self.assertEqual(self.ids(back), self.ids(first))
+        self.assertTrue(back.has_next)
+
+    def test_tampered_cursor_falls_back_to_the_first_page(self):
+        cursor = keyset_paginate(self.queryset, None, 5).next_cursor
+        page = keyset_paginate(self.queryset, cursor[:-2] + "xx", 5)
+        self.assertEqual(self.ids(page), self.expected[:5])
+        self.assertFalse(page.has_previous)
+
+    def test_total_counts_the_whole_queryset(self):
+        self.assertEqual(keyset_paginate(self.queryset, None, 5).total, len(self.expected))
+
+
+class SearchTokenTests(SurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jose = self.make_student("jose@example.com", "José María", "Núñez")
+        self.other = self.make_student("ben@example.com", "Ben", "Santos")
+        self.survey, _ = self.make_survey("Café Feedback")
+
+    def matches(self, kind, query):
+        return set(SearchToken.matching_ids(kind, query).values_list("object_id", flat=True))
+
+    def test_prefixes_match_without_accents_or_case(self):
+        self.assertEqual(self.matches(SearchToken.STUDENT, "jose"), {self.jose.pk})
+        self.assertEqual(self.matches(SearchToken.STUDENT, "NUÑ"), {self.jose.pk})
+        self.assertEqual(self.matches(SearchToken.STUDENT, "mar nun"), {self.jose.pk})
+        self.assertEqual(self.matches(SearchToken.SURVEY, "cafe"), {self.survey.pk})
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.matches(SearchToken.STUDENT, "jose santos"), set())
+        self.assertEqual(self.matches(SearchToken.STUDENT, "josex"), set())
+        self.assertEqual(self.matches(SearchToken.STUDENT, "   "), set())
+
+    def test_renames_are_reindexed(self):
+        user = self.other.user
+        user.first_name = "Benedict"
+        user.save(update_fields=["first_name"])
+        self.survey.title = "Library hours"
+        self.survey.save()
+        self.assertEqual(self.matches(SearchToken.STUDENT, "benedict"), {self.other.pk})
+        self.assertEqual(self.matches(SearchToken.SURVEY, "cafe"), set())
+        self.assertEqual(self.matches(SearchToken.SURVEY, "libr"), {self.survey.pk})
+
+    def test_history_page_filters_on_student_and_title(self):
+        mine = self.submit(self.survey, self.jose)
+        self.submit(self.survey, self.other)
+        self.client.force_login(self.teacher)
+        response = self.client.get(
+            reverse("teacher_dashboard_page", args=["history"]),
+            {"search_student": "Jose", "search_survey": "caf"},
+        )
+        self.assertEqual([submission.pk for submission in response.context["responses"]], [mine.pk])
+
+
+class StudentDashboardTests(SurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = self.make_student("ana@example.com")
+        self.survey, self.assignment = self.make_survey()
+        self.client.force_login(self.student.user)
+
+    def dashboard(self):
+        response = self.client.get(reverse("student_dashboard_page", args=["responses"]))
+        assigned = [row["survey_id"] for row in response.context["assigned_surveys"]]
+        completed = {row["survey_id"]: row for row in response.context["completed_surveys"]}
+        return assigned, completed
+
+    def test_cold_stored_surveys_stay_completed(self):
+        submission = self.submit(self.survey, self.student)
+        self.survey.status = "archived"
+        self.survey.save()
+        archive_survey(self.survey)
+
+        assigned, completed = self.dashboard()
+        self.assertNotIn(self.survey.pk, assigned)
+        self.assertIn(self.survey.pk, completed)
+        self.assertIsNone(completed[self.survey.pk]["submission_id"])
+        self.assertEqual(completed[self.survey.pk]["submitted_at"], submission.submitted_at)
+
+        restore_survey(self.survey)
+        assigned, completed = self.dashboard()
+        self.assertEqual(completed[self.survey.pk]["submission_id"], submission.pk)
+
+    def test_archived_surveys_are_not_assigned(self):
+        self.survey.status = "archived"
+        self.survey.save()
+        assigned, completed = self.dashboard()
+        self.assertEqual((assigned, completed), ([], {}))
+
+    def test_section_change_applies_to_signed_in_students(self):
+        url = reverse("student_take_survey", args=[self.assignment.pk])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.student.section_id = "2B"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.save()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.delete()
+        response = self.client.get(reverse("student_dashboard"))
+        self.assertRedirects(response, reverse("student_signin"), fetch_redirect_response=False)
+
+
+class PackedAnswersTests(SurveyTestCase):
+    def test_submitting_stores_the_same_answers_packed(self):
+        survey, assignment = self.make_survey()
+        student = self.make_student("ana@example.com")
+        mcq, short = survey.questions.order_by("order_number")
+        weekly = mcq.choices.get(text="Weekly")
+        self.client.force_login(student.user)
+        response = self.client.post(
+            reverse("student_take_survey", args=[assignment.pk]),
+            {f"q_{mcq.pk}": str(weekly.pk), f"q_{short.pk}": "  Fewer quizzes ", "action": "submit"},
+        )
+        self.assertRedirects(response, reverse("student_dashboard_page", args=["responses"]))
+
+        submission = SurveySubmission.objects.get(survey=survey, student=student)
+        expected = {mcq.pk: weekly.pk, short.pk: "Fewer quizzes"}
+        self.assertEqual(submission.answer_values(), expected)
+        submission.packed_answers = None
+        self.assertEqual(submission.answer_values(), expected)
+
+
+class QuestionConfigTests(TestCase):
+    def test_defaults_are_filled_and_values_coerced(self):
+        self.assertEqual(
+            Question.build_config("LIKERT", scale_min="2", scale_max=4),
+            {"scale_min": 2, "scale_max": 4, "scale_labels": []},
+        )
+        self.assertEqual(Question.build_config("MCQ", randomize_choices=1), {"randomize_choices": True})
+        self.assertEqual(Question.build_config("SHORT"), {"max_length": 500})
+
+    def test_defaults_are_not_shared(self):
+        config = Question.build_config("LIKERT")
+        config["scale_labels"].append("Agree")
+        self.assertEqual(Question.build_config("LIKERT")["scale_labels"], [])
+
+    def test_invalid_settings_are_rejected(self):
+        invalid = [
+            ("ESSAY", {}),
+            ("MCQ", {"max_length": 10}),
+            ("LIKERT", {"scale_min": 5, "scale_max": 1}),
+            ("LIKERT", {"scale_min": "low"}),
+            ("LIKERT", {"scale_labels": "Agree"}),
+            ("SHORT", {"max_length": 0}),
+            ("SHORT", {"max_length": None}),
+        ]
+        for question_type, settings in invalid:
+            with self.subTest(question_type=question_type, settings=settings):
+                with self.assertRaises(ValidationError):
+                    Question.build_config(question_type, **settings)
+
+    def test_clean_reports_errors_on_the_config_field(self):
+        question = Question(question_type="SHORT", config={"max_length": -1})
+        with self.assertRaises(ValidationError) as raised:
+            question.clean()
+        self.assertIn("config", raised.exception.message_dict)
+
+    def test_accessors_read_the_config(self):
+        question = Question(question_type="LIKERT", config={"scale_max": 7})
+        self.assertEqual((question.scale_min, question.scale_max), (1, 7))
+        self.assertEqual(question.likertquestion.scale_max, 7)
+        self.assertIsNone(question.mcqquestion)
+
+
+class ArchiveTests(SurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.survey, _ = self.make_survey()
+        self.students = [self.make_student(f"student{number}@example.com") for number in range(3)]
+        for number, student in enumerate(self.students):
+            self.submit(self.survey, student, choice_text="Daily" if number else "Weekly", text=f"Answer {number}")
+        self.survey.status = "archived"
+        self.survey.save()
+
+    def rows(self):
+        submissions = SurveySubmission.objects.filter(survey=self.survey).order_by("pk").values_list(
+            "pk", "student_id", "is_submitted", "submitted_at", "updated_at", "packed_answers"
+        )
+        answers = Answer.objects.filter(submission__survey=self.survey).order_by("pk").values_list(
+            "pk", "submission_id", "question_id", "selected_choice_id", "text_response", "numeric_value"
+        )
+        return list(submissions), list(answers)
+
+    def test_archive_and_restore_round_trip(self):
+        before = self.rows()
+        record = archive_survey(self.survey, chunk_size=2)
+
+        self.assertTrue(record.is_complete)
+        self.assertEqual((record.submissions, record.answers), (3, 6))
+        self.assertEqual(self.rows(), ([], []))
+        self.assertTrue((archive_dir() / record.file_name).exists())
+        mcq = self.survey.questions.get(question_type="MCQ")
+        record.refresh_from_db()
+        self.assertEqual(record.snapshot["questions"][str(mcq.pk)]["choices"], [["Daily", 2], ["Weekly", 1]])
+        self.assertEqual(
+            sorted(record.responses.values_list("student_id", flat=True)),
+            [student.pk for student in self.students],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restored = restore_survey(self.survey, chunk_size=2)
+        self.assertEqual(restored, 3)
+        self.assertEqual(self.rows(), before)
+        self.assertFalse(SurveyArchive.objects.filter(survey=self.survey).exists())
+        self.assertFalse(ArchivedResponse.objects.exists())
+        self.assertFalse((archive_dir() / record.file_name).exists())
+        self.survey.refresh_from_db()
+        self.assertEqual(self.survey.status, "closed")
+
+    def test_archive_is_resumable(self):
+        first = archive_survey(self.survey)
+        self.assertEqual(archive_survey(self.survey).pk, first.pk)
+
+    def test_only_archived_surveys_go_to_cold_storage(self):
+        survey, _ = self.make_survey("Still open")
+        with self.assertRaises(ValueError):
+            archive_survey(survey)
+
+    def test_restore_refuses_a_modified_file(self):
+        record = archive_survey(self.survey)
+        with gzip.open(archive_dir() / record.file_name, "at", encoding="utf-8") as handle:
+            handle.write("\n")
+        with self.assertRaises(ValueError):
+            restore_survey(self.survey)
+        self.assertEqual(self.rows(), ([], []))
+
+
+class TeacherCounterTests(SurveyTestCase):
+    def test_counters_are_dropped_after_commit(self):
+        survey, _ = self.make_survey()
+        student = self.make_student("ana@example.com")
+        self.assertEqual(Survey.teacher_counters(self.teacher)["total_responses"], 0)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.submit(survey, student)
+        # Until the writer commits, readers keep getting the cached counts.
+        self.assertEqual(Survey.teacher_counters(self.teacher)["total_responses"], 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(Survey.teacher_counters(self.teacher)["total_responses"], 1)
+
+
+PROFILE_DIR = tempfile.mkdtemp(prefix="profile-capture-tests-")
+
+
+@override_settings(PROFILE_CAPTURE_DIR=PROFILE_DIR, PROFILE_CAPTURE_LIMIT=50)
+class ProfileCaptureTests(SurveyTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(PROFILE_DIR, ignore_errors=True)
+
+    def capture(self, user, value, header=False):
+        self.client.force_login(user)
+        if header:
+            response = self.client.get(reverse("teacher_dashboard"), headers={"X-Profile": value})
+        else:
+            response = self.client.get(reverse("teacher_dashboard"), {"_profile": value})
+        return response.get("X-Profile-Capture")
+
+    def test_staff_requests_with_a_truthy_value_are_captured(self):
+        for value in ["1", "true", "YES", " on "]:
+            for header in [False, True]:
+                with self.subTest(value=value, header=header):
+                    name = self.capture(self.teacher, value, header)
+                    self.assertIsNotNone(name)
+                    self.assertTrue((profile_dir() / f"{name}.pstats").exists())
+
+    def test_falsy_values_are_ignored(self):
+        for value in ["0", "false", "no", "off", ""]:
+            for header in [False, True]:
+                with self.subTest(value=value, header=header):
+                    self.assertIsNone(self.capture(self.teacher, value, header))
+
+    def test_non_staff_requests_are_never_captured(self):
+        student = self.make_student("ana@example.com")
+        self.assertIsNone(self.capture(student.user, "1"))
+        self.assertIsNone(self.capture(student.user, "1", header=True))
+
+    def test_overlapping_requests_are_served_unprofiled(self):
+        with _capturing() as profilers:
+            self.assertIsNotNone(profilers)
+            self.assertIsNone(self.capture(self.teacher, "1"))
+        self.assertIsNotNone(self.capture(self.teacher, "1"))
+
+    async def test_overlapping_async_requests_are_served_unprofiled(self):
+        await self.async_client.aforce_login(self.teacher)
+        url = reverse("teacher_dashboard") + "?_profile=1"
+        with _capturing():
+            response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("X-Profile-Capture"))
+        response = await self.async_client.get(url)
+        self.assertTrue(response.has_header("X-Profile-Capture"))
+
+    def test_work_on_the_analytics_pool_joins_the_capture(self):
+        def pool_work():
+            return sum(range(100))
+
+        with _capturing() as profilers:
+            async_to_sync(_in_analytics_pool(pool_work))()
+        functions = {function for _, _, function in pstats.Stats(*profilers).stats}
+        self.assertIn("pool_work", functions)
+
+
+@override_settings(REQUEST_TIMING=True)
+class RequestTimingTests(SurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.survey, _ = self.make_survey()
+        self.submit(self.survey, self.make_student("ana@example.com"))
+        self.url = reverse("teacher_survey_live", args=[self.survey.pk]) + "?format=json"
+
+    def db_queries(self, response):
+        metrics = dict(metric.split(";", 1) for metric in response["Server-Timing"].split(", "))
+        return int(metrics["db"].split('desc="', 1)[1].split()[0])
+
+    def test_sync_requests_report_their_queries(self):
+        self.client.force_login(self.teacher)
+        self.assertGreater(self.db_queries(self.client.get(self.url)), 0)
+
+    def test_asgi_middleware_chain_is_not_adapted(self):
+        # With DEBUG on, Django logs every sync/async adapter it puts between
+        # middleware (and that the disabled ProfileCaptureMiddleware is unused).
+        with override_settings(DEBUG=True), self.assertLogs("django.request", "DEBUG") as logs:
+            ASGIHandler()
+        self.assertEqual([line for line in logs.output if "adapted" in line], [])
+
+    async def test_async_requests_report_their_queries(self):
+        await self.async_client.aforce_login(self.teacher)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self.db_queries(response), 0)
+
+
+class SectionRegistryTests(SurveyTestCase):
+    def test_saved_sections_show_up_at_once(self):
+        self.assertIsNone(section_registry.get("5A"))
+        ClassSection.objects.create(section_id="5A", year=5)
+        self.assertEqual(section_registry.get("5A").year, 5)
+        self.assertEqual(section_registry.years(), [1, 2, 3, 4, 5])
+
+    def test_other_processes_changes_show_up_after_the_interval(self):
+        with mock.patch("main.sections.time.monotonic", return_value=1000.0) as clock:
+            self.assertIsNone(section_registry.get("5A"))
+            # Another process adds a section: no signal here, only the shared version moves.
+            ClassSection.objects.bulk_create([ClassSection(section_id="5A", year=5)])
+            ClassSection.bump_cache_version()
+            with mock.patch.object(ClassSection, "cache_version", wraps=ClassSection.cache_version) as version:
+                clock.return_value += CHECK_INTERVAL / 2
+                self.assertIsNone(section_registry.get("5A"))
+                self.assertFalse(version.called)
+                clock.return_value += CHECK_INTERVAL
+                self.assertEqual(section_registry.get("5A").year, 5)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"], ROSTER_UPLOAD_MAX_ROWS=2)
+class RosterImportTests(SurveyTestCase):
+    def upload(self, rows):
+        lines = ["name,email,section,password"] + rows
+        roster = SimpleUploadedFile("roster.csv", "\n".join(lines).encode(), content_type="text/csv")
+        self.client.force_login(self.teacher)
+        return self.client.post(reverse("teacher_import_roster"), {"roster": roster})
+
+    def test_uploads_within_the_limit_are_imported(self):
+        response = self.upload([
+            '"Cruz, Ana",ana@example.com,1a,Roster-pass-1',
+            '"Santos, Ben",ben@example.com,2B,Roster-pass-2',
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 2)
+        student = StudentProfile.objects.get(user__email="ana@example.com")
+        self.assertEqual(student.section_id, "1A")
+        self.assertTrue(student.user.check_password("Roster-pass-1"))
+
+    def test_names_split_only_at_a_comma(self):
+        self.assertEqual(_split_name("Dela Cruz, Juan Miguel"), ("Juan Miguel", "Dela Cruz"))
+        self.assertEqual(_split_name(" Cruz ,Ana "), ("Ana", "Cruz"))
+        self.assertIsNone(_split_name("Juan Dela Cruz"))
+
+    def test_separate_name_columns_are_taken_as_written(self):
+        roster = io.StringIO(
+            "email,first_name,last_name,section,password\n"
+            "juan@example.com,Juan,Dela Cruz,1A,Roster-pass-1\n"
+            "ana@example.com,Ana,,1A,Roster-pass-2\n"
+        )
+        result = import_roster(roster, workers=1)
+        self.assertEqual(result["created"], 1)
+        self.assertEqual([error["email"] for error in result["errors"]], ["ana@example.com"])
+        user = User.objects.get(email="juan@example.com")
+        self.assertEqual((user.first_name, user.last_name), ("Juan", "Dela Cruz"))
+
+    def test_name_column_without_a_comma_is_rejected(self):
+        response = self.upload(['Juan Dela Cruz,juan@example.com,1A,Roster-pass-1'])
+        self.assertEqual(response.json()["created"], 0)
+        self.assertEqual(response.json()["errors"][0]["error"], 'Write the name as "Last, First".')
+
+    def test_roster_without_name_columns_is_refused(self):
+        with self.assertRaises(ValueError):
+            import_roster(io.StringIO("email,first_name,section,password\n"), workers=1)
+
+    def test_larger_uploads_are_refused_before_hashing(self):
+        rows = [f'"Cruz, Ana",ana{number}@example.com,1A,Roster-pass-{number}' for number in range(3)]
+        with mock.patch("main.roster.make_password") as make_password:
+            response = self.upload(rows)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("import_roster", response.json()["error"])
+        self.assertFalse(make_password.called)
+        self.assertFalse(StudentProfile.objects.exists())
+
+
+class StartupImportTests(SimpleTestCase):
+    def test_url_conf_does_not_import_the_word_cloud_stack(self):
+        # A fresh interpreter: this test process may have imported them already.
+        code = (
+            "import sys, django; django.setup(); import main.views, config.urls; "
+            "print(' '.join(name for name in ('wordcloud', 'matplotlib', 'numpy') if name in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "config.settings"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.split(), [])
+
+
+class LiveTallyTests(SurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.survey, _ = self.make_survey()
+        self.mcq = self.survey.questions.get(question_type="MCQ")
+        self.other = Question.objects.create(
+            survey=self.survey, text="Which subject?", question_type="MCQ", order_number=3,
+            config=Question.build_config("MCQ"),
+        )
+        Choice.objects.create(question=self.other, text="Math", value=1)
+        self.url = reverse("teacher_survey_live", args=[self.survey.pk])
+
+    def answer(self, email, choice_text):
+        """Submit an answer to the first question only, as the take-survey view would."""
+        submission = SurveySubmission.objects.create(
+            survey=self.survey, student=self.make_student(email), is_submitted=True
+        )
+        Answer.objects.create(
+            submission=submission, question=self.mcq, selected_choice=self.mcq.choices.get(text=choice_text)
+        )
+        Survey.objects.filter(pk=self.survey.pk).update(response_version=F("response_version") + 1)
+        return Survey.objects.get(pk=self.survey.pk).response_version
+
+    def test_json_replies_send_tallies_only_when_the_version_moved(self):
+        version = self.answer("ana@example.com", "Daily")
+        self.client.force_login(self.teacher)
+
+        payload = self.client.get(self.url).json()
+        self.assertEqual(payload["version"], version)
+        self.assertEqual(payload["submissions"], 1)
+        self.assertEqual(payload["questions"][str(self.mcq.pk)], [["Daily", 1], ["Weekly", 0]])
+        self.assertEqual(payload["questions"][str(self.other.pk)], [["Math", 0]])
+
+        self.assertEqual(self.client.get(self.url, {"since": version}).json(), {"version": version})
+        version = self.answer("ben@example.com", "Weekly")
+        payload = self.client.get(self.url, {"since": version - 1}).json()
+        self.assertEqual((payload["version"], payload["submissions"]), (version, 2))
+
+    def test_stream_is_only_served_under_asgi(self):
+        self.client.force_login(self.teacher)
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    async def test_stream_sends_full_tallies_then_deltas(self):
+        version = await sync_to_async(self.answer)("ana@example.com", "Daily")
+
+        def parse(event):
+            fields = dict(line.split(": ", 1) for line in event.strip().splitlines())
+            return int(fields["id"]), json.loads(fields["data"])
+
+        with mock.patch("main.views.LIVE_POLL_SECONDS", 0.01), mock.patch("main.views.LIVE_HEARTBEAT_SECONDS", 60):
+            # A page rendered before the latest answers gets everything first.
+            events = _survey_live_events(self.survey.pk, version - 1)
+            self.assertEqual(await anext(events), "retry: 5000\n\n")
+            event_id, payload = parse(await anext(events))
+            self.assertEqual(event_id, version)
+            self.assertEqual(set(payload["questions"]), {str(self.mcq.pk), str(self.other.pk)})
+            await events.aclose()
+
+            events = _survey_live_events(self.survey.pk, version)
+            await anext(events)
+            pending = asyncio.ensure_future(anext(events))
+            await asyncio.sleep(0.05)
+            self.assertFalse(pending.done())
+
+            version = await sync_to_async(self.answer)("ben@example.com", "Weekly")
+            event_id, payload = parse(await asyncio.wait_for(pending, 5))
+            await events.aclose()
+        self.assertEqual(event_id, version)
+        self.assertEqual(payload, {"submissions": 2, "questions": {str(self.mcq.pk): [["Daily", 1], ["Weekly", 1]]}})
+
+
+class SurveyCollectionTests(SurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.teacher)
+
+    def collection(self):
+        response = self.client.get(reverse("teacher_dashboard_page", args=["collection"]))
+        return {survey.pk: survey for survey in response.context["collection_surveys"]}
+
+    def test_rows_carry_counts_sections_and_status(self):
+        survey, _ = self.make_survey("Past due")
+        survey.due_date = timezone.now() - timedelta(days=1)
+        survey.save()
+        SurveyAssignment.objects.create(survey=survey, section_id="2B", status="published")
+        first = self.submit(survey, self.make_student("ana@example.com"))
+        last = self.submit(survey, self.make_student("ben@example.com"))
+        SurveySubmission.objects.filter(pk=first.pk).update(submitted_at=last.submitted_at - timedelta(hours=1))
+        SurveySubmission.objects.create(survey=survey, student=self.make_student("cy@example.com"))
+        draft = Survey.objects.create(teacher=self.teacher, title="Not yet assigned", status="draft")
+
+        rows = self.collection()
+        row = rows[survey.pk]
+        self.assertEqual((row.submitted_count, row.draft_count), (2, 1))
+        self.assertEqual(row.last_response_at, last.submitted_at)
+        self.assertEqual(row.section_ids, ["1A", "2B"])
+        self.assertEqual(row.effective_status, "closed")
+        row = rows[draft.pk]
+        self.assertEqual((row.submitted_count, row.draft_count, row.last_response_at), (0, 0, None))
+        self.assertEqual((row.section_ids, row.effective_status), ([], "draft"))
+
+    def test_query_count_does_not_grow_with_the_page(self):
+        self.make_survey("First")
+        self.collection()
+        with CaptureQueriesContext(connection) as few:
+            self.collection()
+        for number in range(5):
+            survey, _ = self.make_survey(f"Survey {number}")
+            self.submit(survey, self.make_student(f"student{number}@example.com"))
+        with CaptureQueriesContext(connection) as many:
+            rows = self.collection()
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(len(many), len(few))
+
+
+class VersionedCacheTests(SurveyTestCase):
+    def test_entries_are_recomputed_after_a_committed_bump(self):
+        calls = []
+
+        def compute():
+            calls.append(None)
+            return len(calls)
+
+        scopes = [(caching.SURVEY, 1), (caching.SECTION, "1A")]
+        self.assertEqual(caching.cached("demo", scopes, compute), 1)
+        self.assertEqual(caching.cached("demo", scopes, compute), 1)
+        self.assertEqual(caching.cached("demo", scopes, compute, "other"), 2)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            caching.bump((caching.SECTION, "1A"), (caching.STUDENT, None))
+            caching.bump((caching.SECTION, "1A"))
+        # Readers keep the old entry until the writer commits.
+        self.assertEqual(caching.cached("demo", scopes, compute), 1)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(caching.cached("demo", scopes, compute), 3)
+        self.assertEqual(caching.cached("demo", [(caching.SURVEY, 1)], compute), 4)
+
+    def changed_scopes(self, scopes, change):
+        before = caching.versions(scopes)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        after = caching.versions(scopes)
+        return {scope for scope in scopes if before[scope] != after[scope]}
+
+    def test_saves_bump_the_scopes_they_touch(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            survey, _ = self.make_survey()
+            student = self.make_student("ana@example.com")
+        scopes = [
+            (caching.SURVEY, survey.pk),
+            (caching.STUDENT, student.pk),
+            (caching.SECTION, "1A"),
+            (caching.SECTION, "2B"),
+        ]
+        self.assertEqual(
+            self.changed_scopes(scopes, lambda: self.submit(survey, student)),
+            {(caching.SURVEY, survey.pk), (caching.STUDENT, student.pk)},
+        )
+        self.assertEqual(
+            self.changed_scopes(scopes, survey.save),
+            {(caching.SURVEY, survey.pk), (caching.SECTION, "1A")},
+        )
+
+
+class LikertValueTests(SurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.survey, self.assignment = self.make_survey()
+        self.likert = Question.objects.create(
+            survey=self.survey, text="How stressed?", question_type="LIKERT", order_number=3,
+            config=Question.build_config("LIKERT"),
+        )
+        for value in range(1, 6):
+            Choice.objects.create(question=self.likert, text=str(value), value=value)
+
+    def take(self, email, value):
+        student = self.make_student(email)
+        mcq, short = self.survey.questions.filter(question_type__in=["MCQ", "SHORT"]).order_by("order_number")
+        self.client.force_login(student.user)
+        self.client.post(reverse("student_take_survey", args=[self.assignment.pk]), {
+            f"q_{mcq.pk}": str(mcq.choices.get(text="Daily").pk),
+            f"q_{short.pk}": "Fine",
+            f"q_{self.likert.pk}": str(self.likert.choices.get(value=value).pk),
+            "action": "submit",
+        })
+        return SurveySubmission.objects.get(survey=self.survey, student=student)
+
+    def test_submitting_copies_the_likert_value(self):
+        submission = self.take("ana@example.com", 4)
+        values = dict(submission.answers.values_list("question__question_type", "numeric_value"))
+        self.assertEqual(values, {"MCQ": None, "SHORT": None, "LIKERT": 4})
+
+    def test_averages_survive_rebuilt_choices(self):
+        self.take("ana@example.com", 2)
+        self.take("ben@example.com", 5)
+        self.assertEqual(Answer.likert_averages([self.likert.pk]), {self.likert.pk: 3.5})
+        # Saving a survey from the builder replaces its choices.
+        self.likert.choices.all().delete()
+        mcq = self.survey.questions.get(question_type="MCQ")
+        self.assertEqual(Answer.likert_averages([self.likert.pk, mcq.pk]), {self.likert.pk: 3.5})
+
+
+class NumericValueMigrationTests(TransactionTestCase):
+    before = [("main", "0013_question_config")]
+    after = [("main", "0014_answer_numeric_value")]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        super().tearDown()
+
+    def test_existing_likert_answers_are_backfilled(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        User = apps.get_model("auth", "User")
+        models = {name: apps.get_model("main", name) for name in [
+            "ClassSection", "StudentProfile", "Survey", "Question", "Choice", "SurveySubmission", "Answer",
+        ]}
+        section, _ = models["ClassSection"].objects.get_or_create(section_id="1A", defaults={"year": 1})
+        student = models["StudentProfile"].objects.create(
+            user=User.objects.create(username="ana@example.com"), section=section
+        )
+        survey = models["Survey"].objects.create(teacher=User.objects.create(username="teacher"), title="Stress")
+        submission = models["SurveySubmission"].objects.create(survey=survey, student=student, is_submitted=True)
+        answers = {}
+        for question_type in ["LIKERT", "MCQ"]:
+            question = models["Question"].objects.create(
+                survey=survey, text=question_type, question_type=question_type, order_number=1, config={}
+            )
+            choice = models["Choice"].objects.create(question=question, text="Four", value=4)
+            answers[question_type] = models["Answer"].objects.create(
+                submission=submission, question=question, selected_choice=choice
+            ).pk
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        Answer = executor.loader.project_state(self.after).apps.get_model("main", "Answer")
+        self.assertEqual(Answer.objects.get(pk=answers["LIKERT"]).numeric_value, 4)
+        self.assertIsNone(Answer.objects.get(pk=answers["MCQ"]).numeric_value)
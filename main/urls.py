@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 
 from . import views
@@ -16,11 +17,15 @@ urlpatterns = [
     path("teacher/builder/", views.teacher_dashboard, name="teacher_dashboard"),
     path("teacher/<str:page>/", views.teacher_dashboard, name="teacher_dashboard_page"),
     path("teacher/surveys/save/", views.teacher_save_survey, name="teacher_save_survey"),
+    path("teacher/roster/import/", views.teacher_import_roster, name="teacher_import_roster"),
     path("teacher/surveys/<int:survey_id>/archive/", views.teacher_archive_survey, name="teacher_archive_survey"),
     path("teacher/surveys/<int:survey_id>/preview/", views.teacher_preview_survey, name="teacher_preview_survey"),
     path("teacher/responses-history/", views.teacher_responses_history, name="teacher_responses_history"),
     path("teacher/surveys/<int:survey_id>/responses/", views.teacher_analytics, name="teacher_analytics"),
+    path("teacher/surveys/<int:survey_id>/live/", views.teacher_survey_live, name="teacher_survey_live"),
     path("teacher/response/<int:submission_id>/", views.teacher_view_student_response, name="teacher_view_student_response"),
     path("logout/", views.logout_view, name="logout"),
-    path("__reload/", include("django_browser_reload.urls"))
 ]
+
+if "django_browser_reload" in settings.INSTALLED_APPS:
+    urlpatterns.append(path("__reload/", include("django_browser_reload.urls")))
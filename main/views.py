@@ -1,92 +1,58 @@
+import asyncio
+import io
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime
 
+from asgiref.sync import sync_to_async
+
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import logout as auth_logout
+from django.contrib.admin import site as admin_site
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
 from django.core.paginator import Paginator
-from django.db import transaction
-from django.db.models import Q
-from django.http import Http404, HttpResponseForbidden, JsonResponse
+from django.db import connections, transaction
+from django.db.models import Aggregate, Case, CharField, Count, F, Max, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, Http404, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from django.views.decorators.http import require_POST
-from collections import Counter
-
-import re
-from collections import Counter
-from io import BytesIO
-from wordcloud import WordCloud, STOPWORDS
-import base64
 
+from . import caching
+from .archive import archived_submissions
+from .accounts import ensure_teacher_account, teacher_username as _teacher_username
 from .forms import StudentSigninForm, StudentSignupForm
+from .middleware import Role, list_profile_captures, profile_dir, profiled, role_snapshot
+from .pagination import keyset_paginate
+from .roster import import_roster
+from .sections import section_registry
+from .wordclouds import wordcloud_png_b64
 from .models import (
     Answer,
     Choice,
     ClassSection,
-    LikertQuestion,
-    MCQQuestion,
     Question,
-    ShortAnswerQuestion,
+    SearchToken,
     StudentProfile,
     Survey,
+    SurveyArchive,
     SurveyAssignment,
     SurveySubmission,
 )
 
 
-def _teacher_username() -> str:
-    return settings.DEFAULT_TEACHER_EMAIL.lower()
-
-
 def _is_open_status(value: str) -> bool:
     return (value or "").lower() in {"open", "published"}
 
 
-def _ensure_teacher_account() -> User:
-    username = _teacher_username()
-    user, created = User.objects.get_or_create(
-        username=username,
-        defaults={
-            "email": settings.DEFAULT_TEACHER_EMAIL,
-            "first_name": settings.DEFAULT_TEACHER_FIRST_NAME,
-            "last_name": settings.DEFAULT_TEACHER_LAST_NAME,
-            "is_staff": True,
-        },
-    )
-
-    updated_fields = []
-
-    if user.email != settings.DEFAULT_TEACHER_EMAIL:
-        user.email = settings.DEFAULT_TEACHER_EMAIL
-        updated_fields.append("email")
-
-    if user.first_name != settings.DEFAULT_TEACHER_FIRST_NAME:
-        user.first_name = settings.DEFAULT_TEACHER_FIRST_NAME
-        updated_fields.append("first_name")
-
-    if user.last_name != settings.DEFAULT_TEACHER_LAST_NAME:
-        user.last_name = settings.DEFAULT_TEACHER_LAST_NAME
-        updated_fields.append("last_name")
-
-    if not user.is_staff:
-        user.is_staff = True
-        updated_fields.append("is_staff")
-
-    if created or not user.check_password(settings.DEFAULT_TEACHER_PASSWORD):
-        user.set_password(settings.DEFAULT_TEACHER_PASSWORD)
-        updated_fields.append("password")
-
-    if updated_fields:
-        user.save(update_fields=updated_fields)
-
-    return user
-
-
 def _serialize_questions(question_qs):
     """Normalize question data for previews and student forms."""
     items = []
@@ -116,9 +82,8 @@ def _serialize_questions(question_qs):
                 question.choices.order_by("value", "id").values("id", "text")
             )
             entry["choices"] = choices
-            likert = getattr(question, "likertquestion", None)
-            if likert and likert.scale_labels:
-                entry["scale_labels"] = list(likert.scale_labels)
+            if question.scale_labels:
+                entry["scale_labels"] = question.scale_labels
             else:
                 entry["scale_labels"] = [choice["text"] for choice in choices]
             if not entry["scale_labels"]:
@@ -129,41 +94,72 @@ def _serialize_questions(question_qs):
                     choice_id = str(choices[index]["id"])
                 entry["likert_pairs"].append({"label": label, "choice_id": choice_id})
         else:  # SHORT
-            short = getattr(question, "shortanswerquestion", None)
-            entry["max_length"] = short.max_length if short else 500
+            entry["max_length"] = question.max_length
 
         items.append(entry)
     return items
 
 
+def _fill_answers(questions_payload, submission):
+    """Add a submission's selected choice or text to each serialized question."""
+    values = submission.answer_values()
+    for item in questions_payload:
+        value = values.get(item["id"])
+        if item["type"] in {"MCQ", "LIKERT"}:
+            texts = {choice["id"]: choice["text"] for choice in item["choices"]}
+            # A choice removed since the answer was given shows as unanswered.
+            selected = value if value in texts else None
+            item["selected_choice"] = str(selected) if selected else ""
+            item["selected_text"] = texts.get(selected, "")
+        else:
+            item["answer_text"] = value if isinstance(value, str) else ""
+
+
+def _chart_data(summary_list):
+    """Chart inputs for the MCQ/LIKERT summaries, for json_script."""
+    return [
+        {
+            "question_id": summary["question"].id,
+            "type": summary["type"],
+            "labels": summary["choice_labels"],
+            "values": summary["choice_values"],
+        }
+        for summary in summary_list
+        if summary["type"] in {"MCQ", "LIKERT"}
+    ]
+
+
 def _is_ajax(request):
     return request.headers.get("x-requested-with") == "XMLHttpRequest"
 
 
 def student_signin(request):
     """Display and process the student sign-in form."""
-    teacher_user = _ensure_teacher_account()
+    teacher_username = _teacher_username()
 
-    if request.user.is_authenticated:
-        if request.user.username == teacher_user.username:
-            return redirect("teacher_dashboard_page", page="dashboard")
-        if hasattr(request.user, "student_profile"):
-            return redirect("student_dashboard")
+    if request.role is Role.TEACHER:
+        return redirect("teacher_dashboard_page", page="dashboard")
+    if request.role is Role.STUDENT:
+        return redirect("student_dashboard")
 
     form = StudentSigninForm(request.POST or None)
     if request.method == "POST" and form.is_valid():
+        if form.cleaned_data["email"] == teacher_username:
+            # Normally a no-op: provisioning runs after migrate and is cached.
+            ensure_teacher_account()
         user = authenticate(
             request,
             username=form.cleaned_data["email"],
             password=form.cleaned_data["password"],
         )
 
+        role = Role(role_snapshot(user)["role"]) if user is not None else None
         if user is None:
             form.add_error(None, "Invalid email or password.")
-        elif user.username == teacher_user.username:
+        elif role is Role.TEACHER:
             login(request, user)
             return redirect("teacher_dashboard_page", page="dashboard")
-        elif hasattr(user, "student_profile"):
+        elif role is Role.STUDENT:
             login(request, user)
             return redirect("student_dashboard")
         else:
@@ -182,7 +178,7 @@ def student_signin(request):
 
 def student_signup(request):
     """Display and process the student sign-up form."""
-    if request.user.is_authenticated and hasattr(request.user, "student_profile"):
+    if request.role is Role.STUDENT:
         return redirect("student_dashboard")
 
     form = StudentSignupForm(request.POST or None)
@@ -211,13 +207,13 @@ def student_signup(request):
 @login_required(login_url="student_signin")
 def student_dashboard(request, page="assigned"):
     """Landing page for authenticated students."""
-    if not hasattr(request.user, "student_profile"):
-        if request.user.username == _teacher_username():
+    if request.role is not Role.STUDENT:
+        if request.role is Role.TEACHER:
             return redirect("teacher_dashboard_page", page="dashboard")
         return redirect("student_signin")
 
     page = page.lower()
-    profile = request.user.student_profile
+    profile = request.profile
 
     assigned_surveys = []
     completed_surveys = []
@@ -225,7 +221,11 @@ def student_dashboard(request, page="assigned"):
     due_filter = request.GET.get("due", "all").lower()
 
     if profile.section:
-        assignments_qs = SurveyAssignment.objects.filter(status="published", section=profile.section).select_related("survey", "survey__teacher")
+        assignments_qs = (
+            SurveyAssignment.objects.filter(status="published", section=profile.section)
+            .exclude(survey__status="archived")
+            .select_related("survey", "survey__teacher")
+        )
 
         now = timezone.now()
         today = now.date()
@@ -290,16 +290,28 @@ def student_dashboard(request, page="assigned"):
             .select_related("survey", "survey__teacher")
             .order_by("-submitted_at")
         )
-        completed_ids = [submission.survey_id for submission in completed_submissions]
+        completed = [(submission.survey, submission.id, submission.submitted_at) for submission in completed_submissions]
+        # Responses of surveys in cold storage are only listed in ArchivedResponse.
+        live_ids = {survey.id for survey, _, _ in completed}
+        archived = {
+            survey_id: submitted_at
+            for survey_id, submitted_at in archived_submissions(profile).items()
+            if survey_id not in live_ids
+        }
+        if archived:
+            for survey in Survey.objects.filter(id__in=archived).select_related("teacher"):
+                completed.append((survey, None, archived[survey.id]))
+            completed.sort(key=lambda row: row[2], reverse=True)
+
+        completed_ids = [survey.id for survey, _, _ in completed]
         assignment_map = {
             assignment.survey_id: assignment
             for assignment in SurveyAssignment.objects.filter(
                 section=profile.section, survey_id__in=completed_ids
             ).select_related("section")
         }
-        for submission in completed_submissions:
-            survey = submission.survey
-            assignment = assignment_map.get(submission.survey_id)
+        for survey, submission_id, submitted_at in completed:
+            assignment = assignment_map.get(survey.id)
             teacher = survey.teacher
             teacher_name = "Administrator"
             if teacher:
@@ -308,12 +320,12 @@ def student_dashboard(request, page="assigned"):
                 {
                     "assignment_id": assignment.id if assignment else None,
                     "survey_id": survey.id,
-                    "submission_id": submission.id,
+                    "submission_id": submission_id,
                     "title": survey.title,
                     "assigned_by": teacher_name,
                     "assigned_date": (assignment.assigned_date if assignment else survey.created_at),
                     "due_date": (assignment.due_date if assignment else survey.due_date),
-                    "submitted_at": submission.submitted_at,
+                    "submitted_at": submitted_at,
                     "status": "Done",
                 }
             )
@@ -346,12 +358,12 @@ def student_dashboard(request, page="assigned"):
 @login_required(login_url="student_signin")
 def student_take_survey(request, assignment_id):
     """Allow a student to respond to a published survey assigned to their section."""
-    if not hasattr(request.user, "student_profile"):
-        if request.user.username == _teacher_username():
+    if request.role is not Role.STUDENT:
+        if request.role is Role.TEACHER:
             return redirect("teacher_dashboard_page", page="dashboard")
         return redirect("student_signin")
 
-    profile = request.user.student_profile
+    profile = request.profile
     assignment = get_object_or_404(
         SurveyAssignment.objects.select_related("survey", "section", "survey__teacher"),
         id=assignment_id,
@@ -366,17 +378,12 @@ def student_take_survey(request, assignment_id):
     survey = assignment.survey
     question_qs = (
         survey.questions.order_by("order_number")
-        .select_related("likertquestion", "shortanswerquestion")
         .prefetch_related("choices")
     )
     questions_payload = _serialize_questions(question_qs)
     payload_by_id = {item["id"]: item for item in questions_payload}
 
-    existing_submission = (
-        SurveySubmission.objects.filter(survey=survey, student=profile)
-        .prefetch_related("answers__selected_choice")
-        .first()
-    )
+    existing_submission = SurveySubmission.objects.filter(survey=survey, student=profile).first()
 
     if existing_submission and existing_submission.is_submitted:
         messages.info(request, "You already submitted this survey. Viewing your responses instead.")
@@ -385,12 +392,8 @@ def student_take_survey(request, assignment_id):
     form_values = {}
     has_saved_progress = bool(existing_submission)
     if existing_submission:
-        for answer in existing_submission.answers.all():
-            key = str(answer.question_id)
-            if answer.selected_choice_id:
-                form_values[key] = str(answer.selected_choice_id)
-            else:
-                form_values[key] = answer.text_response or ""
+        for question_id, value in existing_submission.answer_values().items():
+            form_values[str(question_id)] = str(value)
 
     errors = {}
 
@@ -443,15 +446,6 @@ def student_take_survey(request, assignment_id):
                     survey=survey,
                     student=profile,
                 )
-                submission.is_submitted = action == "submit"
-                update_fields = ["is_submitted", "updated_at"]
-                if submission.is_submitted:
-                    submission.submitted_at = timezone.now()
-                    update_fields.append("submitted_at")
-                submission.save(update_fields=update_fields)
-
-                submission.answers.all().delete()
-
                 answer_objects = []
                 for question in question_qs:
                     result = responses.get(question.id)
@@ -463,11 +457,26 @@ def student_take_survey(request, assignment_id):
                             question=question,
                             selected_choice=result.get("choice"),
                             text_response=result.get("text", ""),
+                            numeric_value=Answer.numeric_value_for(question, result.get("choice")),
                         )
                     )
+
+                submission.is_submitted = action == "submit"
+                submission.packed_answers = SurveySubmission.pack_answers(answer_objects)
+                update_fields = ["is_submitted", "packed_answers", "updated_at"]
+                if submission.is_submitted:
+                    submission.submitted_at = timezone.now()
+                    update_fields.append("submitted_at")
+                submission.save(update_fields=update_fields)
+
+                submission.answers.all().delete()
                 if answer_objects:
                     Answer.objects.bulk_create(answer_objects)
 
+                Survey.objects.filter(pk=survey.pk).update(
+                    response_version=F("response_version") + 1
+                )
+
                 if action == "save":
                     if _is_ajax(request):
                         return JsonResponse({"status": "saved"})
@@ -522,9 +531,9 @@ def student_take_survey(request, assignment_id):
 @login_required(login_url="student_signin")
 def student_view_response(request, submission_id):
     # Allow both students and teachers to view responses
-    is_teacher = request.user.username == _teacher_username()
+    is_teacher = request.role is Role.TEACHER
 
-    if not is_teacher and not hasattr(request.user, "student_profile"):
+    if not is_teacher and request.role is not Role.STUDENT:
         return redirect("student_signin")
 
     # Get the submission
@@ -541,7 +550,7 @@ def student_view_response(request, submission_id):
         )
     else:
         # Student can only view their own submission
-        profile = request.user.student_profile
+        profile = request.profile
         submission = get_object_or_404(
             submission_query,
             id=submission_id,
@@ -552,27 +561,10 @@ def student_view_response(request, submission_id):
     survey = submission.survey
     question_qs = (
         survey.questions.order_by("order_number")
-        .select_related("likertquestion", "shortanswerquestion")
         .prefetch_related("choices")
     )
     questions_payload = _serialize_questions(question_qs)
-    answers_map = {
-        answer.question_id: answer
-        for answer in submission.answers.select_related("selected_choice")
-    }
-
-    for item in questions_payload:
-        answer = answers_map.get(item["id"])
-        if item["type"] in {"MCQ", "LIKERT"}:
-            selected_id = ""
-            selected_text = ""
-            if answer and answer.selected_choice:
-                selected_id = str(answer.selected_choice_id)
-                selected_text = answer.selected_choice.text
-            item["selected_choice"] = selected_id
-            item["selected_text"] = selected_text
-        else:
-            item["answer_text"] = answer.text_response if answer else ""
+    _fill_answers(questions_payload, submission)
 
     teacher = survey.teacher
     if teacher:
@@ -599,163 +591,235 @@ def student_view_response(request, submission_id):
 
 
 def teacher_signin(request):
-    """Redirect teachers to the unified sign-in screen after ensuring the account exists."""
-    teacher_user = _ensure_teacher_account()
-    if request.user.is_authenticated and request.user.username == teacher_user.username:
+    """Redirect teachers to the unified sign-in screen."""
+    if request.role is Role.TEACHER:
         return redirect("teacher_dashboard_page", page="dashboard")
     return redirect("student_signin")
 
 
+def _teacher_surveys(user):
+    return Survey.objects.filter(teacher=user).exclude(status__in=Survey.EXCLUDED_STATUSES)
 
-@login_required(login_url="student_signin")
-def teacher_dashboard(request, page="new"):
-    excluded_statuses = ["delete", "deleted", "archived", "archive"]
-    surveys = Survey.objects.filter(teacher=request.user).exclude(status__in=excluded_statuses)
 
-    # 2. Detect selected survey ID from GET
-    selected_id = request.GET.get("survey_id")
+def _wordcloud(survey_id, question_id, texts):
+    """Word cloud for a short-answer question, cached until the survey or its responses change."""
+    return caching.cached(
+        "wordcloud", [(caching.SURVEY, survey_id)], lambda: wordcloud_png_b64(texts), question_id
+    )
 
+
+def _dashboard_page_context(request, surveys):
+    """Header counters, survey picker and per-question analytics."""
+    selected_id = request.GET.get("survey_id")
     if selected_id:
-        survey = surveys.filter(id=selected_id).prefetch_related("questions__choices").first()
+        try:
+            selected_id = int(selected_id)
+        except (TypeError, ValueError):
+            selected_id = None
     else:
-        # Default: first survey
-        survey = surveys.first()
-
-    # All surveys for the teacher excluding the above statuses
-    collection_surveys_qs = surveys
-
-    # Total surveys (after exclusion)
-    total_surveys = collection_surveys_qs.count()
+        # Default: select the first survey in the list
+        default_survey = surveys.first()
+        selected_id = default_survey.id if default_survey else None
 
-    # Active surveys (status == "Open")
-    active_surveys = collection_surveys_qs.filter(status__in=["open", "published"]).count()
-
-    # Total responses across all surveys (consider only non-excluded surveys)
-    total_responses = SurveySubmission.objects.filter(survey__in=collection_surveys_qs).count()
+    survey = surveys.filter(id=selected_id).first() if selected_id else None
 
     submissions = []
     answers = []
     summary_list = []
-    tempasd = 0
-    survey_id = []
-
     survey_title = "<Survey Title>"
-    collection_surveys = collection_surveys_qs
 
-    if page == "dashboard":
-        selected_id = request.GET.get("survey_id")
+    if survey:
+        survey_title = survey.title
 
-        if selected_id:
-            try:
-                selected_id = int(selected_id)
-            except (TypeError, ValueError):
-                selected_id = None
+        submissions = (
+            SurveySubmission.objects
+            .filter(survey=survey)
+            .select_related("student__user")
+            .prefetch_related("answers__question", "answers__selected_choice")
+        )
 
-        else:
-            # Default: select the first survey in the list
-            default_survey = collection_surveys_qs.first()
-            selected_id = default_survey.id if default_survey else None
+        # flatten answers
+        for submission in submissions:
+            answers.extend(submission.answers.all())
 
-        # 2. Load the survey object based on selected ID
-        survey = collection_surveys_qs.filter(id=selected_id).first() if selected_id else None
+        likert_averages = Answer.likert_averages(
+            [question.id for question in survey.questions.all() if question.question_type == "LIKERT"]
+        )
 
+        # Build summaries
+        for question in survey.questions.all():
 
+            question_answers = [a for a in answers if a.question_id == question.id]
 
-        collection_surveys = (
-            collection_surveys_qs
-            .prefetch_related("assignments__section")
-            .order_by("-updated_at")
-        )
+            if question.question_type in ["MCQ", "LIKERT"]:
+                choice_counts = {c.text: 0 for c in question.choices.all()}
 
+                for a in question_answers:
+                    if a.selected_choice:
+                        choice_counts[a.selected_choice.text] += 1
 
-        if survey:
-            survey_title = survey.title if survey else ""
+                summary_list.append({
+                    "question": question,
+                    "type": question.question_type,
+                    "choices": list(choice_counts.items()),
+                    "choice_labels": list(choice_counts.keys()),
+                    "choice_values": list(choice_counts.values()),
+                    "response_count": len(question_answers),
+                    "likert_average": likert_averages.get(question.id),
+                })
 
-            submissions = (
-                SurveySubmission.objects
-                .filter(survey=survey)
-                .select_related("student__user")
-                .prefetch_related("answers__question", "answers__selected_choice")
-            )
+            elif question.question_type == "SHORT":
+                short_texts_orig = [a.text_response for a in question_answers if a.text_response]
 
+                summary_entry = {
+                    "question": question,
+                    "type": "SHORT",
+                    "short_answers_orig": short_texts_orig,
+                    "response_count": len(short_texts_orig),
+                }
 
-            # flatten answers
-            for submission in submissions:
-                answers.extend(submission.answers.all())
-                tempasd = tempasd+1
+                # Generate wordcloud if there are answers
+                if short_texts_orig:
+                    summary_entry["wordcloud_b64"] = _wordcloud(survey.id, question.id, short_texts_orig)
 
-            # Build summaries
-            for question in survey.questions.all():
+                    summary_list.append(summary_entry)
 
-                question_answers = [a for a in answers if a.question_id == question.id]
+    return {
+        # Total surveys, open surveys and responses across non-excluded surveys
+        **Survey.teacher_counters(request.user),
+        # The survey picker only needs ids and titles
+        "collection_surveys": surveys.only("id", "title").order_by("-updated_at"),
+        "survey": survey,
+        "summary_list": summary_list,
+        "chart_data": _chart_data(summary_list),
+        "submissions": submissions,
+        "selected_id": selected_id,
+        "selected_survey_id": selected_id,
+        "survey_title": survey_title,
+        "live_version": survey.response_version if survey else None,
+        "live_stream": _serves_streams(request),
+        "live_fetch_seconds": LIVE_FETCH_SECONDS,
+    }
 
-                if question.question_type in ["MCQ", "LIKERT"]:
-                    choice_counts = {c.text: 0 for c in question.choices.all()}
 
-                    for a in question_answers:
-                        if a.selected_choice:
-                            choice_counts[a.selected_choice.text] += 1
+class _GroupConcat(Aggregate):
+    function = "GROUP_CONCAT"
+    allow_distinct = True
+    output_field = CharField()
 
-                    summary_list.append({
-                        "question": question,
-                        "type": question.question_type,
-                        "choices": list(choice_counts.items()),
-                        "choice_labels": list(choice_counts.keys()),
-                        "choice_values": list(choice_counts.values()),
-                        "response_count": len(question_answers)
-                    })
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, function="STRING_AGG", template="%(function)s(%(distinct)s%(expressions)s, ',')",
+            **extra_context,
+        )
 
-                elif question.question_type == "SHORT":
-                    short_texts_orig = [a.text_response for a in question_answers if a.text_response]
 
-                    summary_entry = {
-                        "question": question,
-                        "type": "SHORT",
-                        "short_answers_orig": short_texts_orig,
-                        "response_count": len(short_texts_orig),
-                    }
+def _collection_page_context(request, surveys):
+    """Non-archived surveys with response counts and sections, one annotated query per page."""
+    now = timezone.now()
+    submissions = (
+        SurveySubmission.objects.filter(survey=OuterRef("pk"))
+        .order_by()
+        .values("survey")
+    )
+    sections = (
+        SurveyAssignment.objects.filter(survey=OuterRef("pk"), section__isnull=False)
+        .order_by()
+        .values("survey")
+        .annotate(ids=_GroupConcat("section", distinct=True))
+        .values("ids")
+    )
 
-                    # Generate wordcloud if there are answers
-                    if short_texts_orig:
-                        short_texts_clean = [t.strip().lower() for t in short_texts_orig]
-                        text_blob = " ".join(short_texts_clean)
-                        words = re.findall(r"\b[^\d\W]\w+\b", text_blob)
+    def count_of(queryset):
+        return Coalesce(Subquery(queryset.annotate(n=Count("id")).values("n")), 0)
 
-                        stopwords = set(STOPWORDS)
-                        filtered = [w for w in words if w not in stopwords and len(w) > 2]
-                        freqs = Counter(filtered) or {"(no responses)": 1}
+    collection_surveys = (
+        surveys
+        .annotate(
+            submitted_count=count_of(submissions.filter(is_submitted=True)),
+            draft_count=count_of(submissions.filter(is_submitted=False)),
+            last_response_at=Subquery(
+                submissions.filter(is_submitted=True)
+                .annotate(last=Max("submitted_at"))
+                .values("last")
+            ),
+            section_list=Subquery(sections),
+            # Mirrors Survey.display_status so rows need no per-row Python.
+            effective_status=Case(
+                When(status__in=["open", "published"], due_date__lt=now, then=Value("closed")),
+                When(status="published", then=Value("open")),
+                default=F("status"),
+                output_field=CharField(),
+            ),
+        )
+        .order_by("-updated_at", "-id")
+    )
 
-                        wc = WordCloud(width=800, height=400, background_color="white",
-                                       collocations=False, max_words=200).generate_from_frequencies(freqs)
+    paginator = Paginator(collection_surveys, 20)
+    page_obj = paginator.get_page(request.GET.get("page", 1))
+    for survey in page_obj:
+        survey.section_ids = sorted(filter(None, (survey.section_list or "").split(",")))
 
-                        buffer = BytesIO()
-                        wc.to_image().save(buffer, format="PNG")
-                        img_b64 = base64.b64encode(buffer.getvalue()).decode()
-                        summary_entry["wordcloud_b64"] = img_b64
+    return {
+        "collection_surveys": page_obj,
+    }
 
-                        summary_list.append(summary_entry)
-                    print(f"Question {question.id}: {len(question_answers)} answers")
-    """Simple landing page for the teacher account."""
-    if request.user.username != _teacher_username():
-        if hasattr(request.user, "student_profile"):
-            return redirect("student_dashboard")
-        return redirect("student_signin")
 
-    page = page.lower()
-    allowed_pages = {"dashboard", "collection", "history", "new"}
-    if page not in allowed_pages:
-        page = "new"
+def _history_page_context(request, surveys):
+    """Submitted responses filtered by the history search form."""
+    responses = SurveySubmission.objects.filter(
+        is_submitted=True
+    ).select_related(
+        'student__user', 'student__section', 'survey'
+    )
 
-    teacher_nav = [
-        {"slug": "dashboard", "label": "Dashboard", "icon": "📊"},
-        {"slug": "collection", "label": "Survey Collection", "icon": "📚"},
-        {"slug": "history", "label": "Responses History", "icon": "📁"},
-        {"slug": "new", "label": "Survey Builder", "icon": "➕"},
-    ]
+    # Search by student name only (words of the first or last name)
+    search_student = request.GET.get('search_student', '').strip()
+    if search_student:
+        responses = responses.filter(
+            student_id__in=SearchToken.matching_ids(SearchToken.STUDENT, search_student)
+        )
+
+    # Search by words of the survey title
+    search_survey = request.GET.get('search_survey', '').strip()
+    if search_survey:
+        responses = responses.filter(
+            survey_id__in=SearchToken.matching_ids(SearchToken.SURVEY, search_survey)
+        )
+
+    # Filter by section
+    filter_section = request.GET.get('filter_section', '').strip()
+    if filter_section:
+        responses = responses.filter(student__section__section_id=filter_section)
+
+    # Filter by date range
+    date_from = request.GET.get('date_from', '').strip()
+    if date_from:
+        try:
+            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
+            responses = responses.filter(submitted_at__date__gte=date_from_obj.date())
+        except ValueError:
+            pass
 
+    date_to = request.GET.get('date_to', '').strip()
+    if date_to:
+        try:
+            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d')
+            responses = responses.filter(submitted_at__date__lte=date_to_obj.date())
+        except ValueError:
+            pass
+
+    return {
+        "responses": keyset_paginate(responses, request.GET.get('cursor'), 10),
+        # All sections for the filter dropdown
+        "all_sections": section_registry.all(),
+    }
+
+
+def _builder_page_context(request, surveys):
+    """Section picker and, when editing, the survey payload for the builder."""
     try:
-        ClassSection.ensure_seeded()
-        sections = ClassSection.objects.order_by("section_id")
+        sections = section_registry.all()
     except Exception:
         letters = ["A", "B", "C", "D"]
         sections = [
@@ -764,190 +828,132 @@ def teacher_dashboard(request, page="new"):
             for letter in letters
         ]
 
-        # collection_surveys = (
-        #     Survey.objects.filter(teacher=request.user)
-        #     .prefetch_related("assignments__section")
-        #     .order_by("-updated_at")
-        # )
-
-    # Handle Responses History page
-    responses_data = None
-    paginator = None
-    all_sections = []
-
-    if page == "history":
-        responses = SurveySubmission.objects.filter(
-            is_submitted=True
-        ).select_related(
-            'student__user', 'student__section', 'survey'
-        ).order_by('-submitted_at')
-
-        # Get all unique sections for the filter dropdown
-        all_sections = ClassSection.objects.order_by("section_id")
-
-        # Search by student name only (first name or last name)
-        search_student = request.GET.get('search_student', '').strip()
-        if search_student:
-            responses = responses.filter(
-                Q(student__user__first_name__icontains=search_student) |
-                Q(student__user__last_name__icontains=search_student)
-            )
-
-        # Search by survey title
-        search_survey = request.GET.get('search_survey', '').strip()
-        if search_survey:
-            responses = responses.filter(
-                Q(survey__title__icontains=search_survey)
-            )
-
-        # Filter by section
-        filter_section = request.GET.get('filter_section', '').strip()
-        if filter_section:
-            responses = responses.filter(student__section__section_id=filter_section)
-
-        # Filter by date range
-        date_from = request.GET.get('date_from', '').strip()
-        if date_from:
-            try:
-                date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
-                responses = responses.filter(submitted_at__date__gte=date_from_obj.date())
-            except ValueError:
-                pass
-
-        date_to = request.GET.get('date_to', '').strip()
-        if date_to:
-            try:
-                date_to_obj = datetime.strptime(date_to, '%Y-%m-%d')
-                responses = responses.filter(submitted_at__date__lte=date_to_obj.date())
-            except ValueError:
-                pass
-
-        # Pagination
-        paginator = Paginator(responses, 10)
-        page_number = request.GET.get('page', 1)
-        responses_data = paginator.get_page(page_number)
-
     editing_payload = None
-    if page == "new":
-        survey_param = request.GET.get("survey")
-        survey_to_edit = None
-        if survey_param:
-            try:
-                survey_id = int(survey_param)
-            except (TypeError, ValueError):
-                survey_id = None
-            if survey_id:
-                survey_to_edit = (
-                    collection_surveys_qs.filter(id=survey_id)
-                    .prefetch_related("assignments__section")
-                    .first()
-                )
-        if survey_to_edit:
-            questions_data = []
-            type_mapping = {
-                "MCQ": "multiple_choice",
-                "LIKERT": "likert",
-                "SHORT": "short_text",
-            }
-            questions_qs = (
-                survey_to_edit.questions.order_by("order_number")
-                .select_related("mcqquestion", "likertquestion", "shortanswerquestion")
-                .prefetch_related("choices")
+    survey_param = request.GET.get("survey")
+    survey_to_edit = None
+    if survey_param:
+        try:
+            survey_id = int(survey_param)
+        except (TypeError, ValueError):
+            survey_id = None
+        if survey_id:
+            survey_to_edit = (
+                surveys.filter(id=survey_id)
+                .prefetch_related("assignments__section")
+                .first()
             )
-            for question in questions_qs:
-                builder_type = type_mapping.get(question.question_type, "short_text")
-                question_info = {
-                    "id": question.id,
-                    "question_type": builder_type,
-                    "title": question.text,
-                    "is_required": question.is_required,
-                    "order": question.order_number,
-                }
-                if builder_type == "multiple_choice":
-                    choices = list(
+    if survey_to_edit:
+        questions_data = []
+        type_mapping = {
+            "MCQ": "multiple_choice",
+            "LIKERT": "likert",
+            "SHORT": "short_text",
+        }
+        questions_qs = (
+            survey_to_edit.questions.order_by("order_number")
+            .prefetch_related("choices")
+        )
+        for question in questions_qs:
+            builder_type = type_mapping.get(question.question_type, "short_text")
+            question_info = {
+                "id": question.id,
+                "question_type": builder_type,
+                "title": question.text,
+                "is_required": question.is_required,
+                "order": question.order_number,
+            }
+            if builder_type == "multiple_choice":
+                choices = list(
+                    question.choices.order_by("value", "id").values_list("text", flat=True)
+                )
+                while len(choices) < 2:
+                    choices.append("")
+                question_info["choices"] = choices
+            elif builder_type == "likert":
+                labels = question.scale_labels
+                if not labels:
+                    labels = list(
                         question.choices.order_by("value", "id").values_list("text", flat=True)
                     )
-                    while len(choices) < 2:
-                        choices.append("")
-                    question_info["choices"] = choices
-                elif builder_type == "likert":
-                    likert = getattr(question, "likertquestion", None)
-                    labels = []
-                    if likert and likert.scale_labels:
-                        labels = list(likert.scale_labels)
-                    else:
-                        labels = list(
-                            question.choices.order_by("value", "id").values_list("text", flat=True)
-                        )
-                    while len(labels) < 2:
-                        labels.append("")
-                    question_info["scale_labels"] = labels
-                else:
-                    short = getattr(question, "shortanswerquestion", None)
-                    question_info["max_length"] = short.max_length if short else 500
-                questions_data.append(question_info)
-
-            section_ids = [
-                assignment.section.section_id
-                for assignment in survey_to_edit.assignments.all()
-                if assignment.section
-            ]
-
-            due_date_value = ""
-            if survey_to_edit.due_date:
-                due_reference = survey_to_edit.due_date
-                if timezone.is_naive(due_reference):
-                    due_reference = timezone.make_aware(due_reference, timezone.get_default_timezone())
-                due_local = timezone.localtime(due_reference)
-                due_date_value = due_local.strftime("%Y-%m-%dT%H:%M")
-
-            editing_payload = {
-                "id": survey_to_edit.id,
-                "title": survey_to_edit.title,
-                "description": survey_to_edit.description or "",
-                "due_date": due_date_value,
-                "sections": section_ids,
-                "questions": questions_data,
-                "status": survey_to_edit.display_status,
-            }
-    collection_surveys = (
-        collection_surveys_qs
-        .prefetch_related("assignments__section")
-        .order_by("-updated_at")
-    )
-    return render(
-        request,
-        "main/teacher_dashboard.html",
-        {
-            "teacher": request.user,
-            "active_page": page,
-            "nav_items": teacher_nav,
-            "sections": sections,
-            "collection_surveys": collection_surveys,
-            "editing_payload": editing_payload,
-            "responses": responses_data,
-            "paginator": paginator,
-            "all_sections": all_sections,
-            "surveys": surveys,
-            "survey": survey,
-            "summary_list": summary_list,
-            "submissions": submissions,
-            "selected_id": selected_id,
+                while len(labels) < 2:
+                    labels.append("")
+                question_info["scale_labels"] = labels
+            else:
+                question_info["max_length"] = question.max_length
+            questions_data.append(question_info)
 
-            "selected_survey_id": selected_id,
-            "survey_title": survey_title,
-    "total_surveys": total_surveys,
-    "active_surveys": active_surveys,
-    "total_responses": total_responses,
+        section_ids = [
+            assignment.section.section_id
+            for assignment in survey_to_edit.assignments.all()
+            if assignment.section
+        ]
 
-        },
-    )
+        due_date_value = ""
+        if survey_to_edit.due_date:
+            due_reference = survey_to_edit.due_date
+            if timezone.is_naive(due_reference):
+                due_reference = timezone.make_aware(due_reference, timezone.get_default_timezone())
+            due_local = timezone.localtime(due_reference)
+            due_date_value = due_local.strftime("%Y-%m-%dT%H:%M")
+
+        editing_payload = {
+            "id": survey_to_edit.id,
+            "title": survey_to_edit.title,
+            "description": survey_to_edit.description or "",
+            "due_date": due_date_value,
+            "sections": section_ids,
+            "questions": questions_data,
+            "status": survey_to_edit.display_status,
+        }
+
+    return {
+        "sections": sections,
+        "sections_version": ClassSection.cache_version(),
+        "editing_payload": editing_payload,
+    }
+
+
+_TEACHER_PAGE_CONTEXT = {
+    "dashboard": _dashboard_page_context,
+    "collection": _collection_page_context,
+    "history": _history_page_context,
+    "new": _builder_page_context,
+}
+
+
+@login_required(login_url="student_signin")
+def teacher_dashboard(request, page="new"):
+    """Simple landing page for the teacher account."""
+    if request.role is not Role.TEACHER:
+        if request.role is Role.STUDENT:
+            return redirect("student_dashboard")
+        return redirect("student_signin")
+
+    page = page.lower()
+    if page not in _TEACHER_PAGE_CONTEXT:
+        page = "new"
+
+    teacher_nav = [
+        {"slug": "dashboard", "label": "Dashboard", "icon": "📊"},
+        {"slug": "collection", "label": "Survey Collection", "icon": "📚"},
+        {"slug": "history", "label": "Responses History", "icon": "📁"},
+        {"slug": "new", "label": "Survey Builder", "icon": "➕"},
+    ]
+
+    context = {
+        "teacher": request.user,
+        "active_page": page,
+        "nav_items": teacher_nav,
+    }
+    # Only the requested page's provider runs; the others cost nothing.
+    context.update(_TEACHER_PAGE_CONTEXT[page](request, _teacher_surveys(request.user)))
+    return render(request, "main/teacher_dashboard.html", context)
 
 
 @require_POST
 @login_required(login_url="student_signin")
 def teacher_save_survey(request):
-    if request.user.username != _teacher_username():
+    if request.role is not Role.TEACHER:
         return HttpResponseForbidden("Only the teacher account can create surveys.")
 
     try:
@@ -982,8 +988,11 @@ def teacher_save_survey(request):
         due_date = timezone.make_aware(due_date, timezone.get_default_timezone())
 
     section_ids = payload.get("sections") or []
-    ClassSection.ensure_seeded()
-    sections_map = {section.section_id: section for section in ClassSection.objects.filter(section_id__in=section_ids)}
+    sections_map = {
+        section_id: section
+        for section_id in section_ids
+        if (section := section_registry.get(section_id)) is not None
+    }
 
     if _is_open_status(status) and len(sections_map) != len(section_ids):
         return JsonResponse({"error": "One or more selected sections could not be found."}, status=400)
@@ -992,6 +1001,35 @@ def teacher_save_survey(request):
     if _is_open_status(status) and not questions_payload:
         return JsonResponse({"error": "Add at least one question before publishing."}, status=400)
 
+    type_mapping = {
+        "multiple_choice": "MCQ",
+        "likert": "LIKERT",
+        "short_text": "SHORT",
+    }
+    # Settle every question's settings and choices before anything is written.
+    questions = []
+    for index, question_data in enumerate(questions_payload, start=1):
+        question_type = type_mapping.get(question_data.get("question_type"))
+        if not question_type:
+            continue
+        try:
+            if question_type == "MCQ":
+                choice_texts = [choice.strip() for choice in (question_data.get("choices") or []) if choice.strip()]
+                config = Question.build_config("MCQ", randomize_choices=question_data.get("randomize", False))
+            elif question_type == "LIKERT":
+                choice_texts = [label.strip() for label in (question_data.get("scale_labels") or []) if label.strip()]
+                if len(choice_texts) < 2:
+                    choice_texts = ["Disagree", "Agree"]
+                config = Question.build_config(
+                    "LIKERT", scale_min=1, scale_max=len(choice_texts), scale_labels=choice_texts
+                )
+            else:  # SHORT
+                choice_texts = []
+                config = Question.build_config("SHORT", max_length=question_data.get("max_length") or 500)
+        except ValidationError as exc:
+            return JsonResponse({"error": f"Question {index}: {' '.join(exc.messages)}"}, status=400)
+        questions.append((index, question_type, question_data, config, choice_texts))
+
     survey_id = payload.get("survey_id")
 
     with transaction.atomic():
@@ -999,6 +1037,12 @@ def teacher_save_survey(request):
             survey = get_object_or_404(Survey, id=survey_id)
             if survey.teacher and survey.teacher != request.user:
                 return HttpResponseForbidden("You do not have permission to edit this survey.")
+            # Rebuilding the questions would orphan the archived answers.
+            if SurveyArchive.objects.filter(survey=survey).exists():
+                return JsonResponse(
+                    {"error": "This survey's responses are in cold storage. Restore them before editing."},
+                    status=400,
+                )
         else:
             survey = Survey(teacher=request.user)
 
@@ -1040,18 +1084,7 @@ def teacher_save_survey(request):
         # Rebuild question set
         survey.questions.all().delete()
 
-        type_mapping = {
-            "multiple_choice": "MCQ",
-            "likert": "LIKERT",
-            "short_text": "SHORT",
-        }
-
-        for index, question_data in enumerate(questions_payload, start=1):
-            raw_type = question_data.get("question_type")
-            question_type = type_mapping.get(raw_type)
-            if not question_type:
-                continue
-
+        for index, question_type, question_data, config, choice_texts in questions:
             question_text = (question_data.get("title") or "Untitled Question").strip()
             question = Question.objects.create(
                 survey=survey,
@@ -1060,25 +1093,12 @@ def teacher_save_survey(request):
                 question_type=question_type,
                 order_number=index,
                 is_required=bool(question_data.get("is_required", False)),
+                config=config,
             )
-
-            if question_type == "MCQ":
-                MCQQuestion.objects.create(question=question, randomize_choices=bool(question_data.get("randomize", False)))
-                choices = [choice.strip() for choice in (question_data.get("choices") or []) if choice.strip()]
-                for order, choice_text in enumerate(choices, start=1):
-                    Choice.objects.create(question=question, text=choice_text, value=order)
-            elif question_type == "LIKERT":
-                labels = [label.strip() for label in (question_data.get("scale_labels") or []) if label.strip()]
-                if len(labels) < 2:
-                    labels = ["Disagree", "Agree"]
-                scale_min = 1
-                scale_max = scale_min + len(labels) - 1
-                LikertQuestion.objects.create(question=question, scale_min=scale_min, scale_max=scale_max, scale_labels=labels)
-                for offset, label in enumerate(labels, start=scale_min):
-                    Choice.objects.create(question=question, text=label, value=offset)
-            else:  # SHORT
-                max_length = question_data.get("max_length") or 500
-                ShortAnswerQuestion.objects.create(question=question, max_length=max_length)
+            Choice.objects.bulk_create([
+                Choice(question=question, text=text, value=value)
+                for value, text in enumerate(choice_texts, start=config.get("scale_min", 1))
+            ])
 
     return JsonResponse({"id": survey.id, "status": survey.display_status})
 
@@ -1086,7 +1106,7 @@ def teacher_save_survey(request):
 @require_POST
 @login_required(login_url="student_signin")
 def teacher_archive_survey(request, survey_id):
-    if request.user.username != _teacher_username():
+    if request.role is not Role.TEACHER:
         return HttpResponseForbidden("Only the teacher account can archive surveys.")
 
     survey = get_object_or_404(
@@ -1099,18 +1119,43 @@ def teacher_archive_survey(request, survey_id):
     return JsonResponse({"id": survey.id, "status": survey.status})
 
 
+@require_POST
+@login_required(login_url="student_signin")
+def teacher_import_roster(request):
+    """Create student accounts from an uploaded CSV roster of up to ROSTER_UPLOAD_MAX_ROWS rows."""
+    if request.role is not Role.TEACHER:
+        return HttpResponseForbidden("Only the teacher account can import rosters.")
+
+    upload = request.FILES.get("roster")
+    if upload is None:
+        return JsonResponse({"error": "Upload a CSV file in the 'roster' field."}, status=400)
+
+    try:
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        # Hash on a few threads: a request must not fork the server process
+        # or take every CPU. Large rosters go through the import_roster command.
+        result = import_roster(
+            stream,
+            workers=settings.ROSTER_IMPORT_THREADS,
+            processes=False,
+            max_rows=settings.ROSTER_UPLOAD_MAX_ROWS,
+        )
+    except (UnicodeDecodeError, ValueError) as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse(result)
+
+
 @login_required(login_url="student_signin")
 def teacher_preview_survey(request, survey_id):
     survey = get_object_or_404(
         Survey.objects.prefetch_related("questions__choices", "assignments__section"),
         id=survey_id,
     )
-    if survey.teacher and survey.teacher != request.user and request.user.username != _teacher_username():
+    if survey.teacher and survey.teacher != request.user and request.role is not Role.TEACHER:
         raise Http404
 
     question_qs = (
         survey.questions.order_by("order_number")
-        .select_related("likertquestion", "shortanswerquestion")
         .prefetch_related("choices")
     )
     questions = _serialize_questions(question_qs)
@@ -1124,20 +1169,77 @@ def teacher_preview_survey(request, survey_id):
             "survey": survey,
             "questions": questions,
             "assigned_sections": assigned_sections,
-            "is_preview": request.user.username == _teacher_username(),
+            "is_preview": request.role is Role.TEACHER,
         },
     )
 
 
-@login_required(login_url="student_signin")
-def teacher_analytics(request, survey_id):
-    template = "main/teacher_analytics.html"
+# Analytics work runs on its own small pool instead of the single thread
+# Django uses for sync code under ASGI, so a heavy report cannot hold up
+# student pages served by the same worker.
+_ANALYTICS_POOL = ThreadPoolExecutor(
+    max_workers=getattr(settings, "ANALYTICS_THREADS", 4),
+    thread_name_prefix="analytics",
+)
+
+
+def _in_analytics_pool(func):
+    def run(*args, **kwargs):
+        try:
+            with profiled():
+                return func(*args, **kwargs)
+        finally:
+            # Nothing closes a pool thread's connections at the end of the
+            # request, so close them here.
+            connections.close_all()
+
+    return sync_to_async(run, thread_sensitive=False, executor=_ANALYTICS_POOL)
+
+
+def _archived_analytics_context(survey, archive):
+    """Analytics from the snapshot taken when the survey went to cold storage."""
+    summary_list = []
+    for question in survey.questions.all():
+        frozen = archive.snapshot["questions"].get(str(question.id), {})
+        if question.question_type in ["MCQ", "LIKERT"]:
+            choices = [tuple(pair) for pair in frozen.get("choices", [])]
+            summary_list.append({
+                "question": question,
+                "type": question.question_type,
+                "choices": choices,
+                "choice_labels": [text for text, _ in choices],
+                "choice_values": [count for _, count in choices],
+                "likert_average": frozen.get("likert_average"),
+            })
+        elif question.question_type == "SHORT":
+            texts = frozen.get("short_answers", [])
+            summary_list.append({
+                "question": question,
+                "type": "SHORT",
+                "short_answers": [text.strip().lower() for text in texts],
+                "short_answers_orig": texts,
+            })
+    return {
+        "survey": survey,
+        "archive": archive,
+        "submissions": archive.snapshot["respondents"],
+        "summary_list": summary_list,
+        "chart_data": _chart_data(summary_list),
+    }
+
+
+def _analytics_context(user, survey_id):
+    """Survey, submissions and per-question summaries (without word clouds)."""
     survey = (
         Survey.objects
-        .filter(teacher=request.user, id=survey_id)
+        .filter(teacher=user, id=survey_id)
+        .select_related("archive")
         .prefetch_related("questions__choices")
         .first()
     )
+    archive = getattr(survey, "archive", None)
+    if archive is not None:
+        return _archived_analytics_context(survey, archive)
 
     submissions = []
     answers = []
@@ -1152,12 +1254,12 @@ def teacher_analytics(request, survey_id):
         )
 
         for submission in submissions:
-            #print(submission.get_respondent())
             for answer in submission.answers.all():
                 answers.append(answer)
 
-        print(len(submissions))
-        print(len(answers))
+        likert_averages = Answer.likert_averages(
+            [question.id for question in survey.questions.all() if question.question_type == "LIKERT"]
+        )
 
         # make summary grouped by question type
         for question in survey.questions.all():
@@ -1182,6 +1284,7 @@ def teacher_analytics(request, survey_id):
                     "choices": list(choice_counts.items()),
                     "choice_labels": choice_labels,
                     "choice_values": choice_values,
+                    "likert_average": likert_averages.get(question.id),
                 })
 
 
@@ -1199,48 +1302,148 @@ def teacher_analytics(request, survey_id):
                     "short_answers_orig": short_texts_orig,  # for textarea
                 }
 
-                # build a combined string or frequency dict
-                text_blob = " ".join(short_texts_clean)
-                words = re.findall(r"\b[^\d\W]\w+\b", text_blob)  # simple word extractor
-
-                # filter stopwords and very short words
-                stopwords = set(STOPWORDS)
-                filtered = [w for w in words if w not in stopwords and len(w) > 2]
-
-                # build frequencies
-                freqs = Counter(filtered) or {"(no responses)": 1}
-
-                # generate wordcloud
-                wc = WordCloud(
-                    width=800,
-                    height=400,
-                    background_color="white",
-                    collocations=False,
-                    max_words=200
-                ).generate_from_frequencies(freqs)
-
-                # convert to base64
-                buffer = BytesIO()
-                wc.to_image().save(buffer, format="PNG")
-                buffer.seek(0)
-                img_b64 = base64.b64encode(buffer.read()).decode("utf-8")
-                summary_entry["wordcloud_b64"] = img_b64
-
                 summary_list.append(summary_entry)
 
-            print(f"Question {question.id}: {len(question_answers)} answers")
-            # for a in question_answers:
-            #     print(f"- selected_choice: {a.selected_choice}, text_response: {a.text_response}")
+    return {
+        "survey": survey,
+        "submissions": list(submissions),
+        "summary_list": summary_list,
+        "chart_data": _chart_data(summary_list),
+    }
 
 
-    context = {
-        "survey": survey,
+@login_required(login_url="student_signin")
+async def teacher_analytics(request, survey_id):
+    user = await request.auser()
+    context = await _in_analytics_pool(_analytics_context)(user, survey_id)
+
+    # Word clouds are CPU-bound; render them side by side on the pool.
+    short_entries = [entry for entry in context["summary_list"] if entry["type"] == "SHORT"]
+    images = await asyncio.gather(*(
+        _in_analytics_pool(_wordcloud)(survey_id, entry["question"].id, entry["short_answers"])
+        for entry in short_entries
+    ))
+    for entry, image in zip(short_entries, images):
+        entry["wordcloud_b64"] = image
+
+    return await _in_analytics_pool(render)(request, "main/teacher_analytics.html", context)
+
+
+LIVE_POLL_SECONDS = 2
+LIVE_HEARTBEAT_SECONDS = 15
+LIVE_STREAM_SECONDS = 300
+# How often the dashboard asks for tallies when it cannot hold a stream open.
+LIVE_FETCH_SECONDS = 15
+
+
+def _serves_streams(request):
+    """Whether a long-lived response is cheap here: under WSGI it holds a worker."""
+    return isinstance(request, ASGIRequest)
+
+
+def _tally_payload(submissions, tallies):
+    return {
         "submissions": submissions,
-        "summary_list": summary_list,
+        "questions": {qid: list(counts.items()) for qid, counts in tallies.items()},
     }
 
-    return render(request, template, context)
 
+async def _survey_live_tallies(survey_id):
+    """Return the submission count and per-question choice tallies for a survey."""
+    submissions = await SurveySubmission.objects.filter(survey_id=survey_id).acount()
+    tallies = {}
+    choice_rows = (
+        Choice.objects.filter(
+            question__survey_id=survey_id,
+            question__question_type__in=["MCQ", "LIKERT"],
+        )
+        .annotate(picked=Count("answer"))
+        .order_by("question_id", "id")
+        .values_list("question_id", "text", "picked")
+    )
+    async for question_id, text, picked in choice_rows:
+        counts = tallies.setdefault(str(question_id), {})
+        counts[text] = counts.get(text, 0) + picked
+    return submissions, tallies
+
+
+def _sse_event(event, event_id, payload):
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+async def _survey_live_events(survey_id, since):
+    """Yield tally deltas whenever the survey's response counter moves."""
+    loop = asyncio.get_running_loop()
+    version_qs = Survey.objects.filter(id=survey_id).values_list("response_version", flat=True)
+
+    yield "retry: 5000\n\n"
+
+    last_version = await version_qs.afirst()
+    last_submissions, last_tallies = await _survey_live_tallies(survey_id)
+    if since != last_version:
+        # The page was rendered before the latest answers; resend everything.
+        yield _sse_event("tally", last_version, _tally_payload(last_submissions, last_tallies))
+
+    deadline = loop.time() + LIVE_STREAM_SECONDS
+    idle = 0
+    while loop.time() < deadline:
+        await asyncio.sleep(LIVE_POLL_SECONDS)
+        version = await version_qs.afirst()
+        if version is None:
+            break
+        if version == last_version:
+            idle += LIVE_POLL_SECONDS
+            if idle >= LIVE_HEARTBEAT_SECONDS:
+                idle = 0
+                yield ": keep-alive\n\n"
+            continue
+
+        submissions, tallies = await _survey_live_tallies(survey_id)
+        changed = {
+            qid: list(counts.items())
+            for qid, counts in tallies.items()
+            if last_tallies.get(qid) != counts
+        }
+        yield _sse_event("tally", version, {"submissions": submissions, "questions": changed})
+        last_version, last_submissions, last_tallies = version, submissions, tallies
+        idle = 0
+
+
+@login_required(login_url="student_signin")
+async def teacher_survey_live(request, survey_id):
+    """Response counts for the dashboard page.
+
+    A Server-Sent Events stream under ASGI. Under WSGI, or with
+    ``?format=json``, one JSON reply instead: the tallies if the survey's
+    response version moved past ``since``, otherwise just the version.
+    """
+    user = await request.auser()
+    if request.role is not Role.TEACHER:
+        return HttpResponseForbidden("Only the teacher account can follow live responses.")
+
+    if not await Survey.objects.filter(teacher=user, id=survey_id).aexists():
+        raise Http404
+
+    since = request.headers.get("Last-Event-ID") or request.GET.get("since")
+    try:
+        since = int(since)
+    except (TypeError, ValueError):
+        since = None
+
+    if request.GET.get("format") == "json" or not _serves_streams(request):
+        version = await Survey.objects.filter(id=survey_id).values_list("response_version", flat=True).afirst()
+        payload = {"version": version}
+        if version != since:
+            payload.update(_tally_payload(*await _survey_live_tallies(survey_id)))
+        return JsonResponse(payload)
+
+    response = StreamingHttpResponse(
+        _survey_live_events(survey_id, since),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 def logout_view(request):
@@ -1253,8 +1456,8 @@ def logout_view(request):
 @login_required(login_url="student_signin")
 def teacher_responses_history(request):
     """View all student responses with search and filter capabilities"""
-    if request.user.username != _teacher_username():
-        if hasattr(request.user, "student_profile"):
+    if request.role is not Role.TEACHER:
+        if request.role is Role.STUDENT:
             return redirect("student_dashboard")
         return redirect("student_signin")
 
@@ -1263,14 +1466,13 @@ def teacher_responses_history(request):
         is_submitted=True
     ).select_related(
         'student__user', 'survey'
-    ).order_by('-submitted_at')
+    )
 
     # Search by student name
     search_student = request.GET.get('search_student', '').strip()
     if search_student:
         responses = responses.filter(
-            Q(student__user__first_name__icontains=search_student) |
-            Q(student__user__last_name__icontains=search_student)
+            student_id__in=SearchToken.matching_ids(SearchToken.STUDENT, search_student)
         )
 
     # Filter by date range
@@ -1290,14 +1492,8 @@ def teacher_responses_history(request):
         except ValueError:
             pass
 
-    # Pagination
-    paginator = Paginator(responses, 10)  # 10 responses per page
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
-
     context = {
-        'responses': page_obj,
-        'paginator': paginator,
+        'responses': keyset_paginate(responses, request.GET.get('cursor'), 10),
     }
 
     return render(request, 'main/teacher_responses_history.html', context)
@@ -1306,8 +1502,8 @@ def teacher_responses_history(request):
 @login_required(login_url="student_signin")
 def teacher_view_student_response(request, submission_id):
     """Teacher view for viewing student responses"""
-    if request.user.username != _teacher_username():
-        if hasattr(request.user, "student_profile"):
+    if request.role is not Role.TEACHER:
+        if request.role is Role.STUDENT:
             return redirect("student_dashboard")
         return redirect("student_signin")
     
@@ -1323,27 +1519,10 @@ def teacher_view_student_response(request, submission_id):
     survey = submission.survey
     question_qs = (
         survey.questions.order_by("order_number")
-        .select_related("likertquestion", "shortanswerquestion")
         .prefetch_related("choices")
     )
     questions_payload = _serialize_questions(question_qs)
-    answers_map = {
-        answer.question_id: answer
-        for answer in submission.answers.select_related("selected_choice")
-    }
-
-    for item in questions_payload:
-        answer = answers_map.get(item["id"])
-        if item["type"] in {"MCQ", "LIKERT"}:
-            selected_id = ""
-            selected_text = ""
-            if answer and answer.selected_choice:
-                selected_id = str(answer.selected_choice_id)
-                selected_text = answer.selected_choice.text
-            item["selected_choice"] = selected_id
-            item["selected_text"] = selected_text
-        else:
-            item["answer_text"] = answer.text_response if answer else ""
+    _fill_answers(questions_payload, submission)
 
     teacher = survey.teacher
     if teacher:
@@ -1361,3 +1540,29 @@ def teacher_view_student_response(request, submission_id):
             "submission": submission,
         },
     )
+
+
+@staff_member_required
+def admin_profile_captures(request):
+    """Admin listing of recent cProfile captures."""
+    return render(
+        request,
+        "admin/main/profile_captures.html",
+        {
+            **admin_site.each_context(request),
+            "title": "Profile captures",
+            "captures": list_profile_captures(),
+            "limit": settings.PROFILE_CAPTURE_LIMIT,
+        },
+    )
+
+
+@staff_member_required
+def admin_profile_capture_file(request, name, kind):
+    """Download a capture's .pstats dump or read its text summary."""
+    path = profile_dir() / f"{name}.{kind}"
+    if kind not in {"txt", "pstats"} or not path.is_file():
+        raise Http404
+    if kind == "txt":
+        return FileResponse(path.open("rb"), content_type="text/plain; charset=utf-8")
+    return FileResponse(path.open("rb"), as_attachment=True, filename=path.name)
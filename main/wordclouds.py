@@ -0,0 +1,35 @@
+"""Word cloud images for short-answer questions.
+
+``wordcloud`` pulls in NumPy, PIL and matplotlib, so it is imported on first
+use instead of when the views load; workers that only serve student pages
+never pay for it.
+"""
+
+import base64
+import re
+from collections import Counter
+from io import BytesIO
+
+from .middleware import timed
+
+_WORD = re.compile(r"\b[^\d\W]\w+\b")
+
+
+def wordcloud_png_b64(texts):
+    """Base64-encoded PNG word cloud of ``texts``, minus stopwords and short words."""
+    with timed("wordcloud"):
+        from wordcloud import STOPWORDS, WordCloud
+
+        words = _WORD.findall(" ".join(text.strip().lower() for text in texts))
+        freqs = Counter(word for word in words if word not in STOPWORDS and len(word) > 2)
+        image = WordCloud(
+            width=800,
+            height=400,
+            background_color="white",
+            collocations=False,
+            max_words=200,
+        ).generate_from_frequencies(freqs or {"(no responses)": 1}).to_image()
+
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()